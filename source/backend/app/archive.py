@@ -0,0 +1,74 @@
+import mimetypes
+import tarfile
+import zipfile
+from pathlib import PurePosixPath
+from typing import BinaryIO, Iterator
+
+ARCHIVE_CONTENT_TYPES = frozenset(
+    {
+        'application/zip',
+        'application/x-zip-compressed',
+        'application/x-tar',
+        'application/gzip',
+        'application/x-gzip',
+        'application/x-gtar',
+    }
+)
+_ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz')
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+def is_archive(filename: str | None, content_type: str | None) -> bool:
+    if content_type in ARCHIVE_CONTENT_TYPES:
+        return True
+    return bool(filename) and filename.lower().endswith(_ARCHIVE_SUFFIXES)
+
+
+def guess_image_content_type(name: str) -> str | None:
+    content_type, _ = mimetypes.guess_type(name)
+    if content_type and content_type.startswith('image/'):
+        return content_type
+    return None
+
+
+def _is_candidate(name: str) -> bool:
+    parts = PurePosixPath(name).parts
+    if any(part.startswith('.') or part == '__MACOSX' for part in parts):
+        return False
+    return guess_image_content_type(name) is not None
+
+
+def iter_archive_images(fileobj: BinaryIO) -> Iterator[tuple[str, BinaryIO]]:
+    """Yield ``(basename, stream)`` for every image member of a zip or tar archive.
+
+    Members are streamed; nothing is extracted to disk by this function.
+    """
+    fileobj.seek(0)
+    if zipfile.is_zipfile(fileobj):
+        fileobj.seek(0)
+        with zipfile.ZipFile(fileobj) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not _is_candidate(info.filename):
+                    continue
+                with zf.open(info) as member:
+                    yield PurePosixPath(info.filename).name, member
+        return
+
+    fileobj.seek(0)
+    try:
+        tf = tarfile.open(fileobj=fileobj, mode='r:*')
+    except tarfile.TarError as exc:
+        raise ArchiveError('Unsupported or corrupt archive') from exc
+
+    with tf:
+        for member_info in tf:
+            if not member_info.isfile() or not _is_candidate(member_info.name):
+                continue
+            member = tf.extractfile(member_info)
+            if member is None:
+                continue
+            with member:
+                yield PurePosixPath(member_info.name).name, member
@@ -0,0 +1,223 @@
+"""Derived per-image artifacts, generated once per content hash and kept on disk.
+
+Each artifact is keyed by ``(content_sha256, transform)``; transform names carry
+their parameters and a version so a change never serves stale files. Arrays are
+stored as ``.npy`` (loading one is a sub-millisecond read, decoding the source
+image again costs tens of milliseconds); the UI thumbnail is lossy WebP.
+The directory is bounded by ``max_bytes`` with least-recently-used eviction.
+"""
+
+import io
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import numpy as np
+from PIL import Image
+
+from .segmentation import WORKING_MAX_SIDE, decode_working_rgb
+
+ARTIFACT_VERSION = '1'
+THUMBNAIL_MAX_SIDE = 320
+THUMBNAIL_QUALITY = 80
+_KEY_LOCK_STRIPES = 64
+
+
+def _write_working_rgb(source: Path, fh: Any) -> None:
+    np.save(fh, decode_working_rgb(source, WORKING_MAX_SIDE), allow_pickle=False)
+
+
+def decode_ocr_gray(source: bytes | Path) -> np.ndarray:
+    """Full-resolution ``uint8`` grayscale, the image the OCR engines read."""
+    with Image.open(source if isinstance(source, Path) else io.BytesIO(source)) as image:
+        return np.asarray(image.convert('L'), dtype=np.uint8)
+
+
+def _write_ocr_gray(source: Path, fh: Any) -> None:
+    np.save(fh, decode_ocr_gray(source), allow_pickle=False)
+
+
+def _write_thumbnail(source: Path, fh: Any) -> None:
+    with Image.open(source) as image:
+        image.draft('RGB', (THUMBNAIL_MAX_SIDE, THUMBNAIL_MAX_SIDE))
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        image.thumbnail((THUMBNAIL_MAX_SIDE, THUMBNAIL_MAX_SIDE), Image.Resampling.BILINEAR)
+        image.save(fh, format='WEBP', quality=THUMBNAIL_QUALITY)
+
+
+class Transform(NamedTuple):
+    name: str
+    suffix: str
+    # Derives the artifact from the source image; None for artifacts built with get_or_create.
+    write: Callable[[Path, Any], None] | None = None
+
+
+WORKING_RGB = Transform(f'working-rgb-{WORKING_MAX_SIDE}.v{ARTIFACT_VERSION}', '.npy', _write_working_rgb)
+OCR_GRAY = Transform(f'ocr-gray.v{ARTIFACT_VERSION}', '.npy', _write_ocr_gray)
+THUMBNAIL = Transform(
+    f'thumbnail-{THUMBNAIL_MAX_SIDE}-q{THUMBNAIL_QUALITY}.v{ARTIFACT_VERSION}', '.webp', _write_thumbnail
+)
+
+
+class ArtifactCache:
+    """Size-bounded on-disk cache of derived artifacts.
+
+    Generation for one key is serialised by a striped lock, so concurrent
+    requests for the same image decode it once and the rest read the file.
+    Files are written to a temp name and renamed into place.
+    """
+
+    def __init__(self, directory: str, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max(0, int(max_bytes))
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[Path, int] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._key_locks = [threading.Lock() for _ in range(_KEY_LOCK_STRIPES)]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load_index()
+
+    def _load_index(self) -> None:
+        # Rebuild LRU order from mtimes (hits touch the file); stray temp files are dropped.
+        files = []
+        for path in self.directory.rglob('*'):
+            if not path.is_file():
+                continue
+            if path.name.startswith('.tmp-'):
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            files.append((stat.st_mtime_ns, path, stat.st_size))
+        for _, path, size in sorted(files):
+            self._entries[path] = size
+            self._bytes += size
+        with self._lock:
+            self._evict(keep=None)
+
+    def path(self, content_sha256: str, transform: Transform) -> Path:
+        if len(content_sha256) < 4 or not content_sha256.isalnum():
+            raise ValueError(f'Invalid content hash: {content_sha256!r}')
+        return self.directory / transform.name / content_sha256[:2] / f'{content_sha256}{transform.suffix}'
+
+    def get(self, content_sha256: str, transform: Transform, source: Path) -> Path:
+        """Path of the artifact, generating it from ``source`` on first use."""
+        return self.get_or_create(content_sha256, transform, lambda fh: transform.write(source, fh))
+
+    def get_or_create(self, key: str, transform: Transform, write: Callable[[Any], None]) -> Path:
+        """Path of the artifact ``key``; ``write(fh)`` produces it on first use.
+
+        ``key`` is a content hash, of the source image or of whatever inputs
+        the artifact is derived from.
+        """
+        path = self.path(key, transform)
+        if self._hit(path):
+            return path
+        with self._key_locks[hash(path) % _KEY_LOCK_STRIPES]:
+            if self._hit(path):
+                return path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(prefix='.tmp-', dir=path.parent)
+            try:
+                with os.fdopen(fd, 'wb') as fh:
+                    write(fh)
+                os.replace(temp_name, path)
+            except BaseException:
+                Path(temp_name).unlink(missing_ok=True)
+                raise
+            size = path.stat().st_size
+            with self._lock:
+                self.misses += 1
+                self._bytes += size - self._entries.pop(path, 0)
+                self._entries[path] = size
+                self._evict(keep=path)
+        return path
+
+    def _hit(self, path: Path) -> bool:
+        with self._lock:
+            if path not in self._entries:
+                return False
+            if not path.exists():
+                # Removed behind our back (e.g. tmp cleaner); regenerate.
+                self._bytes -= self._entries.pop(path)
+                return False
+            self._entries.move_to_end(path)
+            self.hits += 1
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return True
+
+    def _evict(self, keep: Path | None) -> None:
+        # Caller holds self._lock. The entry just written is kept even when it alone exceeds the budget.
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            if oldest == keep:
+                break
+            self._bytes -= self._entries.pop(oldest)
+            oldest.unlink(missing_ok=True)
+            self.evictions += 1
+
+    def load_array(self, content_sha256: str, transform: Transform, source: Path) -> np.ndarray:
+        try:
+            return np.load(self.get(content_sha256, transform, source), allow_pickle=False)
+        except FileNotFoundError:
+            # Evicted between get() and the read; get() regenerates it.
+            return np.load(self.get(content_sha256, transform, source), allow_pickle=False)
+
+    def read_bytes(self, content_sha256: str, transform: Transform, source: Path) -> bytes:
+        return self.read_or_create(content_sha256, transform, lambda fh: transform.write(source, fh))
+
+    def read_or_create(self, key: str, transform: Transform, write: Callable[[Any], None]) -> bytes:
+        try:
+            return self.get_or_create(key, transform, write).read_bytes()
+        except FileNotFoundError:
+            return self.get_or_create(key, transform, write).read_bytes()
+
+    def bind(self, content_sha256: str, source: Path) -> 'ImageArtifacts':
+        return ImageArtifacts(self, content_sha256, source)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self._entries:
+                path.unlink(missing_ok=True)
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+class ImageArtifacts(NamedTuple):
+    """The artifacts of one stored image, handed to pipeline stages."""
+
+    cache: ArtifactCache
+    content_sha256: str
+    source: Path
+
+    def working_rgb(self) -> np.ndarray:
+        return self.cache.load_array(self.content_sha256, WORKING_RGB, self.source)
+
+    def ocr_gray(self) -> np.ndarray:
+        return self.cache.load_array(self.content_sha256, OCR_GRAY, self.source)
+
+    def thumbnail(self) -> bytes:
+        return self.cache.read_bytes(self.content_sha256, THUMBNAIL, self.source)
@@ -0,0 +1,105 @@
+import json
+from collections import Counter
+from typing import Any, AsyncIterator
+
+from fastapi.concurrency import run_in_threadpool
+
+from .dimension_mapper import coerce_ocr_items, map_dimensions
+from .metrics import timed
+
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+# Products mapped per worker-thread hop; keeps the event loop free without a hop per product.
+_CHUNK_SIZE = 256
+
+
+class InvalidEntry(ValueError):
+    pass
+
+
+async def iter_ndjson(body: bytes) -> AsyncIterator[Any]:
+    """Yield one parsed value per non-empty NDJSON line, decoding lazily as mapping proceeds."""
+    for line in body.splitlines():
+        if line.strip():
+            yield _parse_line(line)
+
+
+def _parse_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        return InvalidEntry(f'Invalid JSON line: {exc}')
+
+
+async def iter_json_array(entries: list[Any]) -> AsyncIterator[Any]:
+    for entry in entries:
+        yield entry
+
+
+def _map_entry(index: int, entry: Any) -> dict[str, Any]:
+    product_id = None
+    try:
+        if isinstance(entry, InvalidEntry):
+            raise entry
+        if isinstance(entry, dict):
+            product_id = entry.get('id')
+            raw_items = entry.get('ocr_items')
+        else:
+            raw_items = entry
+        items = coerce_ocr_items(raw_items)
+    except (TypeError, ValueError) as exc:
+        line: dict[str, Any] = {'index': index, 'error': f'Invalid ocr_items payload: {exc}'}
+    else:
+        with timed('map_dimensions'):
+            mapped = map_dimensions(items)
+        line = {'index': index, **mapped}
+    if product_id is not None:
+        line['id'] = product_id
+    return line
+
+
+def _encode_line(line: dict[str, Any]) -> tuple[dict[str, Any], str]:
+    try:
+        return line, json.dumps(line, ensure_ascii=False, allow_nan=False) + '\n'
+    except (TypeError, ValueError) as exc:
+        # Anything that cannot be strict JSON (e.g. an exotic id) becomes an error line.
+        line = {'index': line['index'], 'error': f'Unserialisable result: {exc}'}
+        return line, json.dumps(line, ensure_ascii=False) + '\n'
+
+
+def _map_chunk(chunk: list[tuple[int, Any]]) -> list[tuple[dict[str, Any], str]]:
+    return [_encode_line(_map_entry(index, entry)) for index, entry in chunk]
+
+
+async def stream_bulk_mapping(entries: AsyncIterator[Any]) -> AsyncIterator[str]:
+    """Map every product and stream one NDJSON line each, then a summary line."""
+    warning_counts: Counter[str] = Counter()
+    products = 0
+    errors = 0
+
+    async def _flush(chunk: list[tuple[int, Any]]) -> list[str]:
+        nonlocal products, errors
+        lines = []
+        for result, encoded in await run_in_threadpool(_map_chunk, chunk):
+            products += 1
+            if 'error' in result:
+                errors += 1
+            for warning in result.get('warnings', ()):
+                warning_counts[warning.split(':', 1)[0]] += 1
+            lines.append(encoded)
+        return lines
+
+    chunk: list[tuple[int, Any]] = []
+    index = 0
+    async for entry in entries:
+        chunk.append((index, entry))
+        index += 1
+        if len(chunk) >= _CHUNK_SIZE:
+            for line in await _flush(chunk):
+                yield line
+            chunk = []
+    if chunk:
+        for line in await _flush(chunk):
+            yield line
+
+    summary = {'products': products, 'errors': errors, 'warning_counts': dict(warning_counts)}
+    yield json.dumps({'summary': summary}, ensure_ascii=False) + '\n'
@@ -0,0 +1,293 @@
+"""Pixel-to-millimetre calibration from a reference of known size.
+
+The reference (a printed square marker, an ArUco tag or a card) is found
+among the blocks of the working-resolution segmentation mask: it is the
+solid, axis-aligned rectangle whose aspect matches ``ReferenceSpec``. Its
+edges are then refined on the full-resolution grayscale image, which sets
+mm-per-pixel; the object is measured from the mask with the reference
+blanked out.
+
+Detection needs the full-resolution image, so a fixed rig registers a
+*profile*: the first frame that finds the reference stores its calibration
+and later frames of the same size reuse it without detection.
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple
+
+import numpy as np
+
+from .segmentation import mask_bbox, mask_regions, otsu_threshold
+
+# Smallest reference side, in working-mask pixels, worth refining.
+MIN_REFERENCE_PX = 6
+# Share of a candidate's outline that must be foreground (a solid or bordered rectangle).
+MIN_BORDER_COVERAGE = 0.9
+# Largest relative aspect mismatch accepted against the reference spec.
+ASPECT_TOLERANCE = 0.08
+# Rows sampled for the object's silhouette profile.
+PROFILE_BINS = 64
+
+
+class CalibrationError(ValueError):
+    pass
+
+
+class ReferenceSpec(NamedTuple):
+    width_mm: float
+    height_mm: float
+
+    @property
+    def sides(self) -> tuple[float, float]:
+        return max(self.width_mm, self.height_mm), min(self.width_mm, self.height_mm)
+
+
+def parse_reference_spec(text: str) -> ReferenceSpec:
+    """Parse ``"<width>x<height>"`` in millimetres, e.g. ``"85.6x53.98"`` (ID-1 card) or ``"50x50"``."""
+    try:
+        width, height = (float(part) for part in text.lower().split('x'))
+    except ValueError as exc:
+        raise CalibrationError(f'Invalid reference size {text!r}; expected "<width>x<height>" in mm') from exc
+    if width <= 0 or height <= 0:
+        raise CalibrationError(f'Invalid reference size {text!r}; sides must be positive')
+    return ReferenceSpec(width, height)
+
+
+class Calibration(NamedTuple):
+    mm_per_px: float
+    method: str  # 'reference', 'profile' or 'default'
+    confidence: float
+    # Full-image pixels; None when no reference was seen.
+    reference_bbox: list[int] | None = None
+    image_size: tuple[int, int] | None = None
+
+
+def _border_coverage(block: np.ndarray) -> float:
+    if block.shape[0] < 2 or block.shape[1] < 2:
+        return 0.0
+    outline = np.concatenate((block[0], block[-1], block[1:-1, 0], block[1:-1, -1]))
+    return float(outline.mean())
+
+
+def _aspect_error(width: float, height: float, spec: ReferenceSpec) -> float:
+    long_mm, short_mm = spec.sides
+    ratio = max(width, height) / max(1.0, min(width, height))
+    return abs(ratio / (long_mm / short_mm) - 1.0)
+
+
+def _find_reference_block(mask: np.ndarray, spec: ReferenceSpec) -> tuple[list[int], float] | None:
+    # The object is always one of the blocks, so a lone block is never the reference.
+    regions = mask_regions(mask)
+    if len(regions) < 2:
+        return None
+    best: tuple[float, list[int], float] | None = None
+    for box in regions:
+        x0, y0, x1, y1 = box
+        if min(x1 - x0, y1 - y0) < MIN_REFERENCE_PX:
+            continue
+        coverage = _border_coverage(mask[y0:y1, x0:x1])
+        error = _aspect_error(x1 - x0, y1 - y0, spec)
+        if coverage < MIN_BORDER_COVERAGE or error > ASPECT_TOLERANCE:
+            continue
+        if best is None or error < best[0]:
+            best = (error, box, coverage)
+    if best is None:
+        return None
+    error, box, coverage = best
+    return box, coverage * (1.0 - error / ASPECT_TOLERANCE * 0.5)
+
+
+def _refine_bbox(gray: np.ndarray, box: list[int]) -> list[int] | None:
+    # Otsu on the padded crop separates the reference from its surroundings; the class the
+    # crop border mostly belongs to is background.
+    x0, y0, x1, y1 = box
+    crop = gray[y0:y1, x0:x1]
+    if crop.size == 0:
+        return None
+    threshold, _ = otsu_threshold(crop)
+    outline = np.concatenate((crop[0], crop[-1], crop[:, 0], crop[:, -1]))
+    foreground = crop <= threshold if np.median(outline) > threshold else crop > threshold
+    refined = mask_bbox(foreground)
+    if refined is None:
+        return None
+    return [x0 + refined[0], y0 + refined[1], x0 + refined[2], y0 + refined[3]]
+
+
+def detect_reference(
+    mask: np.ndarray,
+    load_gray: Callable[[], np.ndarray],
+    spec: ReferenceSpec,
+) -> Calibration | None:
+    """Find the reference in ``mask`` and derive mm-per-pixel from the full-resolution image.
+
+    ``load_gray`` returns the full-resolution grayscale image; it is only
+    called once a candidate block has been found.
+    """
+    found = _find_reference_block(mask, spec)
+    if found is None:
+        return None
+    (x0, y0, x1, y1), confidence = found
+
+    gray = load_gray()
+    full_h, full_w = gray.shape
+    scale_x = full_w / mask.shape[1]
+    scale_y = full_h / mask.shape[0]
+    pad_x = math.ceil(scale_x)
+    pad_y = math.ceil(scale_y)
+    refined = _refine_bbox(
+        gray,
+        [
+            max(0, math.floor(x0 * scale_x) - pad_x),
+            max(0, math.floor(y0 * scale_y) - pad_y),
+            min(full_w, math.ceil(x1 * scale_x) + pad_x),
+            min(full_h, math.ceil(y1 * scale_y) + pad_y),
+        ],
+    )
+    if refined is None:
+        return None
+
+    width_px = refined[2] - refined[0]
+    height_px = refined[3] - refined[1]
+    long_mm, short_mm = spec.sides
+    long_scale = long_mm / max(width_px, height_px)
+    short_scale = short_mm / max(1, min(width_px, height_px))
+    # Both axes should agree on the scale; disagreement means a tilted or occluded reference.
+    agreement = 1.0 - abs(long_scale - short_scale) / max(long_scale, short_scale)
+    if agreement < 1.0 - ASPECT_TOLERANCE:
+        return None
+    return Calibration(
+        mm_per_px=round((long_scale + short_scale) / 2, 6),
+        method='reference',
+        confidence=round(max(0.0, min(1.0, confidence * agreement)), 4),
+        reference_bbox=refined,
+        image_size=(full_w, full_h),
+    )
+
+
+def object_mask(mask: np.ndarray, full_size: tuple[int, int], exclude: list[int] | None = None) -> np.ndarray:
+    """``mask`` with the ``exclude`` box (full-image pixels, e.g. the reference) cleared."""
+    if exclude is None:
+        return mask
+    full_w, full_h = full_size
+    scale_x = full_w / mask.shape[1]
+    scale_y = full_h / mask.shape[0]
+    mask = mask.copy()
+    mask[
+        max(0, math.floor(exclude[1] / scale_y) - 1):math.ceil(exclude[3] / scale_y) + 1,
+        max(0, math.floor(exclude[0] / scale_x) - 1):math.ceil(exclude[2] / scale_x) + 1,
+    ] = False
+    return mask
+
+
+def row_widths(mask: np.ndarray, bins: int = PROFILE_BINS) -> np.ndarray:
+    """Foreground extent of each row between the mask's first and last filled rows, resampled to ``bins``."""
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return np.zeros(0)
+    band = mask[rows[0]:rows[-1] + 1]
+    first = np.argmax(band, axis=1)
+    last = band.shape[1] - 1 - np.argmax(band[:, ::-1], axis=1)
+    widths = np.where(band.any(axis=1), last - first + 1, 0).astype(np.float64)
+    return np.interp(np.linspace(0, widths.size - 1, bins), np.arange(widths.size), widths)
+
+
+def measure_object(
+    mask: np.ndarray, full_size: tuple[int, int], exclude: list[int] | None = None
+) -> dict[str, Any] | None:
+    """Bounding box, fill ratio and row-width profile (full-image pixels) of the mask outside ``exclude``."""
+    full_w, full_h = full_size
+    scale_x = full_w / mask.shape[1]
+    scale_y = full_h / mask.shape[0]
+    mask = object_mask(mask, full_size, exclude)
+    bbox = mask_bbox(mask)
+    if bbox is None:
+        return None
+    x0, y0, x1, y1 = bbox
+    return {
+        'bbox': [
+            math.floor(x0 * scale_x),
+            math.floor(y0 * scale_y),
+            min(full_w, math.ceil(x1 * scale_x)),
+            min(full_h, math.ceil(y1 * scale_y)),
+        ],
+        'fill_ratio': round(float(mask[y0:y1, x0:x1].mean()), 4),
+        'profile_px': [round(float(width), 2) for width in row_widths(mask) * scale_x],
+    }
+
+
+class CalibrationProfiles:
+    """Bounded LRU of calibrations per studio/camera profile, shared by all jobs of this process."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self._entries: OrderedDict[str, Calibration] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, profile: str, image_size: tuple[int, int]) -> Calibration | None:
+        """The profile's calibration, if it was measured on frames of ``image_size``."""
+        with self._lock:
+            calibration = self._entries.get(profile)
+            if calibration is None or calibration.image_size != image_size:
+                return None
+            self._entries.move_to_end(profile)
+            return calibration
+
+    def peek(self, profile: str) -> Calibration | None:
+        with self._lock:
+            return self._entries.get(profile)
+
+    def put(self, profile: str, calibration: Calibration) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[profile] = calibration
+            self._entries.move_to_end(profile)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, profile: str) -> bool:
+        with self._lock:
+            return self._entries.pop(profile, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+def calibrate(
+    mask: np.ndarray,
+    image_size: tuple[int, int],
+    load_gray: Callable[[], np.ndarray],
+    spec: ReferenceSpec,
+    default_mm_per_px: float,
+    profiles: CalibrationProfiles | None = None,
+    profile: str | None = None,
+) -> dict[str, Any]:
+    """Calibrate one frame and measure its object; the result is the job's calibration metadata."""
+    calibration = profiles.get(profile, image_size) if profiles is not None and profile else None
+    if calibration is not None:
+        calibration = calibration._replace(method='profile')
+    else:
+        calibration = detect_reference(mask, load_gray, spec)
+        if calibration is not None and profiles is not None and profile:
+            profiles.put(profile, calibration)
+    if calibration is None:
+        calibration = Calibration(mm_per_px=default_mm_per_px, method='default', confidence=0.0)
+
+    measured = measure_object(mask, image_size, calibration.reference_bbox)
+    return {
+        'method': calibration.method,
+        'profile': profile,
+        'mm_per_px': calibration.mm_per_px,
+        'confidence': calibration.confidence,
+        'reference_bbox': calibration.reference_bbox,
+        'object_bbox': measured['bbox'] if measured else None,
+        'object_fill_ratio': measured['fill_ratio'] if measured else None,
+        'object_profile_px': measured['profile_px'] if measured else None,
+    }
@@ -8,7 +8,55 @@ class Settings:
         "DATABASE_URL",
         "postgresql://postgres:postgres@db:5432/cosmetic_packaging",
     )
+    db_pool_min_size: int = int(os.getenv("DB_POOL_MIN_SIZE", "1"))
+    db_pool_max_size: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    # "memory" keeps jobs in process; "postgres" shares them between workers.
+    job_store_backend: str = os.getenv("JOB_STORE_BACKEND", "memory")
+    # In-memory store bounds (0 = unlimited). Only completed jobs are evicted, LRU first;
+    # with a spill dir they move to disk instead of being dropped.
+    job_store_max_jobs: int = int(os.getenv("JOB_STORE_MAX_JOBS", "0"))
+    job_store_max_bytes: int = int(os.getenv("JOB_STORE_MAX_BYTES", "0"))
+    job_store_ttl_seconds: float = float(os.getenv("JOB_STORE_TTL_SECONDS", "0"))
+    job_store_spill_dir: str = os.getenv("JOB_STORE_SPILL_DIR", "")
     upload_dir: str = os.getenv("UPLOAD_DIR", "/tmp/cosmetic-packaging-ai/uploads")
+    # "local" keeps blobs in UPLOAD_DIR only; "s3" also replicates them to an S3-compatible bucket.
+    storage_backend: str = os.getenv("STORAGE_BACKEND", "local")
+    s3_bucket: str = os.getenv("S3_BUCKET", "")
+    s3_prefix: str = os.getenv("S3_PREFIX", "uploads/")
+    s3_endpoint_url: str = os.getenv("S3_ENDPOINT_URL", "")
+    s3_region: str = os.getenv("S3_REGION", "")
+    s3_multipart_threshold_bytes: int = int(os.getenv("S3_MULTIPART_THRESHOLD_BYTES", str(8 * 1024 * 1024)))
+    s3_part_size_bytes: int = int(os.getenv("S3_PART_SIZE_BYTES", str(8 * 1024 * 1024)))
+    # Derived per-image artifacts (working array, OCR grayscale, thumbnail), LRU-bounded on disk.
+    artifact_cache_dir: str = os.getenv("ARTIFACT_CACHE_DIR", "/tmp/cosmetic-packaging-ai/artifacts")
+    artifact_cache_max_bytes: int = int(os.getenv("ARTIFACT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+    max_upload_bytes: int = int(os.getenv("MAX_UPLOAD_BYTES", str(64 * 1024 * 1024)))
+    upload_chunk_bytes: int = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1024 * 1024)))
+    upload_header_bytes: int = int(os.getenv("UPLOAD_HEADER_BYTES", str(256 * 1024)))
+    # Images per batch, archive members included. Direct multipart uploads are also capped
+    # at 1000 files by Starlette's form parser, so the default matches that limit.
+    max_batch_items: int = int(os.getenv("MAX_BATCH_ITEMS", "1000"))
+    max_batch_bytes: int = int(os.getenv("MAX_BATCH_BYTES", str(2 * 1024 * 1024 * 1024)))
+    result_cache_max_entries: int = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+    result_cache_ttl_seconds: float = float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600"))
+    # "otsu-bg-subtraction" (NumPy engine) or "mvp-dummy-threshold" (byte-histogram placeholder).
+    segmentation_algorithm: str = os.getenv("SEGMENTATION_ALGORITHM", "otsu-bg-subtraction")
+    # Reference object for calibration, "<width>x<height>" in mm (default: ISO ID-1 card).
+    calibration_reference_mm: str = os.getenv("CALIBRATION_REFERENCE_MM", "85.6x53.98")
+    calibration_default_mm_per_px: float = float(os.getenv("CALIBRATION_DEFAULT_MM_PER_PX", "0.2"))
+    calibration_profile_max_entries: int = int(os.getenv("CALIBRATION_PROFILE_MAX_ENTRIES", "256"))
+    # JSON list of packaging sizes; empty uses the built-in catalogue of standard cosmetic sizes.
+    packaging_catalogue_path: str = os.getenv("PACKAGING_CATALOGUE_PATH", "")
+    ocr_workers: int = int(os.getenv("OCR_WORKERS", str(os.cpu_count() or 1)))
+    # "full" runs OCR on the whole image; "roi" only on crops of the segmentation mask blocks.
+    ocr_mode: str = os.getenv("OCR_MODE", "full")
+    ocr_roi_max_side: int = int(os.getenv("OCR_ROI_MAX_SIDE", "1600"))
+    # "inline": the request waits for the pipeline; "queued": it returns immediately.
+    job_execution_mode: str = os.getenv("JOB_EXECUTION_MODE", "inline")
+    job_workers: int = int(os.getenv("JOB_WORKERS", str(os.cpu_count() or 1)))
+    job_queue_size: int = int(os.getenv("JOB_QUEUE_SIZE", "64"))
+    # Batch jobs admitted but not yet handed to the worker pool; larger batches get 429.
+    batch_backlog_size: int = int(os.getenv("BATCH_BACKLOG_SIZE", "10000"))
 
 
 settings = Settings()
@@ -1,11 +1,38 @@
-from psycopg import connect
+import threading
+
+from psycopg_pool import ConnectionPool
 
 from .config import settings
 
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                settings.database_url,
+                min_size=settings.db_pool_min_size,
+                max_size=settings.db_pool_max_size,
+                kwargs={'connect_timeout': 2},
+                open=True,
+            )
+        return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
 
 def check_db_connection() -> bool:
     try:
-        with connect(settings.database_url, connect_timeout=2) as conn:
+        with get_pool().connection(timeout=2) as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT 1")
                 cur.fetchone()
@@ -0,0 +1,121 @@
+"""Job outputs derived from ``dimensions_mm``, recomputed incrementally on corrections.
+
+Each ``Derivation`` names the values it reads. When some values change, the
+graph walks its derivations in dependency order and calls only those with a
+changed input; a derivation whose result equals the stored one stops the
+change there (e.g. a correction that keeps the shape family leaves the mesh
+alone). The expensive upstream stages (decode, segmentation, calibration,
+OCR) are not part of the graph: their stored results are plain inputs, so a
+correction never reruns them.
+
+The mesh node only produces the mesh spec; its GLB is built on the first
+download after the spec changes.
+"""
+
+from typing import Any, Callable, Iterable, Mapping, NamedTuple
+
+from .mesh import mesh_spec
+from .packaging import PackagingCatalogue
+from .shape_engine import shape_proxy_for_dimensions
+from .store import JobMeta
+
+
+class Derivation(NamedTuple):
+    name: str
+    inputs: tuple[str, ...]
+    # Called with the input values in ``inputs`` order.
+    compute: Callable[..., Any]
+
+
+class DerivationGraph:
+    def __init__(self, derivations: Iterable[Derivation]) -> None:
+        pending = {derivation.name: derivation for derivation in derivations}
+        order: list[Derivation] = []
+        while pending:
+            # A derivation may read its own stored value; only other pending derivations block it.
+            ready = [d for d in pending.values() if all(n == d.name or n not in pending for n in d.inputs)]
+            if not ready:
+                raise ValueError(f'Derivation cycle among {sorted(pending)}')
+            for derivation in ready:
+                order.append(pending.pop(derivation.name))
+        self.order = tuple(order)
+
+    def recompute(self, values: Mapping[str, Any], changed: Iterable[str]) -> dict[str, Any]:
+        """Values of the derivations whose result differs from ``values`` after ``changed`` changed."""
+        current = dict(values)
+        dirty = set(changed)
+        updates: dict[str, Any] = {}
+        for derivation in self.order:
+            if dirty.isdisjoint(derivation.inputs):
+                continue
+            value = derivation.compute(*(current.get(name) for name in derivation.inputs))
+            if value != current.get(derivation.name):
+                current[derivation.name] = updates[derivation.name] = value
+                dirty.add(derivation.name)
+        return updates
+
+
+def _volume(dimensions_mm: dict[str, float], fusion: dict[str, Any] | None) -> float:
+    factor = float((fusion or {}).get('volume_factor', 1.0))
+    return round(dimensions_mm['width'] * dimensions_mm['depth'] * dimensions_mm['height'] * factor, 3)
+
+
+def _shape_proxy(dimensions_mm: dict[str, float], shape_proxy: dict[str, Any] | None) -> dict[str, Any] | None:
+    return shape_proxy_for_dimensions(shape_proxy, dimensions_mm) if shape_proxy else None
+
+
+def _mesh(
+    shape_proxy: dict[str, Any] | None, dimensions_mm: dict[str, float], mesh: dict[str, Any] | None
+) -> dict[str, Any] | None:
+    if not mesh:
+        return None
+    family = (shape_proxy or {}).get('shape_family')
+    return mesh_spec(family, dimensions_mm, mesh.get('width_profile'), mesh.get('depth_profile'))
+
+
+def _packaging(
+    dimensions_mm: dict[str, float], shape_proxy: dict[str, Any] | None, catalogue: PackagingCatalogue | None
+) -> dict[str, Any] | None:
+    if catalogue is None:
+        return None
+    return catalogue.fit(dimensions_mm, (shape_proxy or {}).get('shape_family'))
+
+
+# Values are named after JobMeta fields, or 'quality_metrics.<key>' for entries of quality_metrics. The shape
+# proxy reads its own mask fill ratio and the mesh its silhouette profiles; 'packaging_catalogue' is supplied
+# by the caller.
+JOB_OUTPUTS = DerivationGraph(
+    [
+        Derivation('volume_mm3', ('dimensions_mm', 'quality_metrics.fusion'), _volume),
+        Derivation('shape_proxy', ('dimensions_mm', 'shape_proxy'), _shape_proxy),
+        Derivation('quality_metrics.mesh', ('shape_proxy', 'dimensions_mm', 'quality_metrics.mesh'), _mesh),
+        Derivation('quality_metrics.packaging', ('dimensions_mm', 'shape_proxy', 'packaging_catalogue'), _packaging),
+    ]
+)
+
+
+def job_values(meta: JobMeta) -> dict[str, Any]:
+    quality_metrics = meta.quality_metrics or {}
+    values: dict[str, Any] = {f'quality_metrics.{key}': value for key, value in quality_metrics.items()}
+    values.update(dimensions_mm=meta.dimensions_mm, volume_mm3=meta.volume_mm3, shape_proxy=meta.shape_proxy)
+    return values
+
+
+def correct_dimensions(
+    meta: JobMeta, dimensions_mm: dict[str, float], catalogue: PackagingCatalogue | None = None
+) -> dict[str, Any]:
+    """JobMeta fields to store for a correction of ``meta`` to ``dimensions_mm``."""
+    fields: dict[str, Any] = {'dimensions_mm': dimensions_mm}
+    if dimensions_mm == meta.dimensions_mm:
+        return fields
+    values = job_values(meta)
+    values.update(dimensions_mm=dimensions_mm, packaging_catalogue=catalogue)
+    quality_metrics = dict(meta.quality_metrics or {})
+    for name, value in JOB_OUTPUTS.recompute(values, ['dimensions_mm']).items():
+        field, _, key = name.partition('.')
+        if key:
+            quality_metrics[key] = value
+            fields['quality_metrics'] = quality_metrics
+        else:
+            fields[field] = value
+    return fields
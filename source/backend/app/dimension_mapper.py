@@ -1,5 +1,6 @@
+import math
 import re
-from typing import Any
+from typing import Any, NamedTuple
 
 _DIM_TOKENS = {
     'width': ('w', 'width', '가로'),
@@ -7,45 +8,119 @@ _DIM_TOKENS = {
     'depth': ('d', 'depth', '길이'),
     'max_diameter': ('dia', 'diameter', 'ø', 'φ'),
 }
+_TARGETS = tuple(_DIM_TOKENS)
+
+_UNIT_FACTORS = {
+    'mm': (1.0, 'mm'),
+    'millimeter': (1.0, 'mm'),
+    'millimeters': (1.0, 'mm'),
+    'cm': (10.0, 'cm'),
+    'centimeter': (10.0, 'cm'),
+    'centimeters': (10.0, 'cm'),
+    'm': (1000.0, 'm'),
+    'meter': (1000.0, 'm'),
+    'meters': (1000.0, 'm'),
+    'in': (25.4, 'in'),
+    'inch': (25.4, 'in'),
+    'inches': (25.4, 'in'),
+}
+
+
+def _token_pattern(tokens: tuple[str, ...]) -> str:
+    # ASCII word tokens need word boundaries; Korean and symbol tokens match as substrings.
+    words = sorted((t for t in tokens if t.isascii() and t.isalnum()), key=len, reverse=True)
+    symbols = sorted((t for t in tokens if not (t.isascii() and t.isalnum())), key=len, reverse=True)
+    parts = [rf"\b(?:{'|'.join(map(re.escape, words))})\b"] if words else []
+    parts.extend(map(re.escape, symbols))
+    return '|'.join(parts)
+
+
+# One alternation over false-positive patterns, values and every target token, built once.
+# False positives come first so version strings win over the value branch at the same offset.
+_TARGET_PRIORITY = {target: rank for rank, target in enumerate(_DIM_TOKENS)}
+_MATCHER = re.compile(
+    '|'.join(
+        [
+            r'(?P<false_positive>\bv\d+(?:\.\d+)+\b|\b\d+\.\d+\.\d+\b)',
+            r'(?<![\w.])(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>mm|cm|m|in)?\b',
+            *(f'(?P<{target}>{_token_pattern(tokens)})' for target, tokens in _DIM_TOKENS.items()),
+        ]
+    )
+)
+
+
+class _ScanResult(NamedTuple):
+    false_positive: bool
+    target: str | None
+    values: list[tuple[float, str | None]]
 
 
 def _to_mm(value: float, unit: str | None) -> tuple[float, str]:
     unit_norm = (unit or 'mm').strip().lower()
-    if unit_norm in {'mm', 'millimeter', 'millimeters'}:
-        return float(value), 'mm'
-    if unit_norm in {'cm', 'centimeter', 'centimeters'}:
-        return float(value) * 10.0, 'cm'
-    if unit_norm in {'m', 'meter', 'meters'}:
-        return float(value) * 1000.0, 'm'
-    if unit_norm in {'in', 'inch', 'inches'}:
-        return float(value) * 25.4, 'in'
-    return float(value), unit_norm
-
-
-def _is_false_positive(text: str) -> bool:
-    lowered = text.strip().lower()
-    if re.search(r'\bv\d+(?:\.\d+)+\b', lowered):
-        return True
-    if re.search(r'\b\d+\.\d+\.\d+\b', lowered):
-        return True
-    return False
-
-
-def _extract_values(text: str) -> list[tuple[float, str | None]]:
+    factor = _UNIT_FACTORS.get(unit_norm)
+    if factor is None:
+        return float(value), unit_norm
+    return float(value) * factor[0], factor[1]
+
+
+def _scan(lowered: str) -> _ScanResult:
+    target_rank: int | None = None
     values: list[tuple[float, str | None]] = []
-    for m in re.finditer(r'(?<![\w.])(\d+(?:\.\d+)?)(?:\s*)(mm|cm|m|in)?\b', text, re.IGNORECASE):
-        values.append((float(m.group(1)), m.group(2)))
-    return values
+
+    for m in _MATCHER.finditer(lowered):
+        kind = m.lastgroup
+        if kind == 'false_positive':
+            return _ScanResult(True, None, [])
+        if kind in ('value', 'unit'):
+            values.append((float(m.group('value')), m.group('unit')))
+            continue
+        rank = _TARGET_PRIORITY[kind]
+        if target_rank is None or rank < target_rank:
+            target_rank = rank
+
+    target = None if target_rank is None else _TARGETS[target_rank]
+    return _ScanResult(False, target, values)
 
 
-def _detect_target(text: str) -> str | None:
-    lowered = text.lower()
-    for target, tokens in _DIM_TOKENS.items():
-        if any(re.search(rf'\b{re.escape(token)}\b', lowered) for token in tokens if token.isascii() and token.isalnum()):
-            return target
-        if any(token in lowered for token in tokens if not (token.isascii() and token.isalnum())):
-            return target
-    return None
+def _finite_float(value: Any, field: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError(f'{field} must be a number')
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(f'{field} must be a finite number')
+    return number
+
+
+def _optional_str(value: Any, field: str) -> str | None:
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f'{field} must be a string')
+    return value
+
+
+def coerce_ocr_items(raw: Any) -> list[dict[str, Any]]:
+    """Validate raw OCR items like ``OCRItemInput`` without building a model per item.
+
+    Non-string ``text``/``unit`` and non-finite numbers are rejected so every
+    mapped value can be serialised as strict JSON.
+    """
+    if not isinstance(raw, list):
+        raise ValueError('ocr_items must be a list')
+
+    items: list[dict[str, Any]] = []
+    for entry in raw:
+        if not isinstance(entry, dict):
+            raise ValueError('each OCR item must be an object')
+        value = entry.get('value')
+        confidence = entry.get('confidence')
+        items.append(
+            {
+                'text': _optional_str(entry.get('text'), 'text') or '',
+                'value': None if value is None else _finite_float(value, 'value'),
+                'unit': _optional_str(entry.get('unit'), 'unit'),
+                'confidence': 0.0 if confidence is None else _finite_float(confidence, 'confidence'),
+            }
+        )
+    return items
 
 
 def map_dimensions(ocr_items: list[dict[str, Any]]) -> dict[str, Any]:
@@ -54,7 +129,9 @@ def map_dimensions(ocr_items: list[dict[str, Any]]) -> dict[str, Any]:
 
     for idx, item in enumerate(ocr_items):
         text = str(item.get('text') or '')
-        if _is_false_positive(text):
+        lowered = text.lower()
+        scan = _scan(lowered)
+        if scan.false_positive:
             continue
 
         confidence = float(item.get('confidence', 0.0) or 0.0)
@@ -67,17 +144,16 @@ def map_dimensions(ocr_items: list[dict[str, Any]]) -> dict[str, Any]:
             if value is not None:
                 values = [(value, item.get('unit'))]
             else:
-                values = _extract_values(text)
+                values = scan.values
         else:
-            values = _extract_values(text)
+            values = scan.values
 
         if not values:
             continue
 
-        target = _detect_target(text)
+        target = scan.target
 
         # size / x / × formatted strings
-        lowered = text.lower()
         if target is None and (' x ' in lowered or '×' in lowered or 'size' in lowered):
             values_for_size = values[:3]
             ordered_targets = ['width', 'height', 'depth']
@@ -0,0 +1,85 @@
+"""Job status change notifications fanned out to asyncio subscribers.
+
+The job store reports status transitions from whichever thread made them;
+``JobEventHub.publish`` hands each one to the event loop of every
+subscription watching that job, so streaming endpoints wait on a queue
+instead of polling the store.
+"""
+
+import asyncio
+import threading
+from typing import Iterable, NamedTuple
+
+
+class JobStatusEvent(NamedTuple):
+    job_id: str
+    status: str
+
+
+class JobSubscription:
+    def __init__(self, hub: 'JobEventHub', job_ids: frozenset[str], loop: asyncio.AbstractEventLoop) -> None:
+        self.job_ids = job_ids
+        self._hub = hub
+        self._loop = loop
+        self._queue: asyncio.Queue[JobStatusEvent] = asyncio.Queue()
+
+    def _push(self, event: JobStatusEvent) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+        except RuntimeError:
+            # The subscriber's loop is gone; it will never read the queue again.
+            self.close()
+
+    async def get(self, timeout: float) -> JobStatusEvent | None:
+        """Next event, or None when ``timeout`` seconds pass without one."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self._hub._remove(self)
+
+    def __enter__(self) -> 'JobSubscription':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class JobEventHub:
+    def __init__(self) -> None:
+        self._subscriptions: dict[str, set[JobSubscription]] = {}
+        self._active: set[JobSubscription] = set()
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_ids: Iterable[str]) -> JobSubscription:
+        """Watch ``job_ids``; must be called from the event loop that will read the events."""
+        subscription = JobSubscription(self, frozenset(job_ids), asyncio.get_running_loop())
+        with self._lock:
+            self._active.add(subscription)
+            for job_id in subscription.job_ids:
+                self._subscriptions.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def _remove(self, subscription: JobSubscription) -> None:
+        with self._lock:
+            self._active.discard(subscription)
+            for job_id in subscription.job_ids:
+                watchers = self._subscriptions.get(job_id)
+                if watchers is not None:
+                    watchers.discard(subscription)
+                    if not watchers:
+                        del self._subscriptions[job_id]
+
+    def publish(self, job_id: str, status: str) -> None:
+        """Thread-safe; a no-op when nobody watches ``job_id``."""
+        with self._lock:
+            watchers = list(self._subscriptions.get(job_id, ()))
+        event = JobStatusEvent(job_id, status)
+        for subscription in watchers:
+            subscription._push(event)
+
+    def subscription_count(self) -> int:
+        with self._lock:
+            return len(self._active)
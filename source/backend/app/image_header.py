@@ -0,0 +1,338 @@
+"""Zero-copy image header parsing.
+
+Formats and pixel dimensions are read with ``struct.unpack_from`` over a
+``memoryview``; nothing is sliced into new ``bytes``. For stored uploads the
+file is memory-mapped, so only the pages that hold the headers are read even
+when a JPEG frame header sits behind megabytes of ICC/EXIF data.
+"""
+
+import mmap
+import os
+import struct
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+Buffer = bytes | bytearray | memoryview
+
+_U16_BE = struct.Struct('>H')
+_U16_LE = struct.Struct('<H')
+_U32_BE = struct.Struct('>I')
+_U32_LE = struct.Struct('<I')
+_PAIR_U16_LE = struct.Struct('<HH')
+_PAIR_U32_BE = struct.Struct('>II')
+_PAIR_I32_LE = struct.Struct('<ii')
+
+_JPEG_SOF_MARKERS = frozenset({0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF})
+# Containers nested inside ``meta`` on the way to the ``ispe`` property boxes.
+_ISOBMFF_CONTAINERS = (b'meta', b'iprp', b'ipco')
+_MAX_BOX_DEPTH = 4
+
+
+class ImageHeader(NamedTuple):
+    format: str | None
+    width: int | None
+    height: int | None
+    orientation: int | None = None
+
+
+class SniffResult(NamedTuple):
+    format: str | None
+    orientation: int | None
+
+
+_UNKNOWN = ImageHeader(None, None, None)
+
+# Magic numbers as (format, ((offset, bytes), ...)); every part must match.
+# All fit in the first _SNIFF_BYTES, so detection is one bounded pass over the prefix.
+_SIGNATURES: tuple[tuple[str, tuple[tuple[int, bytes], ...]], ...] = (
+    ('png', ((0, b'\x89PNG\r\n\x1a\n'),)),
+    ('jpeg', ((0, b'\xff\xd8\xff'),)),
+    ('gif', ((0, b'GIF87a'),)),
+    ('gif', ((0, b'GIF89a'),)),
+    ('webp', ((0, b'RIFF'), (8, b'WEBP'))),
+    ('bmp', ((0, b'BM'),)),
+    ('tiff', ((0, b'II*\x00'),)),
+    ('tiff', ((0, b'MM\x00*'),)),
+    ('jxl', ((0, b'\xff\x0a'),)),
+    ('jxl', ((0, b'\x00\x00\x00\x0cJXL \r\n\x87\n'),)),
+)
+_SNIFF_BYTES = 32
+# Candidates grouped by first byte so a lookup only tries signatures that can match.
+_SIGNATURES_BY_FIRST_BYTE: dict[int, list[tuple[str, tuple[tuple[int, bytes], ...]]]] = {}
+for _entry in _SIGNATURES:
+    _SIGNATURES_BY_FIRST_BYTE.setdefault(_entry[1][0][1][0], []).append(_entry)
+del _entry
+
+# ISOBMFF major/compatible brands; AVIF wins when a file lists both.
+_FTYP_BRANDS = {
+    **{brand: 'heic' for brand in (b'heic', b'heix', b'hevc', b'hevx', b'heim', b'heis', b'hevm', b'hevs')},
+    **{brand: 'avif' for brand in (b'avif', b'avis')},
+}
+
+_EXIF_ORIENTATION_TAG = 0x0112
+
+
+def _ftyp_format(buf: Buffer) -> str | None:
+    if len(buf) < 16 or buf[4:8] != b'ftyp':
+        return None
+    box_size = min(_U32_BE.unpack_from(buf, 0)[0], len(buf))
+    found = {_FTYP_BRANDS.get(bytes(buf[offset : offset + 4])) for offset in (8, *range(16, box_size - 3, 4))}
+    if 'avif' in found:
+        return 'avif'
+    return 'heic' if 'heic' in found else None
+
+
+def sniff_format(buf: Buffer) -> str | None:
+    prefix = bytes(buf[:_SNIFF_BYTES])
+    if not prefix:
+        return None
+    for image_format, parts in _SIGNATURES_BY_FIRST_BYTE.get(prefix[0], ()):
+        for offset, magic in parts:
+            if not prefix.startswith(magic, offset):
+                break
+        else:
+            return image_format
+    return _ftyp_format(buf)
+
+
+def _tiff_orientation(buf: Buffer, base: int, end: int) -> int | None:
+    # ``base`` points at a TIFF header (a TIFF file or the payload of an EXIF block).
+    if base + 8 > end:
+        return None
+    order = buf[base : base + 2]
+    if order == b'II':
+        u16, u32 = _U16_LE, _U32_LE
+    elif order == b'MM':
+        u16, u32 = _U16_BE, _U32_BE
+    else:
+        return None
+    ifd = base + u32.unpack_from(buf, base + 4)[0]
+    if ifd + 2 > end:
+        return None
+    for index in range(u16.unpack_from(buf, ifd)[0]):
+        entry = ifd + 2 + index * 12
+        if entry + 12 > end:
+            return None
+        if u16.unpack_from(buf, entry)[0] == _EXIF_ORIENTATION_TAG:
+            value = u16.unpack_from(buf, entry + 8)[0]
+            return value if 1 <= value <= 8 else None
+    return None
+
+
+def _jpeg_orientation(buf: Buffer) -> int | None:
+    i, end = 2, len(buf)
+    while i + 4 <= end and buf[i] == 0xFF:
+        marker = buf[i + 1]
+        if marker == 0xDA or (0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC)):
+            return None  # EXIF must precede the frame header
+        length = _U16_BE.unpack_from(buf, i + 2)[0]
+        if marker == 0xE1 and buf[i + 4 : i + 10] == b'Exif\x00\x00':
+            return _tiff_orientation(buf, i + 10, min(end, i + 2 + length))
+        i += 2 + length
+    return None
+
+
+def _png_orientation(buf: Buffer) -> int | None:
+    offset, end = 8, len(buf)
+    while offset + 8 <= end:
+        length = _U32_BE.unpack_from(buf, offset)[0]
+        chunk = buf[offset + 4 : offset + 8]
+        if chunk == b'eXIf':
+            return _tiff_orientation(buf, offset + 8, min(end, offset + 8 + length))
+        if chunk in (b'IDAT', b'IEND'):
+            return None
+        offset += 12 + length
+    return None
+
+
+def _webp_orientation(buf: Buffer) -> int | None:
+    if buf[12:16] != b'VP8X' or not buf[20] & 0x08:  # EXIF flag
+        return None
+    offset, end = 12, len(buf)
+    while offset + 8 <= end:
+        length = _U32_LE.unpack_from(buf, offset + 4)[0]
+        if buf[offset : offset + 4] == b'EXIF':
+            body = offset + 8
+            if buf[body : body + 6] == b'Exif\x00\x00':
+                body += 6
+            return _tiff_orientation(buf, body, min(end, offset + 8 + length))
+        offset += 8 + length + (length & 1)
+    return None
+
+
+_ORIENTATION_PARSERS: dict[str, Callable[[Buffer], int | None]] = {
+    'jpeg': _jpeg_orientation,
+    'tiff': lambda buf: _tiff_orientation(buf, 0, len(buf)),
+    'png': _png_orientation,
+    'webp': _webp_orientation,
+}
+
+
+def read_orientation(buf: Buffer, image_format: str) -> int | None:
+    """EXIF orientation (1-8) if the header carries one, else None."""
+    parser = _ORIENTATION_PARSERS.get(image_format)
+    try:
+        return parser(buf) if parser else None
+    except (struct.error, IndexError):
+        return None
+
+
+def sniff_image(buf: Buffer) -> SniffResult:
+    image_format = sniff_format(buf)
+    return SniffResult(image_format, read_orientation(buf, image_format) if image_format else None)
+
+
+def _png_size(buf: Buffer) -> tuple[int, int] | None:
+    if len(buf) < 24 or buf[12:16] != b'IHDR':
+        return None
+    return _PAIR_U32_BE.unpack_from(buf, 16)
+
+
+def _gif_size(buf: Buffer) -> tuple[int, int] | None:
+    return _PAIR_U16_LE.unpack_from(buf, 6) if len(buf) >= 10 else None
+
+
+def _jpeg_size(buf: Buffer) -> tuple[int, int] | None:
+    i, end = 2, len(buf)
+    while i + 1 < end:
+        if buf[i] != 0xFF:
+            i += 1
+            continue
+        marker = buf[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        i += 2
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker in (0xD9, 0xDA) or i + 2 > end:
+            return None
+        segment_length = _U16_BE.unpack_from(buf, i)[0]
+        if segment_length < 2:
+            return None
+        if marker in _JPEG_SOF_MARKERS:
+            if i + 7 > end:
+                return None
+            height = _U16_BE.unpack_from(buf, i + 3)[0]
+            width = _U16_BE.unpack_from(buf, i + 5)[0]
+            return width, height
+        i += segment_length
+    return None
+
+
+def _webp_size(buf: Buffer) -> tuple[int, int] | None:
+    chunk = buf[12:16]
+    if chunk == b'VP8X' and len(buf) >= 30:
+        # 24-bit little-endian canvas size minus one.
+        width = 1 + (buf[24] | buf[25] << 8 | buf[26] << 16)
+        height = 1 + (buf[27] | buf[28] << 8 | buf[29] << 16)
+        return width, height
+    if chunk == b'VP8 ' and len(buf) >= 30 and buf[23:26] == b'\x9d\x01\x2a':
+        width, height = _PAIR_U16_LE.unpack_from(buf, 26)
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(buf) >= 25 and buf[20] == 0x2F:
+        bits = _U32_LE.unpack_from(buf, 21)[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    return None
+
+
+def _bmp_size(buf: Buffer) -> tuple[int, int] | None:
+    if len(buf) < 26:
+        return None
+    if _U32_LE.unpack_from(buf, 14)[0] == 12:  # OS/2 BITMAPCOREHEADER
+        return _PAIR_U16_LE.unpack_from(buf, 18)
+    width, height = _PAIR_I32_LE.unpack_from(buf, 18)
+    return abs(width), abs(height)  # negative height marks a top-down bitmap
+
+
+def _tiff_size(buf: Buffer) -> tuple[int, int] | None:
+    u16, u32 = (_U16_LE, _U32_LE) if buf[:2] == b'II' else (_U16_BE, _U32_BE)
+    ifd = u32.unpack_from(buf, 4)[0]
+    if ifd + 2 > len(buf):
+        return None
+    values: dict[int, int] = {}
+    for index in range(u16.unpack_from(buf, ifd)[0]):
+        entry = ifd + 2 + index * 12
+        if entry + 12 > len(buf):
+            break
+        tag, field_type = u16.unpack_from(buf, entry)[0], u16.unpack_from(buf, entry + 2)[0]
+        if tag in (256, 257):  # ImageWidth, ImageLength: SHORT (3) or LONG (4)
+            values[tag] = u16.unpack_from(buf, entry + 8)[0] if field_type == 3 else u32.unpack_from(buf, entry + 8)[0]
+            if len(values) == 2:
+                return values[256], values[257]
+    return None
+
+
+def _iter_boxes(buf: Buffer, start: int, end: int):
+    offset = start
+    while offset + 8 <= end:
+        size = _U32_BE.unpack_from(buf, offset)[0]
+        header = 8
+        if size == 1 and offset + 16 <= end:
+            size = struct.unpack_from('>Q', buf, offset + 8)[0]
+            header = 16
+        elif size == 0:
+            size = end - offset
+        if size < header or offset + size > end:
+            return
+        yield bytes(buf[offset + 4 : offset + 8]), offset + header, offset + size
+        offset += size
+
+
+def _ispe_sizes(buf: Buffer, start: int, end: int, depth: int = 0):
+    for box_type, body, box_end in _iter_boxes(buf, start, end):
+        if box_type == b'ispe' and body + 12 <= box_end:
+            yield _PAIR_U32_BE.unpack_from(buf, body + 4)  # skip version/flags
+        elif box_type in _ISOBMFF_CONTAINERS and depth < _MAX_BOX_DEPTH:
+            # ``meta`` is a full box: version/flags precede its children.
+            yield from _ispe_sizes(buf, body + 4 if box_type == b'meta' else body, box_end, depth + 1)
+
+
+def _heif_size(buf: Buffer) -> tuple[int, int] | None:
+    # A HEIF file carries one ispe per item (grid, tiles, thumbnails); without
+    # resolving pitm/ipma the grid, i.e. the largest extent, is the full image.
+    sizes = list(_ispe_sizes(buf, 0, len(buf)))
+    return max(sizes, key=lambda size: size[0] * size[1]) if sizes else None
+
+
+_SIZE_PARSERS: dict[str, Callable[[Buffer], tuple[int, int] | None]] = {
+    'png': _png_size,
+    'jpeg': _jpeg_size,
+    'gif': _gif_size,
+    'webp': _webp_size,
+    'bmp': _bmp_size,
+    'tiff': _tiff_size,
+    'heic': _heif_size,
+    'avif': _heif_size,
+}
+
+
+def parse_dimensions(buf: Buffer, image_format: str) -> tuple[int | None, int | None]:
+    parser = _SIZE_PARSERS.get(image_format)
+    try:
+        size = parser(buf) if parser else None
+    except (struct.error, IndexError):
+        size = None
+    if not size:
+        return None, None
+    return int(size[0]), int(size[1])
+
+
+def parse_image_header(buf: Buffer) -> ImageHeader:
+    image_format, orientation = sniff_image(buf)
+    if image_format is None:
+        return _UNKNOWN
+    return ImageHeader(image_format, *parse_dimensions(buf, image_format), orientation)
+
+
+def read_image_header(path: Path) -> ImageHeader:
+    """Parse ``path`` through a read-only memory map; only touched pages are read."""
+    with path.open('rb') as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            return _UNKNOWN
+        mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        with memoryview(mapped) as view:
+            return parse_image_header(view)
+    finally:
+        mapped.close()
@@ -1,83 +1,75 @@
-import imghdr
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+
+from .artifacts import ImageArtifacts
+from .calibration import CalibrationProfiles, ReferenceSpec, calibrate
+from .config import settings
+from .image_header import ImageHeader, parse_dimensions, parse_image_header, read_image_header
+from .segmentation import OTSU_ALGORITHM, SegmentationResult, segment_array, segment_otsu, split_working_rgb
+
+# Bump when preprocess_image/segment_image output changes so cached results are invalidated.
+IMAGE_PIPELINE_VERSION = '5'
+DUMMY_ALGORITHM = 'mvp-dummy-threshold'
+_DUMMY_SAMPLE_BYTES = 4096
+
 
 class ImagePipelineError(ValueError):
     pass
 
 
 def _parse_dimensions(image_bytes: bytes, image_type: str) -> tuple[int | None, int | None]:
-    # PNG: width/height are bytes 16~23 in IHDR
-    if image_type == 'png' and len(image_bytes) >= 24:
-        width = int.from_bytes(image_bytes[16:20], 'big')
-        height = int.from_bytes(image_bytes[20:24], 'big')
-        return width, height
-
-    # JPEG: scan SOF marker without external dependencies
-    if image_type == 'jpeg' and len(image_bytes) > 4:
-        i = 2
-        while i + 9 < len(image_bytes):
-            if image_bytes[i] != 0xFF:
-                i += 1
-                continue
-            marker = image_bytes[i + 1]
-            i += 2
-            if marker in (0xD8, 0xD9):
-                continue
-            if i + 2 > len(image_bytes):
-                break
-            segment_length = int.from_bytes(image_bytes[i : i + 2], 'big')
-            if segment_length < 2 or i + segment_length > len(image_bytes):
-                break
-            # SOF0~SOF3 and SOF5~SOF7 and SOF9~SOF11 and SOF13~SOF15
-            if marker in {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}:
-                if i + 7 <= len(image_bytes):
-                    height = int.from_bytes(image_bytes[i + 3 : i + 5], 'big')
-                    width = int.from_bytes(image_bytes[i + 5 : i + 7], 'big')
-                    return width, height
-            i += segment_length
-
-    # GIF: little-endian width/height at 6~9
-    if image_type == 'gif' and len(image_bytes) >= 10:
-        width = int.from_bytes(image_bytes[6:8], 'little')
-        height = int.from_bytes(image_bytes[8:10], 'little')
-        return width, height
-
-    # WEBP: simple VP8X canvas parse
-    if image_type == 'webp' and len(image_bytes) >= 30:
-        if image_bytes[12:16] == b'VP8X':
-            width = 1 + int.from_bytes(image_bytes[24:27], 'little')
-            height = 1 + int.from_bytes(image_bytes[27:30], 'little')
-            return width, height
-
-    return None, None
-
-
-def preprocess_image(image_bytes: bytes) -> dict[str, Any]:
+    return parse_dimensions(memoryview(image_bytes), image_type)
+
+
+def _read_header(image_bytes: bytes, path: Path | None) -> ImageHeader:
+    # The in-memory upload header answers most files; the stored file is only
+    # memory-mapped when dimensions lie beyond it (large JPEG APPn, HEIF meta).
+    header = parse_image_header(image_bytes)
+    if header.width is not None or path is None:
+        return header
+    try:
+        stored = read_image_header(path)
+    except (OSError, ValueError):
+        return header
+    return stored if stored.format is not None else header
+
+
+def preprocess_image(
+    image_bytes: bytes,
+    size_bytes: int | None = None,
+    path: Path | None = None,
+) -> dict[str, Any]:
+    # image_bytes may be only the leading header of a stored upload; size_bytes
+    # then carries the full upload size and path points at the stored file.
     if not image_bytes:
         raise ImagePipelineError('Empty image payload')
 
-    image_type = imghdr.what(None, h=image_bytes)
-    if image_type is None:
+    header = _read_header(image_bytes, path)
+    if header.format is None:
         raise ImagePipelineError('Unsupported or invalid image header')
 
-    width, height = _parse_dimensions(image_bytes, image_type)
-
     return {
-        'format': image_type,
-        'size_bytes': len(image_bytes),
-        'width': width,
-        'height': height,
+        'format': header.format,
+        'size_bytes': len(image_bytes) if size_bytes is None else size_bytes,
+        'width': header.width,
+        'height': header.height,
+        'orientation': header.orientation,
         'header_valid': True,
     }
 
 
-def segment_image(image_bytes: bytes) -> dict[str, Any]:
-    if not image_bytes:
+def _segment_dummy(source: bytes | Path) -> dict[str, Any]:
+    if isinstance(source, Path):
+        with source.open('rb') as fh:
+            sample = fh.read(_DUMMY_SAMPLE_BYTES)
+    else:
+        sample = source[:_DUMMY_SAMPLE_BYTES]
+    if not sample:
         raise ImagePipelineError('Empty image payload')
 
     # Dummy segmentation stats based on byte distribution (MVP placeholder)
-    sample = image_bytes[: min(len(image_bytes), 4096)]
     high_bytes = sum(1 for b in sample if b >= 128)
     ratio = round(high_bytes / len(sample), 4)
 
@@ -87,5 +79,65 @@ def segment_image(image_bytes: bytes) -> dict[str, Any]:
         'foreground_ratio': ratio,
         'background_ratio': round(1 - ratio, 4),
         'confidence': 0.5,
-        'algorithm': 'mvp-dummy-threshold',
+        'algorithm': DUMMY_ALGORITHM,
     }
+
+
+def run_segmentation(
+    source: bytes | Path,
+    algorithm: str | None = None,
+    artifacts: ImageArtifacts | None = None,
+) -> SegmentationResult:
+    """Segment ``source`` with a mask-producing engine (currently Otsu).
+
+    With ``artifacts`` the working-resolution array comes from the artifact
+    cache instead of decoding ``source`` again.
+    """
+    algorithm = algorithm or settings.segmentation_algorithm
+    if algorithm != OTSU_ALGORITHM:
+        raise ImagePipelineError(f'Segmentation algorithm {algorithm!r} does not produce a mask')
+    if isinstance(source, bytes) and not source:
+        raise ImagePipelineError('Empty image payload')
+    try:
+        if artifacts is not None:
+            return segment_array(*split_working_rgb(artifacts.working_rgb()))
+        return segment_otsu(source)
+    except (OSError, ValueError) as exc:
+        raise ImagePipelineError(f'Unable to decode image for segmentation: {exc}') from exc
+
+
+def segment_image(
+    source: bytes | Path,
+    algorithm: str | None = None,
+    artifacts: ImageArtifacts | None = None,
+) -> dict[str, Any]:
+    algorithm = algorithm or settings.segmentation_algorithm
+    if algorithm == DUMMY_ALGORITHM:
+        return _segment_dummy(source)
+    if algorithm == OTSU_ALGORITHM:
+        return run_segmentation(source, algorithm, artifacts).meta
+    raise ImagePipelineError(f'Unknown segmentation algorithm: {algorithm}')
+
+
+def calibrate_image(
+    preprocess: dict[str, Any],
+    segment: dict[str, Any],
+    artifacts: ImageArtifacts,
+    spec: ReferenceSpec,
+    default_mm_per_px: float,
+    profiles: CalibrationProfiles | None = None,
+    profile: str | None = None,
+    mask: np.ndarray | None = None,
+) -> dict[str, Any]:
+    """Scale and object extents for one frame; see ``app.calibration``.
+
+    Without ``mask`` it is rebuilt from the cached working array (a few ms);
+    without an Otsu mask or image size the frame falls back to ``default_mm_per_px``.
+    """
+    width = preprocess.get('width')
+    height = preprocess.get('height')
+    if segment.get('algorithm') != OTSU_ALGORITHM or not width or not height:
+        return {'method': 'default', 'profile': profile, 'mm_per_px': default_mm_per_px, 'confidence': 0.0}
+    if mask is None:
+        mask = run_segmentation(artifacts.source, OTSU_ALGORITHM, artifacts).mask
+    return calibrate(mask, (width, height), artifacts.ocr_gray, spec, default_mm_per_px, profiles, profile)
@@ -0,0 +1,98 @@
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from fastapi import UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+@dataclass
+class IngestedUpload:
+    path: str
+    size: int
+    sha256: str
+    header: bytes
+
+
+class _ChunkWriter:
+    def __init__(self, fh: BinaryIO, max_bytes: int, header_bytes: int) -> None:
+        self._fh = fh
+        self._max_bytes = max_bytes
+        self._header_bytes = header_bytes
+        self._digest = hashlib.sha256()
+        self._header = bytearray()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self._max_bytes:
+            raise UploadTooLargeError(f'Upload exceeds maximum size of {self._max_bytes} bytes')
+        self._digest.update(chunk)
+        if len(self._header) < self._header_bytes:
+            self._header += chunk[: self._header_bytes - len(self._header)]
+        self._fh.write(chunk)
+
+    def result(self, destination: Path) -> IngestedUpload:
+        return IngestedUpload(
+            path=str(destination),
+            size=self.size,
+            sha256=self._digest.hexdigest(),
+            header=bytes(self._header),
+        )
+
+
+async def ingest_upload(
+    upload: UploadFile,
+    destination: Path,
+    *,
+    max_bytes: int,
+    chunk_size: int,
+    header_bytes: int,
+) -> IngestedUpload:
+    """Stream an upload to ``destination`` in fixed-size chunks.
+
+    Size and SHA-256 are computed while writing, and only the first
+    ``header_bytes`` are kept in memory for format/dimension sniffing.
+    Hashing and disk writes run in the thread pool so the event loop never
+    blocks on I/O. The partial file is removed if the upload exceeds
+    ``max_bytes``.
+    """
+    if upload.size is not None and upload.size > max_bytes:
+        raise UploadTooLargeError(f'Upload exceeds maximum size of {max_bytes} bytes')
+
+    try:
+        with destination.open('wb') as fh:
+            writer = _ChunkWriter(fh, max_bytes, header_bytes)
+            while chunk := await upload.read(chunk_size):
+                await run_in_threadpool(writer.write, chunk)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+
+    return writer.result(destination)
+
+
+def ingest_fileobj(
+    source: BinaryIO,
+    destination: Path,
+    *,
+    max_bytes: int,
+    chunk_size: int,
+    header_bytes: int,
+) -> IngestedUpload:
+    """Synchronous counterpart of ``ingest_upload`` for archive members."""
+    try:
+        with destination.open('wb') as fh:
+            writer = _ChunkWriter(fh, max_bytes, header_bytes)
+            while chunk := source.read(chunk_size):
+                writer.write(chunk)
+    except BaseException:
+        destination.unlink(missing_ok=True)
+        raise
+
+    return writer.result(destination)
@@ -1,35 +1,239 @@
+import asyncio
+import base64
+import binascii
 import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, BinaryIO, Callable, Literal
 from uuid import uuid4
 
-from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi import FastAPI, File, Form, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 
+from .archive import ArchiveError, guess_image_content_type, is_archive, iter_archive_images
+from .artifacts import THUMBNAIL, ArtifactCache
+from .bulk_mapping import NDJSON_MEDIA_TYPE, iter_json_array, iter_ndjson, stream_bulk_mapping
+from .cache import ResultCache, result_cache_key
+from .calibration import Calibration, CalibrationProfiles, parse_reference_spec
 from .config import settings
-from .db import check_db_connection
+from .db import check_db_connection, close_pool, get_pool
+from .derivations import correct_dimensions
 from .dimension_mapper import map_dimensions
-from .image_pipeline import preprocess_image, segment_image
+from .events import JobEventHub
+from .image_pipeline import IMAGE_PIPELINE_VERSION, calibrate_image, preprocess_image, segment_image
+from .ingest import IngestedUpload, UploadTooLargeError, ingest_fileobj, ingest_upload
+from .mesh import GLB_MEDIA_TYPE, MESH, build_mesh, encode_glb, mesh_spec
+from .metrics import PROMETHEUS_CONTENT_TYPE, UPLOAD_BYTES, UPLOADS, StageTimer, registry, timed
+from .multiview import MULTIVIEW_VERSION, fuse_views, process_view
+from .ocr_backend import close_ocr_pool, init_ocr_pool
 from .ocr_engine import extract_dimension_candidates
+from .packaging import DEFAULT_CATALOGUE, PackagingCatalogue, has_positive_sides, load_catalogue
+from .pg_store import PostgresJobStore
+from .s3_storage import S3FileStorage, build_s3_client
 from .schemas import (
+    BatchCreateResponse,
+    BatchJobStatus,
+    BatchResultsResponse,
+    BatchStatusResponse,
+    CalibrationProfileResponse,
+    CasePackLayout,
+    CasePackRequest,
+    CasePackResponse,
+    CasePackResult,
     DimensionPatchRequest,
     GeometryOutput,
     JobCreateResponse,
+    JobListResponse,
     JobStatusResponse,
     OCRExtractionResponse,
     OCRItemInput,
     OCRMapDimensionsResponse,
+    PackagingFitResponse,
 )
-from .shape_engine import build_shape_proxy, compute_dimensions, compute_quality_metrics
-from .store import InMemoryJobStore, JobMeta, LocalFileStorage, utcnow
+from .shape_engine import (
+    SHAPE_ENGINE_VERSION,
+    build_shape_proxy,
+    compute_dimensions,
+    compute_quality_metrics,
+)
+from .store import (
+    TERMINAL_STATUSES,
+    InMemoryJobStore,
+    JobKey,
+    JobMeta,
+    LocalFileStorage,
+    StoredBlob,
+    job_key,
+    utcnow,
+)
+from .worker import BatchDispatcher, JobWorkerPool, QueueFullError
+
+
+job_events = JobEventHub()
+
 
-app = FastAPI(title=settings.app_name)
+def _build_job_store() -> InMemoryJobStore | PostgresJobStore:
+    if settings.job_store_backend == 'postgres':
+        store = PostgresJobStore(get_pool())
+        store.ensure_schema()
+    else:
+        store = _build_memory_job_store()
+    store.add_listener(job_events.publish)
+    return store
 
-job_store = InMemoryJobStore()
-file_storage = LocalFileStorage(settings.upload_dir)
+
+def _build_memory_job_store() -> InMemoryJobStore:
+    return InMemoryJobStore(
+        max_jobs=settings.job_store_max_jobs,
+        max_bytes=settings.job_store_max_bytes,
+        ttl_seconds=settings.job_store_ttl_seconds,
+        spill_dir=settings.job_store_spill_dir or None,
+    )
+
+
+def _build_file_storage() -> LocalFileStorage:
+    if settings.storage_backend == 's3':
+        return S3FileStorage(
+            settings.upload_dir,
+            build_s3_client(settings.s3_endpoint_url, settings.s3_region),
+            settings.s3_bucket,
+            prefix=settings.s3_prefix,
+            multipart_threshold=settings.s3_multipart_threshold_bytes,
+            part_size=settings.s3_part_size_bytes,
+        )
+    return LocalFileStorage(settings.upload_dir)
+
+
+def _build_job_workers() -> JobWorkerPool:
+    return JobWorkerPool(max_workers=settings.job_workers, max_queue=settings.job_queue_size)
+
+
+def _fail_undispatched_job(job_id: str, exc: BaseException) -> None:
+    job_store.update(job_id, status='failed', error_message=f'Job was not dispatched: {exc}')
+
+
+def _build_batch_dispatcher(workers: JobWorkerPool) -> BatchDispatcher:
+    return BatchDispatcher(workers, max_backlog=settings.batch_backlog_size, on_abandon=_fail_undispatched_job)
+
+
+# Replaced in lifespan so every application run gets a fresh DB pool and worker pool;
+# the in-memory defaults keep the app usable when it is driven without lifespan.
+job_store: InMemoryJobStore | PostgresJobStore = _build_memory_job_store()
+job_store.add_listener(job_events.publish)
+job_workers = _build_job_workers()
+batch_dispatcher = _build_batch_dispatcher(job_workers)
+file_storage = _build_file_storage()
+result_cache = ResultCache(
+    max_entries=settings.result_cache_max_entries,
+    ttl_seconds=settings.result_cache_ttl_seconds,
+)
+artifact_cache = ArtifactCache(settings.artifact_cache_dir, settings.artifact_cache_max_bytes)
+calibration_reference = parse_reference_spec(settings.calibration_reference_mm)
+calibration_profiles = CalibrationProfiles(settings.calibration_profile_max_entries)
+packaging_catalogue = PackagingCatalogue(
+    load_catalogue(settings.packaging_catalogue_path) if settings.packaging_catalogue_path else DEFAULT_CATALOGUE
+)
+
+PIPELINE_VERSION = f'image-{IMAGE_PIPELINE_VERSION}.shape-{SHAPE_ENGINE_VERSION}'
+
+# Scrape-time gauges and totals read the current globals, so they follow the objects lifespan rebuilds.
+registry.gauge('packaging_job_queue_depth', 'Jobs waiting for a free worker.', lambda: job_workers.queue_depth)
+registry.gauge('packaging_jobs_in_flight', 'Jobs running or queued in the worker pool.', lambda: job_workers.in_flight)
+registry.gauge('packaging_batch_backlog', 'Batch jobs not yet handed to the worker pool.', lambda: batch_dispatcher.backlog)
+registry.gauge(
+    'packaging_job_store_bytes',
+    'Estimated bytes held by in-memory job records.',
+    lambda: job_store.memory_stats().get('bytes', 0),
+)
+registry.callback_counter(
+    'packaging_job_store_evictions_total',
+    'Completed jobs evicted from memory by the store bounds.',
+    lambda: job_store.memory_stats().get('evictions', 0),
+)
+registry.gauge('packaging_job_event_subscriptions', 'Open job status event streams.', job_events.subscription_count)
+registry.gauge(
+    'packaging_jobs',
+    'Jobs by status.',
+    lambda: {(status,): count for status, count in job_store.count_by_status().items()},
+    ('status',),
+)
+registry.callback_counter(
+    'packaging_result_cache_lookups_total',
+    'Result cache lookups since start or last clear.',
+    lambda: {('hit',): result_cache.hits, ('miss',): result_cache.misses},
+    ('result',),
+)
+registry.gauge('packaging_result_cache_hit_ratio', 'Result cache hit ratio.', lambda: result_cache.stats()['hit_rate'])
+registry.gauge(
+    'packaging_artifact_cache_bytes',
+    'Bytes of derived image artifacts on disk.',
+    lambda: artifact_cache.stats()['bytes'],
+)
+registry.callback_counter(
+    'packaging_artifact_cache_lookups_total',
+    'Artifact cache lookups since start or last clear.',
+    lambda: {('hit',): artifact_cache.hits, ('miss',): artifact_cache.misses},
+    ('result',),
+)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    global job_store, job_workers, batch_dispatcher, file_storage
+    if settings.job_store_backend == 'postgres':
+        job_store = _build_job_store()
+    if settings.storage_backend == 's3':
+        file_storage = _build_file_storage()
+    job_workers = _build_job_workers()
+    batch_dispatcher = _build_batch_dispatcher(job_workers)
+    init_ocr_pool(settings.ocr_workers)
+    yield
+    batch_dispatcher.shutdown()
+    job_workers.shutdown(wait=True)
+    job_store.close()
+    file_storage.close()
+    close_ocr_pool()
+    close_pool()
+
+
+app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
 
 def _clamp_dimension(value: float) -> float:
     return round(max(0.0, min(10000.0, value)), 3)
 
 
+def _record_upload(route: str, upload: IngestedUpload) -> IngestedUpload:
+    UPLOADS.inc(1, route)
+    UPLOAD_BYTES.inc(upload.size, route)
+    return upload
+
+
+async def _ingest_or_413(file: UploadFile, destination: Path, route: str) -> IngestedUpload:
+    try:
+        upload = await ingest_upload(
+            file,
+            destination,
+            max_bytes=settings.max_upload_bytes,
+            chunk_size=settings.upload_chunk_bytes,
+            header_bytes=settings.upload_header_bytes,
+        )
+    except UploadTooLargeError as exc:
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    return _record_upload(route, upload)
+
+
+def _commit_upload(upload: IngestedUpload) -> tuple[IngestedUpload, StoredBlob]:
+    """Move an ingested temp file into content-addressed storage (blocking)."""
+    blob = file_storage.commit(Path(upload.path), upload.sha256)
+    return replace(upload, path=blob.path), blob
+
+
 @app.get('/health')
 def health() -> dict:
     return {'status': 'ok', 'service': settings.app_name}
@@ -41,62 +245,340 @@ def health_db() -> dict:
     return {'status': 'ok' if ok else 'error', 'database': ok}
 
 
+@app.get('/metrics', response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@app.get('/api/v1/cache/stats')
+def cache_stats() -> dict:
+    return result_cache.stats()
+
+
+def _calibration_profile_or_404(profile: str) -> Calibration:
+    calibration = calibration_profiles.peek(profile)
+    if calibration is None:
+        raise HTTPException(status_code=404, detail='Calibration profile not found')
+    return calibration
+
+
+@app.get('/api/v1/calibration/profiles/{profile}', response_model=CalibrationProfileResponse)
+def get_calibration_profile(profile: str) -> CalibrationProfileResponse:
+    calibration = _calibration_profile_or_404(profile)
+    return CalibrationProfileResponse(
+        profile=profile,
+        mm_per_px=calibration.mm_per_px,
+        confidence=calibration.confidence,
+        reference_bbox=calibration.reference_bbox,
+        image_size=list(calibration.image_size) if calibration.image_size else None,
+    )
+
+
+@app.delete('/api/v1/calibration/profiles/{profile}', status_code=204)
+def delete_calibration_profile(profile: str) -> Response:
+    # The next frame of the profile detects the reference again, e.g. after the rig moved.
+    if not calibration_profiles.delete(profile):
+        raise HTTPException(status_code=404, detail='Calibration profile not found')
+    return Response(status_code=204)
+
+
 @app.post('/api/v1/ocr/extract', response_model=OCRExtractionResponse)
-async def extract_ocr_dimensions(file: UploadFile = File(...)) -> OCRExtractionResponse:
+async def extract_ocr_dimensions(
+    file: UploadFile = File(...),
+    mode: Literal['full', 'roi'] | None = Query(default=None),
+) -> OCRExtractionResponse:
     # Stage1 lightweight / no DB persistence
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail='Only image uploads are allowed')
 
-    content = await file.read()
-    return OCRExtractionResponse(**extract_dimension_candidates(content))
+    upload = await _ingest_or_413(file, file_storage.temp_path(), 'ocr')
+    try:
+        result = await run_in_threadpool(
+            extract_dimension_candidates,
+            Path(upload.path),
+            mode=mode,
+            artifacts=artifact_cache.bind(upload.sha256, Path(upload.path)),
+        )
+    finally:
+        file_storage.delete(upload.path)
+    return OCRExtractionResponse(**result)
+
+
+def _profile_fingerprint(calibration_profile: str) -> str:
+    # Keys carry the profile's current calibration, so results measured under a deleted or
+    # re-detected profile stop matching. Results are stored under the key computed after calibration.
+    calibration = calibration_profiles.peek(calibration_profile)
+    if calibration is None:
+        return f'profile={calibration_profile}@unset'
+    return f'profile={calibration_profile}@{calibration.mm_per_px}:{calibration.reference_bbox}'
+
+
+def _pipeline_cache_key(content_sha256: str, calibration_profile: str | None = None) -> str:
+    version = f'{PIPELINE_VERSION}.{settings.segmentation_algorithm}'
+    if calibration_profile:
+        version = f'{version}.{_profile_fingerprint(calibration_profile)}'
+    return result_cache_key(content_sha256, version)
+
+
+def _write_mesh(spec: dict) -> Callable[[BinaryIO], None]:
+    return lambda fh: fh.write(encode_glb(build_mesh(spec)))
+
+
+def _generate_mesh(spec: dict) -> dict:
+    # Cached under a hash of its inputs, so unchanged dimensions never rebuild the GLB.
+    artifact_cache.get_or_create(spec['key'], MESH, _write_mesh(spec))
+    return spec
+
+
+def _run_job_pipeline(
+    job_id: str,
+    file_path: str,
+    header: bytes,
+    size_bytes: int,
+    content_sha256: str,
+    stage_timings_ms: dict[str, float] | None = None,
+    calibration_profile: str | None = None,
+) -> None:
+    job_store.update(job_id, status='processing')
+    timer = StageTimer()
+    timer.timings_ms.update(stage_timings_ms or {})
+
+    try:
+        with timer.stage('preprocess'):
+            preprocess_meta = preprocess_image(header, size_bytes=size_bytes, path=Path(file_path))
+        artifacts = artifact_cache.bind(content_sha256, Path(file_path))
+        with timer.stage('segment'):
+            segment_meta = segment_image(Path(file_path), artifacts=artifacts)
+        with timer.stage('calibrate'):
+            calibration = calibrate_image(
+                preprocess_meta,
+                segment_meta,
+                artifacts,
+                calibration_reference,
+                settings.calibration_default_mm_per_px,
+                calibration_profiles,
+                calibration_profile,
+            )
+
+        with timer.stage('dimensions'):
+            dimensions_mm = compute_dimensions(preprocess_meta, segment_meta, calibration)
+            volume_mm3 = round(
+                dimensions_mm['width'] * dimensions_mm['height'] * dimensions_mm['depth'],
+                3,
+            )
+        with timer.stage('shape_proxy'):
+            shape_proxy = build_shape_proxy(segment_meta, dimensions_mm)
+        with timer.stage('mesh'):
+            mesh = _generate_mesh(
+                mesh_spec(shape_proxy.get('shape_family'), dimensions_mm, calibration.get('object_profile_px'))
+            )
+        with timer.stage('packaging'):
+            packaging = packaging_catalogue.fit(dimensions_mm, shape_proxy.get('shape_family'))
+        with timer.stage('quality'):
+            engine_quality = compute_quality_metrics(preprocess_meta, segment_meta, calibration)
+
+        quality_metrics = {
+            'preprocess': preprocess_meta,
+            'segmentation': segment_meta,
+            'calibration': calibration,
+            'shape_engine': engine_quality,
+            'mesh': mesh,
+            'packaging': packaging,
+        }
+
+        outputs = {
+            'quality_metrics': quality_metrics,
+            'dimensions_mm': dimensions_mm,
+            'volume_mm3': volume_mm3,
+            'shape_proxy': shape_proxy,
+        }
+        job_store.update(
+            job_id, status='processed', error_message=None, stage_timings_ms=timer.timings_ms, **outputs
+        )
+        result_cache.put(_pipeline_cache_key(content_sha256, calibration_profile), outputs)
+    except Exception as exc:
+        job_store.update(
+            job_id,
+            status='failed',
+            error_message=str(exc),
+            quality_metrics=None,
+            dimensions_mm=None,
+            volume_mm3=None,
+            shape_proxy=None,
+            stage_timings_ms=timer.timings_ms,
+        )
+
+
+def _apply_cached_result(job_id: str, content_sha256: str, calibration_profile: str | None = None) -> bool:
+    cached = result_cache.get(_pipeline_cache_key(content_sha256, calibration_profile))
+    if cached is None:
+        return False
+    job_store.update(job_id, status='processed', error_message=None, **cached)
+    return True
+
+
+# Studio/camera profile names; frames from one fixed rig share a calibration.
+CALIBRATION_PROFILE_PATTERN = r'^[A-Za-z0-9._-]+$'
+
+
+def _queue_full_error() -> HTTPException:
+    return HTTPException(status_code=429, detail='Job queue is full', headers={'Retry-After': '1'})
 
 
 @app.post('/api/v1/jobs', response_model=JobCreateResponse, status_code=201)
-async def create_job(file: UploadFile = File(...)) -> JobCreateResponse:
+async def create_job(
+    file: UploadFile = File(...),
+    calibration_profile: str | None = Form(default=None, max_length=128, pattern=CALIBRATION_PROFILE_PATTERN),
+) -> JobCreateResponse:
     if not file.content_type or not file.content_type.startswith('image/'):
         raise HTTPException(status_code=400, detail='Only image uploads are allowed')
 
-    content = await file.read()
+    # Backpressure only applies to cache misses: a duplicate upload is answered from the
+    # result cache even while the pool is saturated, and submit() rejects real misses.
     job_id = str(uuid4())
-    file_path = file_storage.save(job_id=job_id, filename=file.filename or 'upload.bin', content=content)
+    filename = file.filename or 'upload.bin'
+    timer = StageTimer()
+    with timer.stage('save'):
+        upload = await _ingest_or_413(file, file_storage.temp_path(), 'jobs')
+        upload, blob = await run_in_threadpool(_commit_upload, upload)
 
     meta = JobMeta(
         job_id=job_id,
-        status='processing',
-        filename=file.filename or 'upload.bin',
+        status='queued',
+        filename=filename,
         content_type=file.content_type,
-        size=len(content),
-        file_path=file_path,
+        size=upload.size,
+        file_path=upload.path,
         created_at=utcnow(),
+        content_sha256=upload.sha256,
+        stage_timings_ms=dict(timer.timings_ms),
     )
     job_store.create(meta)
 
-    try:
-        preprocess_meta = preprocess_image(content)
-        segment_meta = segment_image(content)
+    if _apply_cached_result(job_id, upload.sha256, calibration_profile):
+        file_storage.settle(blob)
+        return JobCreateResponse(job_id=job_id, status='processed')
 
-        shape_proxy = build_shape_proxy(preprocess_meta, segment_meta)
-        dimensions_mm = compute_dimensions(preprocess_meta, segment_meta)
-        volume_mm3 = round(
-            dimensions_mm['width'] * dimensions_mm['height'] * dimensions_mm['depth'],
-            3,
+    try:
+        future = job_workers.submit(
+            _run_job_pipeline,
+            job_id,
+            upload.path,
+            upload.header,
+            upload.size,
+            upload.sha256,
+            timer.timings_ms,
+            calibration_profile,
         )
-        engine_quality = compute_quality_metrics(preprocess_meta, segment_meta)
+    except QueueFullError:
+        job_store.delete(job_id)
+        file_storage.discard(blob)
+        raise _queue_full_error()
+    file_storage.settle(blob)
+
+    if settings.job_execution_mode != 'queued':
+        await asyncio.wrap_future(future)
 
+    latest = job_store.get(job_id) or meta
+    return JobCreateResponse(job_id=job_id, status=latest.status)
+
+
+def _view_profile(view: str, view_input: dict) -> str | None:
+    # Each camera of a rig has its own scale, so views calibrate under separate profile keys.
+    profile = view_input.get('calibration_profile')
+    return f'{profile}.{view}' if profile else None
+
+
+def _view_cache_key(content_sha256: str, view_profile: str | None) -> str:
+    version = f'{PIPELINE_VERSION}.{settings.segmentation_algorithm}.view-{MULTIVIEW_VERSION}'
+    if view_profile:
+        version = f'{version}.{_profile_fingerprint(view_profile)}'
+    return result_cache_key(content_sha256, version)
+
+
+def _process_view(view: str, view_input: dict) -> dict:
+    profile = _view_profile(view, view_input)
+    cached = result_cache.get(_view_cache_key(view_input['sha256'], profile))
+    if cached is not None:
+        return cached
+    source = file_storage.local_path(view_input['sha256'])
+    record = process_view(
+        source,
+        view_input['size'],
+        artifact_cache.bind(view_input['sha256'], source),
+        calibration_reference,
+        settings.calibration_default_mm_per_px,
+        calibration_profiles,
+        profile,
+    )
+    record['version'] = cache_key = _view_cache_key(view_input['sha256'], profile)
+    result_cache.put(cache_key, record)
+    return record
+
+
+def _run_multiview_pipeline(job_id: str, stage_timings_ms: dict[str, float] | None = None) -> None:
+    meta = job_store.update(job_id, status='processing')
+    if meta is None:
+        return
+    timer = StageTimer()
+    timer.timings_ms.update(stage_timings_ms or {})
+    inputs = meta.views or {}
+    previous = (meta.quality_metrics or {}).get('views') or {}
+
+    try:
+        with timer.stage('views'):
+            records: dict[str, dict] = {}
+            reused = []
+            pending = {}
+            for view, view_input in inputs.items():
+                record = previous.get(view)
+                key = _view_cache_key(view_input['sha256'], _view_profile(view, view_input))
+                if record is not None and record.get('version') == key:
+                    records[view] = record
+                    reused.append(view)
+                else:
+                    pending[view] = view_input
+            if pending:
+                with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='job-view') as executor:
+                    futures = {view: executor.submit(_process_view, view, item) for view, item in pending.items()}
+                    records.update({view: future.result() for view, future in futures.items()})
+        with timer.stage('fusion'):
+            fused = fuse_views(records)
+            fused['fusion']['reused_views'] = sorted(reused)
+
+        front = records['front']
+        with timer.stage('shape_proxy'):
+            shape_proxy = build_shape_proxy(front['segmentation'], fused['dimensions_mm'])
+        with timer.stage('mesh'):
+            spec = mesh_spec(
+                shape_proxy.get('shape_family'),
+                fused['dimensions_mm'],
+                front['profile_mm'],
+                records['side']['profile_mm'],
+            )
+            mesh = _generate_mesh(spec)
+        with timer.stage('packaging'):
+            packaging = packaging_catalogue.fit(fused['dimensions_mm'], shape_proxy.get('shape_family'))
+        with timer.stage('quality'):
+            engine_quality = compute_quality_metrics(
+                front['preprocess'], front['segmentation'], front['calibration']
+            )
         quality_metrics = {
-            'preprocess': preprocess_meta,
-            'segmentation': segment_meta,
+            'views': records,
+            'fusion': fused['fusion'],
             'shape_engine': engine_quality,
+            'mesh': mesh,
+            'packaging': packaging,
         }
-
         job_store.update(
             job_id,
             status='processed',
+            error_message=None,
+            stage_timings_ms=timer.timings_ms,
             quality_metrics=quality_metrics,
-            dimensions_mm=dimensions_mm,
-            volume_mm3=volume_mm3,
+            dimensions_mm=fused['dimensions_mm'],
+            volume_mm3=fused['volume_mm3'],
             shape_proxy=shape_proxy,
-            error_message=None,
         )
     except Exception as exc:
         job_store.update(
@@ -107,10 +589,314 @@ async def create_job(file: UploadFile = File(...)) -> JobCreateResponse:
             dimensions_mm=None,
             volume_mm3=None,
             shape_proxy=None,
+            stage_timings_ms=timer.timings_ms,
         )
 
-    latest = job_store.get(job_id) or meta
-    return JobCreateResponse(job_id=job_id, status=latest.status)
+
+async def _ingest_view(file: UploadFile, calibration_profile: str | None) -> tuple[dict, StoredBlob]:
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail='Only image uploads are allowed')
+    upload = await _ingest_or_413(file, file_storage.temp_path(), 'jobs')
+    upload, blob = await run_in_threadpool(_commit_upload, upload)
+    view_input = {
+        'sha256': upload.sha256,
+        'filename': file.filename or 'upload.bin',
+        'content_type': file.content_type,
+        'size': upload.size,
+        'path': upload.path,
+        'calibration_profile': calibration_profile,
+    }
+    return view_input, blob
+
+
+async def _submit_multiview(job_id: str, blobs: list[StoredBlob], timer: StageTimer) -> str:
+    try:
+        future = job_workers.submit(_run_multiview_pipeline, job_id, timer.timings_ms)
+    except QueueFullError:
+        for blob in reversed(blobs):
+            file_storage.discard(blob)
+        raise
+    for blob in blobs:
+        file_storage.settle(blob)
+    if settings.job_execution_mode != 'queued':
+        await asyncio.wrap_future(future)
+    latest = job_store.get(job_id)
+    return latest.status if latest else 'queued'
+
+
+@app.post('/api/v1/jobs/multiview', response_model=JobCreateResponse, status_code=201)
+async def create_multiview_job(
+    front: UploadFile = File(...),
+    side: UploadFile = File(...),
+    top: UploadFile | None = File(default=None),
+    calibration_profile: str | None = Form(default=None, max_length=128, pattern=CALIBRATION_PROFILE_PATTERN),
+) -> JobCreateResponse:
+    job_id = str(uuid4())
+    timer = StageTimer()
+    views: dict[str, dict] = {}
+    blobs: list[StoredBlob] = []
+    try:
+        with timer.stage('save'):
+            for view, file in (('front', front), ('side', side), ('top', top)):
+                if file is not None:
+                    views[view], blob = await _ingest_view(file, calibration_profile)
+                    blobs.append(blob)
+    except BaseException:
+        for blob in reversed(blobs):
+            file_storage.discard(blob)
+        raise
+
+    job_store.create(
+        JobMeta(
+            job_id=job_id,
+            status='queued',
+            filename=views['front']['filename'],
+            content_type=views['front']['content_type'],
+            size=sum(item['size'] for item in views.values()),
+            file_path=views['front']['path'],
+            created_at=utcnow(),
+            content_sha256=views['front']['sha256'],
+            stage_timings_ms=dict(timer.timings_ms),
+            views=views,
+        )
+    )
+    try:
+        status = await _submit_multiview(job_id, blobs, timer)
+    except QueueFullError:
+        job_store.delete(job_id)
+        raise _queue_full_error()
+    return JobCreateResponse(job_id=job_id, status=status)
+
+
+@app.put('/api/v1/jobs/{job_id}/views/{view}', response_model=JobCreateResponse)
+async def replace_job_view(
+    job_id: str,
+    view: Literal['front', 'side', 'top'],
+    file: UploadFile = File(...),
+    calibration_profile: str | None = Form(default=None, max_length=128, pattern=CALIBRATION_PROFILE_PATTERN),
+) -> JobCreateResponse:
+    """Re-upload one view; the other views' per-view results are reused."""
+    meta = job_store.get(job_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail='Job not found')
+    if not meta.views:
+        raise HTTPException(status_code=409, detail='Not a multi-view job')
+    if meta.status not in TERMINAL_STATUSES:
+        raise HTTPException(status_code=409, detail='Job is still processing')
+
+    timer = StageTimer()
+    with timer.stage('save'):
+        profile = calibration_profile or (meta.views.get(view) or meta.views['front']).get('calibration_profile')
+        view_input, blob = await _ingest_view(file, profile)
+    views = {**meta.views, view: view_input}
+    updates = {'views': views, 'status': 'queued', 'stage_timings_ms': dict(timer.timings_ms)}
+    if view == 'front':
+        updates.update(
+            filename=view_input['filename'],
+            content_type=view_input['content_type'],
+            file_path=view_input['path'],
+            content_sha256=view_input['sha256'],
+        )
+    updates['size'] = sum(item['size'] for item in views.values())
+    job_store.update(job_id, **updates)
+    try:
+        status = await _submit_multiview(job_id, [blob], timer)
+    except QueueFullError:
+        job_store.update(job_id, **{field: getattr(meta, field) for field in updates})
+        raise _queue_full_error()
+    return JobCreateResponse(job_id=job_id, status=status)
+
+
+def _geometry_output(meta: JobMeta) -> GeometryOutput:
+    has_mesh = bool((meta.quality_metrics or {}).get('mesh'))
+    return GeometryOutput(
+        job_id=meta.job_id,
+        status=meta.status,
+        dimensions_mm=meta.dimensions_mm,
+        volume_mm3=meta.volume_mm3,
+        shape_proxy=meta.shape_proxy,
+        quality_metrics=meta.quality_metrics,
+        error_message=meta.error_message,
+        source_type='image',
+        mesh_url=f'/api/v1/jobs/{meta.job_id}/mesh.glb' if has_mesh else None,
+    )
+
+
+# (job_id, filename, content_type, upload, blob); ``upload.path`` is the committed blob path.
+BatchEntry = tuple[str, str, str, IngestedUpload, StoredBlob]
+
+
+def _batch_member_limit(remaining_bytes: int) -> int:
+    return max(0, min(settings.max_upload_bytes, remaining_bytes))
+
+
+def _batch_size_error(max_bytes: int) -> UploadTooLargeError:
+    if max_bytes < settings.max_upload_bytes:
+        return UploadTooLargeError(f'Batch exceeds maximum size of {settings.max_batch_bytes} bytes')
+    return UploadTooLargeError(f'Upload exceeds maximum size of {max_bytes} bytes')
+
+
+def _ingest_archive(fileobj: BinaryIO, limit: int, remaining_bytes: int) -> list[BatchEntry]:
+    entries: list[BatchEntry] = []
+    try:
+        for name, member in iter_archive_images(fileobj):
+            if len(entries) >= limit:
+                raise ArchiveError(f'Batch exceeds maximum of {settings.max_batch_items} images')
+            job_id = str(uuid4())
+            max_bytes = _batch_member_limit(remaining_bytes)
+            try:
+                upload = ingest_fileobj(
+                    member,
+                    file_storage.temp_path(),
+                    max_bytes=max_bytes,
+                    chunk_size=settings.upload_chunk_bytes,
+                    header_bytes=settings.upload_header_bytes,
+                )
+            except UploadTooLargeError as exc:
+                raise _batch_size_error(max_bytes) from exc
+            remaining_bytes -= upload.size
+            _record_upload('batch', upload)
+            upload, blob = _commit_upload(upload)
+            content_type = guess_image_content_type(name) or 'application/octet-stream'
+            entries.append((job_id, name, content_type, upload, blob))
+    except BaseException:
+        _discard_uploads(entries)
+        raise
+    return entries
+
+
+async def _ingest_batch_file(file: UploadFile, remaining_bytes: int) -> BatchEntry:
+    job_id = str(uuid4())
+    filename = file.filename or 'upload.bin'
+    max_bytes = _batch_member_limit(remaining_bytes)
+    try:
+        upload = await ingest_upload(
+            file,
+            file_storage.temp_path(),
+            max_bytes=max_bytes,
+            chunk_size=settings.upload_chunk_bytes,
+            header_bytes=settings.upload_header_bytes,
+        )
+    except UploadTooLargeError as exc:
+        raise _batch_size_error(max_bytes) from exc
+    _record_upload('batch', upload)
+    upload, blob = await run_in_threadpool(_commit_upload, upload)
+    return job_id, filename, file.content_type or 'application/octet-stream', upload, blob
+
+
+def _discard_uploads(entries: list[BatchEntry]) -> None:
+    # Newest first, so a duplicate inside the batch is released before the blob it matched.
+    for *_, blob in reversed(entries):
+        file_storage.discard(blob)
+
+
+@app.post('/api/v1/jobs/batch', response_model=BatchCreateResponse, status_code=201)
+async def create_batch(
+    files: list[UploadFile] = File(...),
+    calibration_profile: str | None = Form(default=None, max_length=128, pattern=CALIBRATION_PROFILE_PATTERN),
+) -> BatchCreateResponse:
+    for file in files:
+        is_image = bool(file.content_type and file.content_type.startswith('image/'))
+        if not is_image and not is_archive(file.filename, file.content_type):
+            raise HTTPException(status_code=400, detail='Only image uploads or zip/tar archives are allowed')
+
+    entries: list[BatchEntry] = []
+    try:
+        for file in files:
+            remaining = settings.max_batch_items - len(entries)
+            remaining_bytes = settings.max_batch_bytes - sum(entry[3].size for entry in entries)
+            if is_archive(file.filename, file.content_type):
+                entries += await run_in_threadpool(_ingest_archive, file.file, remaining, remaining_bytes)
+                continue
+            if remaining <= 0:
+                raise ArchiveError(f'Batch exceeds maximum of {settings.max_batch_items} images')
+            entries.append(await _ingest_batch_file(file, remaining_bytes))
+    except UploadTooLargeError as exc:
+        _discard_uploads(entries)
+        raise HTTPException(status_code=413, detail=str(exc)) from exc
+    except ArchiveError as exc:
+        _discard_uploads(entries)
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except BaseException:
+        _discard_uploads(entries)
+        raise
+
+    if not entries:
+        raise HTTPException(status_code=400, detail='No images found in batch')
+
+    batch_id = str(uuid4())
+    created_at = utcnow()
+    pending: list[tuple[str, Callable[..., None], tuple]] = []
+    for seq, (job_id, filename, content_type, upload, _) in enumerate(entries):
+        job_store.create(
+            JobMeta(
+                job_id=job_id,
+                status='queued',
+                filename=filename,
+                content_type=content_type,
+                size=upload.size,
+                file_path=upload.path,
+                created_at=created_at,
+                content_sha256=upload.sha256,
+                batch_id=batch_id,
+                batch_seq=seq,
+            )
+        )
+        if not _apply_cached_result(job_id, upload.sha256, calibration_profile):
+            args = (job_id, upload.path, upload.header, upload.size, upload.sha256, None, calibration_profile)
+            pending.append((job_id, _run_job_pipeline, args))
+
+    try:
+        futures = batch_dispatcher.admit(pending) if pending else []
+    except QueueFullError as exc:
+        for job_id, *_ in entries:
+            job_store.delete(job_id)
+        _discard_uploads(entries)
+        raise HTTPException(status_code=429, detail=str(exc), headers={'Retry-After': '5'}) from exc
+    for *_, blob in entries:
+        file_storage.settle(blob)
+
+    if settings.job_execution_mode != 'queued':
+        await asyncio.gather(*(asyncio.wrap_future(future) for future in futures), return_exceptions=True)
+
+    return BatchCreateResponse(batch_id=batch_id, job_ids=[entry[0] for entry in entries], total=len(entries))
+
+
+def _batch_jobs_or_404(batch_id: str) -> list[JobMeta]:
+    jobs = job_store.list_by_batch(batch_id)
+    if not jobs:
+        raise HTTPException(status_code=404, detail='Batch not found')
+    return jobs
+
+
+@app.get('/api/v1/jobs/batch/{batch_id}', response_model=BatchStatusResponse)
+def get_batch(batch_id: str) -> BatchStatusResponse:
+    jobs = _batch_jobs_or_404(batch_id)
+    status_counts = Counter(job.status for job in jobs)
+    completed = status_counts['processed'] + status_counts['failed']
+
+    return BatchStatusResponse(
+        batch_id=batch_id,
+        total=len(jobs),
+        completed=completed,
+        progress=round(completed / len(jobs), 4),
+        status_counts=dict(status_counts),
+        jobs=[
+            BatchJobStatus(
+                job_id=job.job_id,
+                filename=job.filename,
+                status=job.status,
+                error_message=job.error_message,
+            )
+            for job in jobs
+        ],
+    )
+
+
+@app.get('/api/v1/jobs/batch/{batch_id}/results', response_model=BatchResultsResponse)
+def get_batch_results(batch_id: str) -> BatchResultsResponse:
+    jobs = _batch_jobs_or_404(batch_id)
+    return BatchResultsResponse(batch_id=batch_id, results=[_geometry_output(job) for job in jobs])
 
 
 @app.post('/api/v1/ocr/map-dimensions', response_model=OCRMapDimensionsResponse)
@@ -119,6 +905,7 @@ async def map_ocr_dimensions(
     ocr_items: str | None = Form(default=None),
 ) -> OCRMapDimensionsResponse:
     parsed_items: list[dict] = []
+    engine: dict[str, Any] = {}
 
     if ocr_items:
         try:
@@ -134,11 +921,167 @@ async def map_ocr_dimensions(
             raise HTTPException(status_code=400, detail='Provide at least one of file or ocr_items')
         if not file.content_type or not file.content_type.startswith('image/'):
             raise HTTPException(status_code=400, detail='Only image uploads are allowed')
-        content = await file.read()
-        parsed_items = extract_dimension_candidates(content).get('items', [])
+        upload = await _ingest_or_413(file, file_storage.temp_path(), 'ocr')
+        try:
+            extracted = await run_in_threadpool(
+                extract_dimension_candidates,
+                Path(upload.path),
+                artifacts=artifact_cache.bind(upload.sha256, Path(upload.path)),
+            )
+        finally:
+            file_storage.delete(upload.path)
+        parsed_items = extracted.get('items', [])
+        engine = {key: extracted.get(key) for key in ('engine_available', 'fallback_reason')}
+
+    with timed('map_dimensions'):
+        result = map_dimensions(parsed_items)
+    return OCRMapDimensionsResponse(**result, **engine)
+
+
+@app.post('/api/v1/ocr/map-dimensions/bulk')
+async def map_ocr_dimensions_bulk(request: Request) -> StreamingResponse:
+    # Body: a JSON array of products, or NDJSON with one product per line. A product is
+    # either a list of OCR items or {"id": ..., "ocr_items": [...]}.
+    # The body is read up front: StreamingResponse shares the receive channel while it streams.
+    body = await request.body()
+    content_type = request.headers.get('content-type', '')
+    if 'ndjson' in content_type or 'jsonl' in content_type:
+        entries = iter_ndjson(body)
+    else:
+        try:
+            payload = json.loads(body)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=f'Invalid bulk payload: {exc}') from exc
+        if not isinstance(payload, list):
+            raise HTTPException(status_code=400, detail='Bulk payload must be a JSON array of products')
+        entries = iter_json_array(payload)
+
+    return StreamingResponse(stream_bulk_mapping(entries), media_type=NDJSON_MEDIA_TYPE)
+
 
-    result = map_dimensions(parsed_items)
-    return OCRMapDimensionsResponse(**result)
+JOB_LIST_FIELDS = tuple(JobStatusResponse.model_fields)
+MAX_JOB_PAGE_SIZE = 500
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _encode_cursor(key: JobKey) -> str:
+    created_at, job_id = key
+    raw = json.dumps([created_at.isoformat(), job_id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def _decode_cursor(cursor: str) -> JobKey:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, job_id = json.loads(raw)
+        return (_as_utc(datetime.fromisoformat(created_at)), str(job_id))
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail='Invalid cursor') from exc
+
+
+def _parse_fields(fields: str | None) -> tuple[str, ...]:
+    if fields is None:
+        return JOB_LIST_FIELDS
+    requested = {name.strip() for name in fields.split(',') if name.strip()}
+    unknown = requested.difference(JOB_LIST_FIELDS)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in JOB_LIST_FIELDS if name in requested or name == 'job_id')
+
+
+@app.get('/api/v1/jobs', response_model=JobListResponse)
+def list_jobs(
+    status: list[str] | None = Query(None),
+    content_type: list[str] | None = Query(None),
+    shape_family: list[str] | None = Query(None),
+    created_from: datetime | None = None,
+    created_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=MAX_JOB_PAGE_SIZE),
+    fields: str | None = None,
+) -> JobListResponse:
+    """Jobs newest first. Repeat a filter to match any of its values; ``fields`` is a comma-separated projection."""
+    selected = _parse_fields(fields)
+    # One extra row tells whether another page exists without a count query.
+    jobs = job_store.list_jobs(
+        status=status,
+        content_type=content_type,
+        shape_family=shape_family,
+        created_from=_as_utc(created_from),
+        created_to=_as_utc(created_to),
+        before=_decode_cursor(cursor) if cursor else None,
+        limit=limit + 1,
+        fields=selected,
+    )
+    page = jobs[:limit]
+    return JobListResponse(
+        items=[{name: getattr(job, name) for name in selected} for job in page],
+        next_cursor=_encode_cursor(job_key(page[-1])) if len(jobs) > limit else None,
+    )
+
+
+MAX_EVENT_STREAM_JOBS = 500
+SSE_MEDIA_TYPE = 'text/event-stream'
+# Comment lines keep idle streams alive through proxies that drop silent connections.
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def _sse(event: str, data: dict) -> str:
+    return f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+
+async def _job_event_stream(job_ids: list[str], timeout: float) -> AsyncIterator[str]:
+    # Subscribe before reading the snapshot so no transition falls between the two.
+    with job_events.subscribe(job_ids) as subscription:
+        jobs = await run_in_threadpool(lambda: {job_id: job_store.get(job_id) for job_id in job_ids})
+        last_status: dict[str, str] = {}
+        for job_id, meta in jobs.items():
+            if meta is None:
+                yield _sse('missing', {'job_id': job_id})
+                continue
+            last_status[job_id] = meta.status
+            yield _sse('status', {'job_id': job_id, 'status': meta.status})
+        watching = {job_id for job_id, status in last_status.items() if status not in TERMINAL_STATUSES}
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while watching:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            event = await subscription.get(min(remaining, SSE_KEEPALIVE_SECONDS))
+            if event is None:
+                yield ': keep-alive\n\n'
+                continue
+            if event.job_id not in watching or last_status.get(event.job_id) == event.status:
+                continue
+            last_status[event.job_id] = event.status
+            yield _sse('status', {'job_id': event.job_id, 'status': event.status})
+            if event.status in TERMINAL_STATUSES:
+                watching.discard(event.job_id)
+        # Tells EventSource clients to close instead of reconnecting.
+        yield _sse('end', {'pending': sorted(watching)})
+
+
+@app.get('/api/v1/jobs/events')
+async def stream_job_events(
+    job_id: list[str] = Query(...),
+    timeout: float = Query(300.0, gt=0, le=3600),
+) -> StreamingResponse:
+    """Server-sent events: the current status of each job, then every transition until all are terminal."""
+    job_ids = list(dict.fromkeys(job_id))
+    if len(job_ids) > MAX_EVENT_STREAM_JOBS:
+        raise HTTPException(status_code=400, detail=f'At most {MAX_EVENT_STREAM_JOBS} job ids per stream')
+    return StreamingResponse(
+        _job_event_stream(job_ids, timeout),
+        media_type=SSE_MEDIA_TYPE,
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
 
 
 @app.get('/api/v1/jobs/{job_id}', response_model=JobStatusResponse)
@@ -160,25 +1103,146 @@ def get_job(job_id: str) -> JobStatusResponse:
         shape_proxy=meta.shape_proxy,
         error_message=meta.error_message,
         user_corrections=meta.user_corrections,
+        stage_timings_ms=meta.stage_timings_ms,
+        views=meta.views,
     )
 
 
+@app.get('/api/v1/jobs/{job_id}/thumbnail')
+def get_job_thumbnail(job_id: str, request: Request) -> Response:
+    meta = job_store.get(job_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail='Job not found')
+    if meta.content_sha256 is None:
+        raise HTTPException(status_code=404, detail='Thumbnail not available for this job')
+
+    # Content-addressed, so the hash plus transform name identify the bytes for good.
+    etag = f'"{meta.content_sha256[:32]}-{THUMBNAIL.name}"'
+    headers = {'ETag': etag, 'Cache-Control': 'private, max-age=86400'}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    try:
+        source = file_storage.local_path(meta.content_sha256)
+        body = artifact_cache.bind(meta.content_sha256, source).thumbnail()
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=404, detail='Stored image not found') from exc
+    except (OSError, ValueError) as exc:
+        raise HTTPException(status_code=422, detail=f'Unable to render thumbnail: {exc}') from exc
+    return Response(body, media_type='image/webp', headers=headers)
+
+
+def _byte_range(range_header: str, size: int) -> tuple[int, int] | None:
+    """Inclusive ``(start, end)`` of a single ``bytes=`` range; None serves the whole body."""
+    unit, _, spec = range_header.partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+    first, _, last = spec.strip().partition('-')
+    try:
+        if first:
+            start, end = int(first), int(last) if last else size - 1
+        else:
+            start, end = max(0, size - int(last)), size - 1
+    except ValueError:
+        return None
+    if start < 0 or start >= size or end < start:
+        raise HTTPException(
+            status_code=416, detail='Range not satisfiable', headers={'Content-Range': f'bytes */{size}'}
+        )
+    return start, min(end, size - 1)
+
+
+@app.get('/api/v1/jobs/{job_id}/mesh.glb')
+def get_job_mesh(job_id: str, request: Request) -> Response:
+    meta = job_store.get(job_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail='Job not found')
+    spec = (meta.quality_metrics or {}).get('mesh')
+    if not spec:
+        raise HTTPException(status_code=404, detail='Mesh not available for this job')
+
+    # The key hashes the mesh inputs, so it is a strong validator; clients revalidate after corrections.
+    etag = f'"{spec["key"]}"'
+    headers = {'ETag': etag, 'Accept-Ranges': 'bytes', 'Cache-Control': 'no-cache'}
+    if request.headers.get('if-none-match') == etag:
+        return Response(status_code=304, headers=headers)
+    body = artifact_cache.read_or_create(spec['key'], MESH, _write_mesh(spec))
+
+    range_header = request.headers.get('range')
+    if_range = request.headers.get('if-range')
+    byte_range = _byte_range(range_header, len(body)) if range_header and if_range in (None, etag) else None
+    if byte_range is None:
+        return Response(body, media_type=GLB_MEDIA_TYPE, headers=headers)
+    start, end = byte_range
+    headers['Content-Range'] = f'bytes {start}-{end}/{len(body)}'
+    return Response(body[start:end + 1], status_code=206, media_type=GLB_MEDIA_TYPE, headers=headers)
+
+
+@app.get('/api/v1/jobs/{job_id}/packaging', response_model=PackagingFitResponse)
+def get_job_packaging(job_id: str) -> PackagingFitResponse:
+    meta = job_store.get(job_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail='Job not found')
+    if not meta.dimensions_mm:
+        raise HTTPException(status_code=409, detail='Job has no dimensions yet')
+    fit = (meta.quality_metrics or {}).get('packaging')
+    if fit is None or fit.get('catalogue') != packaging_catalogue.version:
+        # Stored before the catalogue changed; fitting is cheap, so answer from the current one.
+        fit = packaging_catalogue.fit(meta.dimensions_mm, (meta.shape_proxy or {}).get('shape_family'))
+    return PackagingFitResponse(**fit)
+
+
+@app.post('/api/v1/packaging/case-packs', response_model=CasePackResponse)
+def create_case_packs(payload: CasePackRequest) -> CasePackResponse:
+    if len(payload.items) > settings.max_batch_items:
+        raise HTTPException(status_code=413, detail=f'At most {settings.max_batch_items} items per request')
+
+    with timed('case_packs'):
+        results: list[CasePackResult] = []
+        units: list[list[float]] = []
+        counts: list[int | None] = []
+        for item in payload.items:
+            result = CasePackResult(sku=item.sku, job_id=item.job_id)
+            results.append(result)
+            dimensions_mm = item.dimensions_mm.model_dump() if item.dimensions_mm is not None else None
+            shape_family = item.shape_family
+            if item.job_id is not None:
+                meta = job_store.get(item.job_id)
+                if meta is None or not meta.dimensions_mm:
+                    result.error_message = 'Job not found' if meta is None else 'Job has no dimensions yet'
+                    continue
+                dimensions_mm = meta.dimensions_mm
+                shape_family = shape_family or (meta.shape_proxy or {}).get('shape_family')
+            if not dimensions_mm:
+                result.error_message = 'Either job_id or width/depth/height dimensions_mm is required'
+                continue
+            if not has_positive_sides(dimensions_mm):
+                result.error_message = 'Width, depth and height must be positive to pack'
+                continue
+            fit = packaging_catalogue.fit(dimensions_mm, shape_family)
+            result.fit = PackagingFitResponse(**fit)
+            units.append(fit['container']['outer_mm'] if fit['container'] else fit['required_mm'])
+            counts.append(item.units)
+
+        # One vectorised pass lays out every SKU that could be fitted.
+        layouts = iter(packaging_catalogue.case_packs(units, counts))
+        for result in results:
+            if result.fit is None:
+                continue
+            layout = next(layouts)
+            if layout is None:
+                result.error_message = 'No case in the catalogue holds this pack'
+            else:
+                result.layout = CasePackLayout(**layout)
+    return CasePackResponse(catalogue=packaging_catalogue.version, results=results)
+
+
 @app.get('/api/v1/jobs/{job_id}/result', response_model=GeometryOutput)
 def get_job_result(job_id: str) -> GeometryOutput:
     meta = job_store.get(job_id)
     if meta is None:
         raise HTTPException(status_code=404, detail='Job not found')
 
-    return GeometryOutput(
-        job_id=meta.job_id,
-        status=meta.status,
-        dimensions_mm=meta.dimensions_mm,
-        volume_mm3=meta.volume_mm3,
-        shape_proxy=meta.shape_proxy,
-        quality_metrics=meta.quality_metrics,
-        error_message=meta.error_message,
-        source_type='image',
-    )
+    return _geometry_output(meta)
 
 
 @app.patch('/api/v1/jobs/{job_id}/dimensions', response_model=GeometryOutput)
@@ -200,9 +1264,6 @@ def patch_job_dimensions(job_id: str, payload: DimensionPatchRequest) -> Geometr
     if max_diameter is not None:
         dimensions_mm['max_diameter'] = max_diameter
 
-    volume_mm3 = round(width * depth * height, 3)
-
-    previous_corrections = meta.user_corrections or []
     fields = ['width', 'depth', 'height']
     if max_diameter is not None:
         fields.append('max_diameter')
@@ -213,25 +1274,13 @@ def patch_job_dimensions(job_id: str, payload: DimensionPatchRequest) -> Geometr
         'updated_at': utcnow().isoformat(),
     }
 
-    job_store.update(
-        job_id,
-        dimensions_mm=dimensions_mm,
-        volume_mm3=volume_mm3,
-        user_corrections=[*previous_corrections, correction_record],
-        status='processed',
-        error_message=None,
-    )
+    # Only outputs downstream of the dimensions are recomputed; the mesh GLB is rebuilt on its next download.
+    with timed('correction'):
+        derived = correct_dimensions(meta, dimensions_mm, packaging_catalogue)
+    job_store.update(job_id, status='processed', error_message=None, **derived)
+    job_store.append_correction(job_id, correction_record)
 
     updated = job_store.get(job_id)
     assert updated is not None
 
-    return GeometryOutput(
-        job_id=updated.job_id,
-        status=updated.status,
-        dimensions_mm=updated.dimensions_mm,
-        volume_mm3=updated.volume_mm3,
-        shape_proxy=updated.shape_proxy,
-        quality_metrics=updated.quality_metrics,
-        error_message=updated.error_message,
-        source_type='image',
-    )
+    return _geometry_output(updated)
@@ -0,0 +1,110 @@
+"""Multi-view jobs: front/side(/top) photos of one product fused into 3D dimensions.
+
+Each view is processed on its own (preprocess, segmentation, calibration)
+into a small record holding its calibrated extents and a silhouette profile:
+the object's width in mm on ``PROFILE_BINS`` evenly spaced rows from top to
+bottom. Records depend only on the view's bytes, so re-uploading one view
+recomputes that view and reuses the others.
+
+Fusion takes width from the front, depth from the side (both averaged with
+the top view when present) and integrates ``width(z) * depth(z)`` over the
+height, scaled by the cross-section fill: the top view's fill ratio when
+available, otherwise an ellipse for near-square footprints and a rectangle
+for the rest.
+"""
+
+import math
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .artifacts import ImageArtifacts
+from .calibration import PROFILE_BINS, CalibrationProfiles, ReferenceSpec
+from .config import settings
+from .image_pipeline import calibrate_image, preprocess_image, run_segmentation
+
+MULTIVIEW_VERSION = '2'
+VIEWS = ('front', 'side', 'top')
+REQUIRED_VIEWS = ('front', 'side')
+# Footprints whose width and depth differ by less than this are treated as round without a top view.
+ROUND_FOOTPRINT_TOLERANCE = 0.15
+
+
+def process_view(
+    source: Path,
+    size_bytes: int,
+    artifacts: ImageArtifacts,
+    spec: ReferenceSpec,
+    default_mm_per_px: float,
+    profiles: CalibrationProfiles | None = None,
+    profile: str | None = None,
+) -> dict[str, Any]:
+    with source.open('rb') as fh:
+        header = fh.read(settings.upload_header_bytes)
+    preprocess = preprocess_image(header, size_bytes=size_bytes, path=source)
+    segmentation = run_segmentation(source, artifacts=artifacts)
+    calibration = calibrate_image(
+        preprocess, segmentation.meta, artifacts, spec, default_mm_per_px, profiles, profile, segmentation.mask
+    )
+
+    bbox = calibration.get('object_bbox')
+    mm_per_px = float(calibration['mm_per_px'])
+    return {
+        'sha256': artifacts.content_sha256,
+        'preprocess': preprocess,
+        'segmentation': segmentation.meta,
+        'calibration': calibration,
+        'width_mm': round((bbox[2] - bbox[0]) * mm_per_px, 2) if bbox else 0.0,
+        'height_mm': round((bbox[3] - bbox[1]) * mm_per_px, 2) if bbox else 0.0,
+        'fill_ratio': calibration.get('object_fill_ratio') or 0.0,
+        'profile_mm': [round(width * mm_per_px, 3) for width in calibration.get('object_profile_px') or []],
+    }
+
+
+def _mean(*values: float) -> float:
+    return sum(values) / len(values)
+
+
+def fuse_views(views: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    """Fuse per-view records into ``dimensions_mm``, ``volume_mm3`` and fusion metadata."""
+    front = views['front']
+    side = views['side']
+    top = views.get('top')
+
+    width = front['width_mm']
+    depth = side['width_mm']
+    height = _mean(front['height_mm'], side['height_mm'])
+    if top is not None:
+        width = _mean(width, top['width_mm'])
+        depth = _mean(depth, top['height_mm'])
+
+    if top is not None:
+        cross_section = 'top-view'
+        factor = float(top['fill_ratio'])
+    elif max(width, depth) > 0 and abs(width - depth) / max(width, depth) <= ROUND_FOOTPRINT_TOLERANCE:
+        cross_section = 'ellipse'
+        factor = math.pi / 4
+    else:
+        cross_section = 'rectangle'
+        factor = 1.0
+
+    widths = np.asarray(front['profile_mm'], dtype=np.float64)
+    depths = np.asarray(side['profile_mm'], dtype=np.float64)
+    if widths.size == PROFILE_BINS and depths.size == PROFILE_BINS:
+        volume = float(np.sum(widths * depths)) * factor * height / PROFILE_BINS
+    else:
+        volume = width * depth * height * factor
+
+    box = width * depth * height
+    return {
+        'dimensions_mm': {'width': round(width, 2), 'height': round(height, 2), 'depth': round(depth, 2)},
+        'volume_mm3': round(volume, 3),
+        'fusion': {
+            'views': sorted(views),
+            'cross_section': cross_section,
+            'cross_section_factor': round(factor, 4),
+            # Share of the bounding box the fused volume fills; dimension corrections keep it.
+            'volume_factor': round(volume / box, 6) if box > 0 else 1.0,
+        },
+    }
@@ -0,0 +1,166 @@
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, NamedTuple, Protocol
+
+from .config import settings
+
+
+class OCRLine(NamedTuple):
+    text: str
+    bbox: list[int] | None
+    confidence: float
+
+
+class OCRBackend(Protocol):
+    name: str
+
+    def recognize(self, image: Any) -> list[OCRLine]:
+        ...
+
+    def close(self) -> None:
+        ...
+
+
+class TesserocrBackend:
+    """In-process tesseract binding; one ``PyTessBaseAPI`` per pooled engine."""
+
+    name = 'tesserocr'
+
+    def __init__(self) -> None:
+        import tesserocr  # type: ignore
+
+        self._tesserocr = tesserocr
+        self._api = tesserocr.PyTessBaseAPI()
+
+    def recognize(self, image: Any) -> list[OCRLine]:
+        level = self._tesserocr.RIL.TEXTLINE
+        self._api.SetImage(image)
+        self._api.Recognize()
+        lines: list[OCRLine] = []
+        iterator = self._api.GetIterator()
+        for result in self._tesserocr.iterate_level(iterator, level):
+            text = (result.GetUTF8Text(level) or '').strip()
+            if not text:
+                continue
+            x0, y0, x1, y1 = result.BoundingBox(level)
+            lines.append(OCRLine(text, [x0, y0, x1, y1], round(result.Confidence(level) / 100.0, 4)))
+        return lines
+
+    def close(self) -> None:
+        self._api.End()
+
+
+class PytesseractBackend:
+    """Subprocess-based fallback; the pool still bounds how many run at once."""
+
+    name = 'pytesseract'
+
+    def __init__(self) -> None:
+        import pytesseract  # type: ignore
+
+        pytesseract.get_tesseract_version()
+        self._pytesseract = pytesseract
+
+    def recognize(self, image: Any) -> list[OCRLine]:
+        data = self._pytesseract.image_to_data(image, output_type=self._pytesseract.Output.DICT)
+        grouped: dict[tuple[int, int, int], list[int]] = {}
+        for i, word in enumerate(data['text']):
+            if word and word.strip():
+                key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+                grouped.setdefault(key, []).append(i)
+
+        lines: list[OCRLine] = []
+        for indices in grouped.values():
+            x0 = min(data['left'][i] for i in indices)
+            y0 = min(data['top'][i] for i in indices)
+            x1 = max(data['left'][i] + data['width'][i] for i in indices)
+            y1 = max(data['top'][i] + data['height'][i] for i in indices)
+            confidences = [float(data['conf'][i]) for i in indices if float(data['conf'][i]) >= 0]
+            confidence = sum(confidences) / len(confidences) / 100.0 if confidences else 0.0
+            text = ' '.join(data['text'][i].strip() for i in indices)
+            lines.append(OCRLine(text, [x0, y0, x1, y1], round(confidence, 4)))
+        return lines
+
+    def close(self) -> None:
+        pass
+
+
+_BACKEND_FACTORIES: tuple[Callable[[], OCRBackend], ...] = (TesserocrBackend, PytesseractBackend)
+
+
+def detect_backend_factory() -> Callable[[], OCRBackend] | None:
+    for factory in _BACKEND_FACTORIES:
+        try:
+            factory().close()
+        except Exception:
+            continue
+        return factory
+    return None
+
+
+class OCREnginePool:
+    """Fixed set of warm OCR engines handed out one request at a time."""
+
+    def __init__(self, factory: Callable[[], OCRBackend] | None, size: int) -> None:
+        self._engines: queue.Queue[OCRBackend] = queue.Queue()
+        self._all: list[OCRBackend] = []
+        self.backend_name: str | None = None
+        if factory is not None:
+            for _ in range(max(1, size)):
+                engine = factory()
+                self._all.append(engine)
+                self._engines.put(engine)
+            self.backend_name = self._all[0].name
+
+    @property
+    def available(self) -> bool:
+        return bool(self._all)
+
+    @property
+    def size(self) -> int:
+        return len(self._all)
+
+    @property
+    def idle(self) -> int:
+        return self._engines.qsize()
+
+    @contextmanager
+    def acquire(self, timeout: float | None = None) -> Iterator[OCRBackend]:
+        engine = self._engines.get(timeout=timeout)
+        try:
+            yield engine
+        finally:
+            self._engines.put(engine)
+
+    def close(self) -> None:
+        for engine in self._all:
+            engine.close()
+        self._all.clear()
+
+
+_pool: OCREnginePool | None = None
+_pool_lock = threading.Lock()
+
+
+def init_ocr_pool(size: int) -> OCREnginePool:
+    """Detect the OCR backend once and warm ``size`` engines (capped at the core count)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = max(1, min(size, os.cpu_count() or 1))
+            _pool = OCREnginePool(detect_backend_factory(), workers)
+        return _pool
+
+
+def get_ocr_pool() -> OCREnginePool:
+    return _pool or init_ocr_pool(settings.ocr_workers)
+
+
+def close_ocr_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
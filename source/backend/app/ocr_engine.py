@@ -1,6 +1,22 @@
+import logging
+import math
 import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Any, TypedDict
 
+from PIL import Image
+
+from .artifacts import ImageArtifacts, decode_ocr_gray
+from .config import settings
+from .image_header import sniff_format
+from .image_pipeline import run_segmentation
+from .metrics import OCR_ENGINE_FAILURES, timed
+from .ocr_backend import OCREnginePool, OCRLine, get_ocr_pool
+from .segmentation import OTSU_ALGORITHM, mask_regions
+
+logger = logging.getLogger(__name__)
+
 
 class OCRResultItem(TypedDict):
     text: str
@@ -14,7 +30,11 @@ class OCRResultItem(TypedDict):
 _DIMENSION_PATTERN = re.compile(r'(?<!\d)(\d+(?:\.\d+)?)(?:\s*(mm))?(?!\d)', re.IGNORECASE)
 _VERSION_PATTERN = re.compile(r'\bv\s*\d+(?:\.\d+)+\b', re.IGNORECASE)
 _MULTI_DOT_PATTERN = re.compile(r'\b\d+\.\d+\.\d+\b')
+# Working-mask pixels added around each ROI so glyph edges are not clipped.
+_ROI_PADDING_PX = 1
 _CONTEXT_TOKENS = ('w', 'h', 'd', 'width', 'height', 'depth', 'dia', 'diameter', 'size', 'mm', 'x', '×')
+# Without an OCR engine only small plain-text payloads are scanned; images yield no candidates.
+_TEXT_FALLBACK_MAX_BYTES = 64 * 1024
 
 
 def build_ocr_result_item(
@@ -51,42 +71,152 @@ def _is_excluded_by_patterns(text: str, start: int, end: int) -> bool:
     return bool(_VERSION_PATTERN.search(window) or _MULTI_DOT_PATTERN.search(window))
 
 
-def extract_dimension_candidates(image_bytes: bytes) -> dict[str, Any]:
-    engine_available = False
-    message = 'OCR engine unavailable in current runtime; using lightweight parser fallback.'
-
-    extracted_text = ''
-    try:
-        import pytesseract  # type: ignore
-        from PIL import Image  # type: ignore
-        import io
-
-        engine_available = True
-        message = 'OCR engine available.'
-        image = Image.open(io.BytesIO(image_bytes))
-        extracted_text = pytesseract.image_to_string(image)
-    except Exception:
-        extracted_text = image_bytes.decode('utf-8', errors='ignore')
-
-    extracted_text = _normalize_text(extracted_text)
+def _parse_candidates(text: str, bbox: list[int] | None = None) -> list[OCRResultItem]:
+    text = _normalize_text(text)
 
     items: list[OCRResultItem] = []
-    for match in _DIMENSION_PATTERN.finditer(extracted_text):
+    for match in _DIMENSION_PATTERN.finditer(text):
         raw = match.group(0).strip()
         value = float(match.group(1))
         unit = match.group(2)
         start, end = match.span()
 
-        if _is_excluded_by_patterns(extracted_text, start, end):
+        if _is_excluded_by_patterns(text, start, end):
             continue
-        if not _is_dimension_context(extracted_text, start, end, unit):
+        if not _is_dimension_context(text, start, end, unit):
             continue
 
         confidence = 0.9 if unit else 0.6
-        items.append(build_ocr_result_item(text=raw, value=value, unit=unit, bbox=None, confidence=confidence))
+        items.append(build_ocr_result_item(text=raw, value=value, unit=unit, bbox=bbox, confidence=confidence))
+    return items
+
+
+def _recognize_full(image: Image.Image, pool: OCREnginePool) -> list[OCRLine]:
+    with pool.acquire() as engine:
+        return engine.recognize(image)
+
+
+def _roi_boxes(
+    source: bytes | Path, image_size: tuple[int, int], artifacts: ImageArtifacts | None
+) -> list[list[int]]:
+    # Foreground blocks of the working-resolution mask, scaled to full-image pixels.
+    segmentation = run_segmentation(source, OTSU_ALGORITHM, artifacts)
+    mask = segmentation.mask
+    full_w, full_h = image_size
+    scale_x = full_w / mask.shape[1]
+    scale_y = full_h / mask.shape[0]
+    pad = _ROI_PADDING_PX
+
+    boxes = []
+    for x0, y0, x1, y1 in mask_regions(mask):
+        boxes.append(
+            [
+                max(0, math.floor((x0 - pad) * scale_x)),
+                max(0, math.floor((y0 - pad) * scale_y)),
+                min(full_w, math.ceil((x1 + pad) * scale_x)),
+                min(full_h, math.ceil((y1 + pad) * scale_y)),
+            ]
+        )
+    return boxes
+
+
+def _recognize_crop(crop: Image.Image, box: list[int], pool: OCREnginePool) -> list[OCRLine]:
+    width, height = crop.size
+    scale = min(1.0, settings.ocr_roi_max_side / max(width, height))
+    if scale < 1.0:
+        crop = crop.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.Resampling.BILINEAR)
+    back_x = width / crop.size[0]
+    back_y = height / crop.size[1]
+
+    with pool.acquire() as engine:
+        lines = engine.recognize(crop)
+
+    mapped: list[OCRLine] = []
+    for line in lines:
+        bbox = None
+        if line.bbox is not None:
+            bx0, by0, bx1, by1 = line.bbox
+            bbox = [
+                box[0] + round(bx0 * back_x),
+                box[1] + round(by0 * back_y),
+                box[0] + round(bx1 * back_x),
+                box[1] + round(by1 * back_y),
+            ]
+        mapped.append(OCRLine(line.text, bbox, line.confidence))
+    return mapped
+
+
+def _recognize_roi(
+    image: Image.Image, source: bytes | Path, pool: OCREnginePool, artifacts: ImageArtifacts | None
+) -> list[OCRLine]:
+    boxes = _roi_boxes(source, image.size, artifacts)
+    if not boxes:
+        return _recognize_full(image, pool)
+
+    crops = [image.crop(tuple(box)) for box in boxes]
+    with ThreadPoolExecutor(max_workers=min(pool.size, len(crops)), thread_name_prefix='ocr-roi') as executor:
+        results = executor.map(lambda args: _recognize_crop(*args, pool), zip(crops, boxes))
+        return [line for lines in results for line in lines]
+
+
+def _recognize_lines(
+    source: bytes | Path, pool: OCREnginePool, mode: str, artifacts: ImageArtifacts | None
+) -> list[OCRLine]:
+    # Engines read the full-resolution grayscale image, cached per content hash when available.
+    gray = artifacts.ocr_gray() if artifacts is not None else decode_ocr_gray(source)
+    image = Image.fromarray(gray)
+    if mode == 'roi':
+        return _recognize_roi(image, source, pool, artifacts)
+    return _recognize_full(image, pool)
+
+
+def _fallback_text(source: bytes | Path) -> str:
+    if isinstance(source, Path):
+        if source.stat().st_size > _TEXT_FALLBACK_MAX_BYTES:
+            return ''
+        raw = source.read_bytes()
+    elif len(source) > _TEXT_FALLBACK_MAX_BYTES:
+        return ''
+    else:
+        raw = source
+    if sniff_format(raw) is not None or b'\x00' in raw:
+        return ''
+    return raw.decode('utf-8', errors='ignore')
+
+
+def extract_dimension_candidates(
+    source: bytes | Path,
+    pool: OCREnginePool | None = None,
+    mode: str | None = None,
+    artifacts: ImageArtifacts | None = None,
+) -> dict[str, Any]:
+    pool = pool or get_ocr_pool()
+    mode = mode or settings.ocr_mode
+    engine_available = pool.available
+    fallback_reason: str | None = None
+    if engine_available:
+        message = f'OCR engine available ({pool.backend_name}).'
+        try:
+            with timed('ocr'):
+                lines = _recognize_lines(source, pool, mode, artifacts)
+            items = [item for line in lines for item in _parse_candidates(line.text, line.bbox)]
+        except Exception as exc:
+            logger.warning('OCR engine %s failed; using lightweight parser fallback', pool.backend_name, exc_info=True)
+            OCR_ENGINE_FAILURES.inc(1, pool.backend_name)
+            engine_available = False
+            fallback_reason = f'engine_error: {type(exc).__name__}'
+            message = f'OCR engine failed ({pool.backend_name}); using lightweight parser fallback.'
+    else:
+        fallback_reason = 'engine_unavailable'
+        message = 'OCR engine unavailable in current runtime; using lightweight parser fallback.'
+
+    if fallback_reason is not None:
+        items = _parse_candidates(_fallback_text(source))
 
     return {
         'items': items,
         'engine_available': engine_available,
+        'fallback_reason': fallback_reason,
         'message': message,
+        'mode': mode,
     }
@@ -0,0 +1,216 @@
+"""Packaging recommendations from a job's ``dimensions_mm`` and shape family.
+
+A product fits a container when, with both sorted longest side first, every
+product side plus clearance is no longer than the matching inner side: any
+axis-aligned rotation is allowed. The catalogue is indexed once per process,
+containers sorted by their longest inner side, so a lookup bisects past every
+container that is too short and checks the other two sides of the rest with
+one vectorised comparison. The smallest fitting inner volume wins.
+
+Case packs stack identical units (the fitted container's outer size) in a
+grid inside a shipping case. All SKUs of a batch are laid out against every
+case in each of the six unit orientations in one array operation.
+"""
+
+import hashlib
+import json
+import math
+from bisect import bisect_left
+from itertools import permutations
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple, Sequence
+
+import numpy as np
+
+PRIMARY_KINDS = ('box', 'carton')
+CASE_KIND = 'case'
+
+
+class PackagingError(ValueError):
+    pass
+
+
+class PackagingSize(NamedTuple):
+    code: str
+    kind: str  # 'box' or 'carton' for single units, 'case' for shipping cases
+    inner_mm: tuple[float, float, float]  # width, depth, height
+    wall_mm: float = 0.0  # board thickness, added on both sides of every axis
+
+    @property
+    def outer_mm(self) -> tuple[float, float, float]:
+        return tuple(round(side + 2 * self.wall_mm, 3) for side in self.inner_mm)
+
+
+class ClearanceRule(NamedTuple):
+    side_mm: float  # each side of width and depth
+    top_mm: float  # above the height
+
+
+# Round products need more room for inserts or a neck; flat ones are packed snug.
+CLEARANCE_RULES = {
+    'cylindrical-like': ClearanceRule(1.5, 3.0),
+    'vertical-prismatic-like': ClearanceRule(1.0, 2.0),
+    'horizontal-prismatic-like': ClearanceRule(1.0, 2.0),
+}
+DEFAULT_CLEARANCE = ClearanceRule(2.0, 3.0)
+
+# Common cosmetic folding cartons and tuck boxes, plus regular slotted shipping cases.
+DEFAULT_CATALOGUE = (
+    PackagingSize('CT-LIP', 'carton', (25.0, 25.0, 85.0), 0.4),
+    PackagingSize('CT-15', 'carton', (30.0, 30.0, 90.0), 0.4),
+    PackagingSize('CT-30', 'carton', (38.0, 38.0, 110.0), 0.4),
+    PackagingSize('CT-50', 'carton', (45.0, 45.0, 130.0), 0.4),
+    PackagingSize('CT-100', 'carton', (55.0, 55.0, 160.0), 0.5),
+    PackagingSize('CT-200', 'carton', (65.0, 65.0, 190.0), 0.5),
+    PackagingSize('CT-TUBE', 'carton', (40.0, 30.0, 180.0), 0.4),
+    PackagingSize('CT-PALETTE', 'carton', (110.0, 80.0, 20.0), 0.5),
+    PackagingSize('BX-JAR-S', 'box', (60.0, 60.0, 45.0), 1.0),
+    PackagingSize('BX-JAR-L', 'box', (85.0, 85.0, 60.0), 1.0),
+    PackagingSize('BX-GIFT-S', 'box', (120.0, 90.0, 60.0), 1.5),
+    PackagingSize('BX-GIFT-L', 'box', (200.0, 150.0, 80.0), 1.5),
+    PackagingSize('BX-TALL', 'box', (90.0, 90.0, 260.0), 1.5),
+    PackagingSize('CS-S', 'case', (200.0, 150.0, 120.0), 3.0),
+    PackagingSize('CS-M', 'case', (300.0, 200.0, 150.0), 3.0),
+    PackagingSize('CS-L', 'case', (400.0, 300.0, 200.0), 4.0),
+    PackagingSize('CS-XL', 'case', (600.0, 400.0, 300.0), 5.0),
+)
+
+
+def load_catalogue(path: str | Path) -> tuple[PackagingSize, ...]:
+    """Read a JSON list of ``{"code", "kind", "inner_mm": [w, d, h], "wall_mm"}`` entries."""
+    try:
+        entries = json.loads(Path(path).read_text(encoding='utf-8'))
+        sizes = tuple(
+            PackagingSize(
+                str(entry['code']),
+                str(entry['kind']),
+                tuple(float(side) for side in entry['inner_mm']),
+                float(entry.get('wall_mm', 0.0)),
+            )
+            for entry in entries
+        )
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        raise PackagingError(f'Invalid packaging catalogue {path}: {exc}') from exc
+    for size in sizes:
+        if len(size.inner_mm) != 3 or min(size.inner_mm) <= 0:
+            raise PackagingError(f'Packaging size {size.code!r} needs three positive inner sides')
+        if size.kind not in (*PRIMARY_KINDS, CASE_KIND):
+            raise PackagingError(f'Packaging size {size.code!r} has unknown kind {size.kind!r}')
+    return sizes
+
+
+def has_positive_sides(dimensions_mm: dict[str, float]) -> bool:
+    try:
+        return all(float(dimensions_mm[axis]) > 0 for axis in ('width', 'depth', 'height'))
+    except (KeyError, TypeError, ValueError):
+        return False
+
+
+def required_mm(dimensions_mm: dict[str, float], shape_family: str | None) -> tuple[float, float, float]:
+    rule = CLEARANCE_RULES.get(shape_family or '', DEFAULT_CLEARANCE)
+    return (
+        float(dimensions_mm['width']) + 2 * rule.side_mm,
+        float(dimensions_mm['depth']) + 2 * rule.side_mm,
+        float(dimensions_mm['height']) + rule.top_mm,
+    )
+
+
+def _container(size: PackagingSize) -> dict[str, Any]:
+    return {'code': size.code, 'kind': size.kind, 'inner_mm': list(size.inner_mm), 'outer_mm': list(size.outer_mm)}
+
+
+class _SortedIndex:
+    def __init__(self, sizes: Iterable[PackagingSize]) -> None:
+        sizes = list(sizes)
+        sides = np.array([sorted(size.inner_mm, reverse=True) for size in sizes], dtype=np.float64).reshape(-1, 3)
+        order = np.argsort(sides[:, 0], kind='stable')
+        self.sizes = [sizes[i] for i in order]
+        self.sides = sides[order]
+        self.volumes = self.sides.prod(axis=1)
+        self._longest = self.sides[:, 0].tolist()
+
+    def smallest_fit(self, need: Sequence[float]) -> PackagingSize | None:
+        longest, middle, shortest = sorted(need, reverse=True)
+        start = bisect_left(self._longest, longest)
+        sides = self.sides[start:]
+        fits = (sides[:, 1] >= middle) & (sides[:, 2] >= shortest)
+        if not fits.any():
+            return None
+        return self.sizes[start + int(np.argmin(np.where(fits, self.volumes[start:], np.inf)))]
+
+
+class PackagingCatalogue:
+    def __init__(self, sizes: Iterable[PackagingSize]) -> None:
+        self.sizes = tuple(sizes)
+        self.version = hashlib.sha256(json.dumps(self.sizes).encode()).hexdigest()[:12]
+        self._primary = _SortedIndex(size for size in self.sizes if size.kind in PRIMARY_KINDS)
+        self.cases = [size for size in self.sizes if size.kind == CASE_KIND]
+        self._case_sides = np.array([size.inner_mm for size in self.cases], dtype=np.float64).reshape(-1, 3)
+
+    def fit(self, dimensions_mm: dict[str, float], shape_family: str | None) -> dict[str, Any]:
+        """The smallest box or carton that holds the product with its clearance."""
+        need = required_mm(dimensions_mm, shape_family)
+        # A zero side (e.g. a correction clamped to 0) describes no product; nothing is packed.
+        size = self._primary.smallest_fit(need) if has_positive_sides(dimensions_mm) else None
+        product = float(dimensions_mm['width']) * float(dimensions_mm['depth']) * float(dimensions_mm['height'])
+        return {
+            'catalogue': self.version,
+            'shape_family': shape_family,
+            'required_mm': [round(side, 3) for side in need],
+            'container': _container(size) if size is not None else None,
+            'fill_ratio': round(product / math.prod(size.inner_mm), 4) if size is not None else None,
+        }
+
+    def case_packs(
+        self, units: Sequence[Sequence[float]], counts: Sequence[int | None]
+    ) -> list[dict[str, Any] | None]:
+        """Case layouts for unit sizes (outer mm); None counts pick the case that packs densest."""
+        if not units:
+            return []
+        if not self.cases:
+            return [None] * len(units)
+        unit_sides = np.asarray(units, dtype=np.float64).reshape(-1, 3)
+        if not (unit_sides > 0).all():
+            raise PackagingError('Case pack units need three positive sides')
+        orientations = np.array(list(permutations(range(3))))
+        rotated = unit_sides[:, orientations]  # (skus, 6, 3)
+        grids = np.floor(self._case_sides[None, :, None, :] / rotated[:, None, :, :]).astype(np.int64)
+        capacity = grids.prod(axis=-1)  # (skus, cases, 6)
+        best = capacity.argmax(axis=-1)
+        best_capacity = np.take_along_axis(capacity, best[..., None], axis=-1)[..., 0]  # (skus, cases)
+        case_volumes = self._case_sides.prod(axis=1)
+        unit_volumes = unit_sides.prod(axis=1)
+
+        layouts: list[dict[str, Any] | None] = []
+        for sku, wanted in enumerate(counts):
+            held = best_capacity[sku]
+            if wanted is None:
+                density = held * unit_volumes[sku] / case_volumes
+                if held.max() == 0:
+                    layouts.append(None)
+                    continue
+                case = int(np.lexsort((-held, -density))[0])
+                packed = int(held[case])
+            else:
+                candidates = np.flatnonzero(held >= wanted)
+                if candidates.size == 0:
+                    layouts.append(None)
+                    continue
+                case = int(candidates[np.argmin(case_volumes[candidates])])
+                packed = int(wanted)
+            nx, ny, _ = (int(n) for n in grids[sku, case, best[sku, case]])
+            # Partial cases fill whole rows and layers first.
+            layers = math.ceil(packed / (nx * ny))
+            if layers == 1:
+                nx, ny = min(nx, packed), math.ceil(packed / nx)
+            layouts.append(
+                {
+                    'case': _container(self.cases[case]),
+                    'unit_mm': [round(float(side), 3) for side in rotated[sku, best[sku, case]]],
+                    'grid': [nx, ny, layers],
+                    'units_per_case': packed,
+                    'capacity': int(held[case]),
+                    'fill_ratio': round(float(packed * unit_volumes[sku] / case_volumes[case]), 4),
+                }
+            )
+        return layouts
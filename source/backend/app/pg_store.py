@@ -0,0 +1,240 @@
+import json
+import logging
+import threading
+from dataclasses import MISSING, fields as dataclass_fields
+from datetime import datetime
+from typing import Any, Collection
+
+import psycopg
+from psycopg import sql
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+from .store import JobKey, JobMeta, JobStatusListener
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        job_id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        content_type TEXT NOT NULL,
+        size BIGINT NOT NULL,
+        file_path TEXT NOT NULL,
+        created_at TIMESTAMPTZ NOT NULL,
+        content_sha256 TEXT,
+        batch_id TEXT,
+        batch_seq INTEGER,
+        quality_metrics JSONB,
+        dimensions_mm JSONB,
+        volume_mm3 DOUBLE PRECISION,
+        shape_proxy JSONB,
+        error_message TEXT,
+        user_corrections JSONB,
+        stage_timings_ms JSONB,
+        views JSONB
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS jobs_status_idx ON jobs (status)',
+    'CREATE INDEX IF NOT EXISTS jobs_created_at_idx ON jobs (created_at)',
+    'ALTER TABLE jobs ADD COLUMN IF NOT EXISTS batch_id TEXT',
+    'CREATE INDEX IF NOT EXISTS jobs_batch_id_idx ON jobs (batch_id) WHERE batch_id IS NOT NULL',
+    'ALTER TABLE jobs ADD COLUMN IF NOT EXISTS batch_seq INTEGER',
+    'CREATE INDEX IF NOT EXISTS jobs_batch_seq_idx ON jobs (batch_id, batch_seq) WHERE batch_id IS NOT NULL',
+    'ALTER TABLE jobs ADD COLUMN IF NOT EXISTS stage_timings_ms JSONB',
+    'ALTER TABLE jobs ADD COLUMN IF NOT EXISTS views JSONB',
+    # Listing walks (created_at, job_id) backwards; each filter gets a composite index
+    # so a filtered page is an index range scan.
+    'CREATE INDEX IF NOT EXISTS jobs_created_at_job_id_idx ON jobs (created_at, job_id)',
+    'CREATE INDEX IF NOT EXISTS jobs_status_created_idx ON jobs (status, created_at, job_id)',
+    'CREATE INDEX IF NOT EXISTS jobs_content_type_created_idx ON jobs (content_type, created_at, job_id)',
+    "CREATE INDEX IF NOT EXISTS jobs_shape_family_created_idx ON jobs ((shape_proxy->>'shape_family'), created_at, job_id)",
+)
+
+_COLUMNS = tuple(f.name for f in dataclass_fields(JobMeta))
+# Status transitions are broadcast with NOTIFY so every worker process sees them.
+NOTIFY_CHANNEL = 'job_status'
+_LISTEN_RECONNECT_SECONDS = 1.0
+
+_REQUIRED_COLUMNS = frozenset(
+    f.name for f in dataclass_fields(JobMeta) if f.default is MISSING and f.default_factory is MISSING
+)
+_JSON_COLUMNS = frozenset(
+    {'quality_metrics', 'dimensions_mm', 'shape_proxy', 'user_corrections', 'stage_timings_ms', 'views'}
+)
+
+
+def _adapt(column: str, value: Any) -> Any:
+    if column in _JSON_COLUMNS and value is not None:
+        return Jsonb(value)
+    return value
+
+
+def _row_to_meta(row: dict[str, Any]) -> JobMeta:
+    return JobMeta(**{column: row[column] for column in _COLUMNS if column in row})
+
+
+class PostgresJobStore:
+    """JobStore backed by the ``jobs`` table, sharing one connection pool.
+
+    Exposes the same interface as ``InMemoryJobStore`` so several uvicorn
+    workers can serve the same jobs. Status listeners are fed from a LISTEN
+    connection, so they also see transitions made by other processes;
+    notifications sent while that connection is reconnecting are lost.
+    """
+
+    def __init__(self, pool: ConnectionPool) -> None:
+        self._pool = pool
+        self._listeners: list[JobStatusListener] = []
+        self._listen_thread: threading.Thread | None = None
+        self._closed = threading.Event()
+
+    def add_listener(self, listener: JobStatusListener) -> None:
+        self._listeners.append(listener)
+        if self._listen_thread is None:
+            self._listen_thread = threading.Thread(target=self._listen, name='job-status-listener', daemon=True)
+            self._listen_thread.start()
+
+    def _listen(self) -> None:
+        while not self._closed.is_set():
+            try:
+                with psycopg.connect(self._pool.conninfo, autocommit=True, connect_timeout=2) as conn:
+                    conn.execute(sql.SQL('LISTEN {}').format(sql.Identifier(NOTIFY_CHANNEL)))
+                    while not self._closed.is_set():
+                        for notify in conn.notifies(timeout=_LISTEN_RECONNECT_SECONDS):
+                            self._dispatch(notify.payload)
+            except psycopg.Error:
+                logger.warning('Job status LISTEN connection lost; reconnecting', exc_info=True)
+                self._closed.wait(_LISTEN_RECONNECT_SECONDS)
+
+    def _dispatch(self, payload: str) -> None:
+        event = json.loads(payload)
+        for listener in self._listeners:
+            listener(event['job_id'], event['status'])
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._listen_thread is not None:
+            self._listen_thread.join(timeout=_LISTEN_RECONNECT_SECONDS * 2)
+
+    def ensure_schema(self) -> None:
+        with self._pool.connection() as conn:
+            for statement in _SCHEMA_STATEMENTS:
+                conn.execute(statement)
+
+    def create(self, meta: JobMeta) -> None:
+        query = sql.SQL('INSERT INTO jobs ({}) VALUES ({})').format(
+            sql.SQL(', ').join(map(sql.Identifier, _COLUMNS)),
+            sql.SQL(', ').join(sql.Placeholder() * len(_COLUMNS)),
+        )
+        params = [_adapt(column, getattr(meta, column)) for column in _COLUMNS]
+        with self._pool.connection() as conn:
+            conn.execute(query, params)
+
+    def get(self, job_id: str) -> JobMeta | None:
+        with self._pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute('SELECT * FROM jobs WHERE job_id = %s', (job_id,))
+                row = cur.fetchone()
+        return _row_to_meta(row) if row else None
+
+    def list_by_batch(self, batch_id: str) -> list[JobMeta]:
+        with self._pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute('SELECT * FROM jobs WHERE batch_id = %s ORDER BY batch_seq, job_id', (batch_id,))
+                rows = cur.fetchall()
+        return [_row_to_meta(row) for row in rows]
+
+    def update(self, job_id: str, **fields: Any) -> JobMeta | None:
+        columns = [column for column in fields if column in _COLUMNS and column != 'job_id']
+        if not columns:
+            return self.get(job_id)
+
+        query = sql.SQL('UPDATE jobs SET {} WHERE job_id = %s RETURNING *').format(
+            sql.SQL(', ').join(
+                sql.SQL('{} = %s').format(sql.Identifier(column)) for column in columns
+            )
+        )
+        params = [_adapt(column, fields[column]) for column in columns]
+        with self._pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(query, [*params, job_id])
+                row = cur.fetchone()
+                if row is not None and 'status' in columns:
+                    # Delivered on commit, together with the update itself.
+                    payload = json.dumps({'job_id': job_id, 'status': row['status']})
+                    cur.execute('SELECT pg_notify(%s, %s)', (NOTIFY_CHANNEL, payload))
+        return _row_to_meta(row) if row else None
+
+    def append_correction(self, job_id: str, record: dict[str, Any]) -> None:
+        # JSONB concatenation appends in place instead of resending the whole history.
+        with self._pool.connection() as conn:
+            conn.execute(
+                "UPDATE jobs SET user_corrections = COALESCE(user_corrections, '[]'::jsonb) || %s "
+                'WHERE job_id = %s',
+                (Jsonb([record]), job_id),
+            )
+
+    def count_by_status(self) -> dict[str, int]:
+        with self._pool.connection() as conn:
+            rows = conn.execute('SELECT status, count(*) FROM jobs GROUP BY status').fetchall()
+        return {status: count for status, count in rows}
+
+    def list_jobs(
+        self,
+        *,
+        status: Collection[str] | None = None,
+        content_type: Collection[str] | None = None,
+        shape_family: Collection[str] | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        before: JobKey | None = None,
+        limit: int = 50,
+        fields: Collection[str] | None = None,
+    ) -> list[JobMeta]:
+        """Keyset-paginated listing; columns outside ``fields`` are not fetched."""
+        conditions: list[sql.Composable] = []
+        params: list[Any] = []
+        for expression, values in (
+            (sql.SQL('status'), status),
+            (sql.SQL('content_type'), content_type),
+            (sql.SQL("shape_proxy->>'shape_family'"), shape_family),
+        ):
+            if values is not None:
+                conditions.append(sql.SQL('{} = ANY(%s)').format(expression))
+                params.append(list(values))
+        if created_from is not None:
+            conditions.append(sql.SQL('created_at >= %s'))
+            params.append(created_from)
+        if created_to is not None:
+            conditions.append(sql.SQL('created_at < %s'))
+            params.append(created_to)
+        if before is not None:
+            conditions.append(sql.SQL('(created_at, job_id) < (%s, %s)'))
+            params.extend(before)
+
+        columns = _COLUMNS if fields is None else [c for c in _COLUMNS if c in _REQUIRED_COLUMNS or c in fields]
+        query = sql.SQL('SELECT {} FROM jobs {} ORDER BY created_at DESC, job_id DESC LIMIT %s').format(
+            sql.SQL(', ').join(map(sql.Identifier, columns)),
+            sql.SQL('WHERE ') + sql.SQL(' AND ').join(conditions) if conditions else sql.SQL(''),
+        )
+        with self._pool.connection() as conn:
+            with conn.cursor(row_factory=dict_row) as cur:
+                cur.execute(query, [*params, limit])
+                rows = cur.fetchall()
+        return [_row_to_meta(row) for row in rows]
+
+    def memory_stats(self) -> dict[str, Any]:
+        # Records live in Postgres; nothing is held in process memory.
+        return {}
+
+    def delete(self, job_id: str) -> None:
+        with self._pool.connection() as conn:
+            conn.execute('DELETE FROM jobs WHERE job_id = %s', (job_id,))
+
+    def clear(self) -> None:
+        with self._pool.connection() as conn:
+            conn.execute('TRUNCATE jobs')
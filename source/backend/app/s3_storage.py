@@ -0,0 +1,133 @@
+"""S3-compatible tier behind the content-addressed upload storage.
+
+The local directory stays the working copy the pipeline reads. Blobs are
+copied to the bucket in the background once a job references them (multipart
+above ``multipart_threshold``) and fetched back when the local copy is
+missing, e.g. on another pod. boto3 is only imported when this backend is
+configured, so it is not a hard dependency.
+"""
+
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from .store import LocalFileStorage, StoredBlob
+
+logger = logging.getLogger(__name__)
+
+# S3 rejects multipart parts below 5 MiB (except the last one).
+MIN_PART_SIZE = 5 * 1024 * 1024
+_DOWNLOAD_CHUNK = 1024 * 1024
+
+
+def build_s3_client(endpoint_url: str | None = None, region: str | None = None) -> Any:
+    import boto3  # type: ignore
+
+    return boto3.client('s3', endpoint_url=endpoint_url or None, region_name=region or None)
+
+
+def _is_not_found(exc: Exception) -> bool:
+    response = getattr(exc, 'response', None) or {}
+    return str(response.get('Error', {}).get('Code')) in ('404', 'NoSuchKey', 'NotFound')
+
+
+class S3FileStorage(LocalFileStorage):
+    def __init__(
+        self,
+        base_dir: str,
+        client: Any,
+        bucket: str,
+        prefix: str = 'uploads/',
+        multipart_threshold: int = 8 * 1024 * 1024,
+        part_size: int = 8 * 1024 * 1024,
+        upload_workers: int = 2,
+    ) -> None:
+        super().__init__(base_dir)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+        self.multipart_threshold = multipart_threshold
+        self.part_size = max(MIN_PART_SIZE, part_size)
+        self._uploads = ThreadPoolExecutor(max_workers=upload_workers, thread_name_prefix='s3-upload')
+
+    def object_key(self, key: str) -> str:
+        return f'{self.prefix}{key[:2]}/{key[2:4]}/{key}'
+
+    def settle(self, blob: StoredBlob) -> None:
+        super().settle(blob)
+        # Duplicates are queued too: replicate() is a HEAD when the object exists, and it
+        # retries blobs whose first upload failed.
+        self._uploads.submit(self._replicate_logged, blob.key)
+
+    def _replicate_logged(self, key: str) -> None:
+        try:
+            self.replicate(key)
+        except Exception:
+            # The local copy is still served; the next settle of the same content retries.
+            logger.warning('Replicating blob %s to s3://%s failed', key, self.bucket, exc_info=True)
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self.object_key(key))
+        except Exception as exc:
+            if _is_not_found(exc):
+                return False
+            raise
+        return True
+
+    def replicate(self, key: str) -> bool:
+        """Upload blob ``key`` unless the bucket already has it; returns whether it uploaded."""
+        if self.exists(key):
+            return False
+        path = self.blob_path(key)
+        if path.stat().st_size <= self.multipart_threshold:
+            with path.open('rb') as fh:
+                self.client.put_object(Bucket=self.bucket, Key=self.object_key(key), Body=fh)
+        else:
+            self._multipart_upload(path, self.object_key(key))
+        return True
+
+    def _multipart_upload(self, path: Path, object_key: str) -> None:
+        upload_id = self.client.create_multipart_upload(Bucket=self.bucket, Key=object_key)['UploadId']
+        parts = []
+        try:
+            with path.open('rb') as fh:
+                while chunk := fh.read(self.part_size):
+                    number = len(parts) + 1
+                    response = self.client.upload_part(
+                        Bucket=self.bucket, Key=object_key, PartNumber=number, UploadId=upload_id, Body=chunk
+                    )
+                    parts.append({'ETag': response['ETag'], 'PartNumber': number})
+            self.client.complete_multipart_upload(
+                Bucket=self.bucket, Key=object_key, UploadId=upload_id, MultipartUpload={'Parts': parts}
+            )
+        except BaseException:
+            self.client.abort_multipart_upload(Bucket=self.bucket, Key=object_key, UploadId=upload_id)
+            raise
+
+    def local_path(self, key: str) -> Path:
+        path = self.blob_path(key)
+        if path.exists():
+            return path
+        try:
+            body = self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))['Body']
+        except Exception as exc:
+            if _is_not_found(exc):
+                raise FileNotFoundError(f'Blob {key} is neither local nor in s3://{self.bucket}') from exc
+            raise
+        temp = self.temp_path()
+        try:
+            with temp.open('wb') as fh:
+                for chunk in body.iter_chunks(_DOWNLOAD_CHUNK):
+                    fh.write(chunk)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp, path)
+        finally:
+            temp.unlink(missing_ok=True)
+        return path
+
+    def close(self) -> None:
+        """Wait for queued replications, then stop the upload threads."""
+        self._uploads.shutdown(wait=True)
@@ -15,7 +15,9 @@ class OCRResultItemSchema(BaseModel):
 class OCRExtractionResponse(BaseModel):
     items: list[OCRResultItemSchema]
     engine_available: bool
+    fallback_reason: str | None = None
     message: str
+    mode: str = 'full'
 
 
 class JobCreateResponse(BaseModel):
@@ -36,6 +38,13 @@ class JobStatusResponse(BaseModel):
     shape_proxy: dict[str, Any] | None = None
     error_message: str | None = None
     user_corrections: list[dict[str, Any]] | None = None
+    stage_timings_ms: dict[str, float] | None = None
+    views: dict[str, dict[str, Any]] | None = None
+
+
+class JobListResponse(BaseModel):
+    items: list[dict[str, Any]] = Field(default_factory=list)
+    next_cursor: str | None = None
 
 
 class GeometryOutput(BaseModel):
@@ -47,6 +56,99 @@ class GeometryOutput(BaseModel):
     quality_metrics: dict[str, Any] | None = None
     error_message: str | None = None
     source_type: str = 'image'
+    mesh_url: str | None = None
+
+
+class CalibrationProfileResponse(BaseModel):
+    profile: str
+    mm_per_px: float
+    confidence: float
+    reference_bbox: list[int] | None = None
+    image_size: list[int] | None = None
+
+
+class PackagingContainer(BaseModel):
+    code: str
+    kind: str
+    inner_mm: list[float]
+    outer_mm: list[float]
+
+
+class PackagingFitResponse(BaseModel):
+    catalogue: str
+    shape_family: str | None = None
+    required_mm: list[float]
+    container: PackagingContainer | None = None
+    fill_ratio: float | None = None
+
+
+class PackagingDimensions(BaseModel):
+    width: float = Field(gt=0)
+    depth: float = Field(gt=0)
+    height: float = Field(gt=0)
+
+
+class CasePackItem(BaseModel):
+    sku: str
+    # Either a job whose dimensions and shape family are used, or explicit dimensions.
+    job_id: str | None = None
+    dimensions_mm: PackagingDimensions | None = None
+    shape_family: str | None = None
+    # Units per case; omitted picks the case that packs densest.
+    units: int | None = Field(default=None, ge=1)
+
+
+class CasePackRequest(BaseModel):
+    items: list[CasePackItem] = Field(min_length=1)
+
+
+class CasePackLayout(BaseModel):
+    case: PackagingContainer
+    unit_mm: list[float]
+    grid: list[int]
+    units_per_case: int
+    capacity: int
+    fill_ratio: float
+
+
+class CasePackResult(BaseModel):
+    sku: str
+    job_id: str | None = None
+    fit: PackagingFitResponse | None = None
+    layout: CasePackLayout | None = None
+    error_message: str | None = None
+
+
+class CasePackResponse(BaseModel):
+    catalogue: str
+    results: list[CasePackResult] = Field(default_factory=list)
+
+
+class BatchCreateResponse(BaseModel):
+    batch_id: str
+    job_ids: list[str]
+    total: int
+
+
+class BatchJobStatus(BaseModel):
+    job_id: str
+    filename: str
+    status: str
+    error_message: str | None = None
+
+
+class BatchStatusResponse(BaseModel):
+    batch_id: str
+    total: int
+    completed: int
+    progress: float
+    status_counts: dict[str, int] = Field(default_factory=dict)
+    jobs: list[BatchJobStatus] = Field(default_factory=list)
+
+
+class BatchResultsResponse(BaseModel):
+    batch_id: str
+    results: list[GeometryOutput] = Field(default_factory=list)
 
 
 class DimensionPatchRequest(BaseModel):
@@ -76,3 +178,6 @@ class OCRMapDimensionsResponse(BaseModel):
     mapped_dimensions_mm: dict[str, float] = Field(default_factory=dict)
     mapping_items: list[DimensionMappingItem] = Field(default_factory=list)
     warnings: list[str] = Field(default_factory=list)
+    # Only set when the items were extracted from an uploaded file.
+    engine_available: bool | None = None
+    fallback_reason: str | None = None
@@ -2,25 +2,17 @@ from __future__ import annotations
 
 from typing import Any
 
+# Bump when shape proxy/dimension/quality computations change so cached results are invalidated.
+SHAPE_ENGINE_VERSION = '4'
+# Used when a frame has no calibration (no reference, profile or mask).
+DEFAULT_MM_PER_PX = 0.2
+
 
 def _clamp(value: float, low: float, high: float) -> float:
     return max(low, min(high, value))
 
 
-def build_shape_proxy(preprocess: dict[str, Any], segment: dict[str, Any]) -> dict[str, Any]:
-    width_px = int(preprocess.get('width') or 0)
-    height_px = int(preprocess.get('height') or 0)
-    mask_width = int(segment.get('mask_width') or 0)
-    mask_height = int(segment.get('mask_height') or 0)
-    fg_ratio = float(segment.get('foreground_ratio') or 0.0)
-
-    if width_px <= 0 or height_px <= 0:
-        aspect_ratio = 1.0
-    else:
-        aspect_ratio = round(width_px / height_px, 4)
-
-    fill_ratio = round(_clamp(fg_ratio, 0.0, 1.0), 4)
-
+def classify_shape(aspect_ratio: float, fill_ratio: float) -> tuple[str, str]:
     if 0.9 <= aspect_ratio <= 1.1:
         shape_family = 'cylindrical-like'
     elif aspect_ratio > 1.1:
@@ -34,26 +26,48 @@ def build_shape_proxy(preprocess: dict[str, Any], segment: dict[str, Any]) -> di
         compactness = 'medium'
     else:
         compactness = 'high'
+    return shape_family, compactness
 
-    return {
-        'shape_family': shape_family,
-        'compactness': compactness,
-        'aspect_ratio': aspect_ratio,
-        'fill_ratio': fill_ratio,
+
+def build_shape_proxy(segment: dict[str, Any], dimensions_mm: dict[str, float]) -> dict[str, Any]:
+    fg_ratio = float(segment.get('foreground_ratio') or 0.0)
+    base = {
+        'fill_ratio': round(_clamp(fg_ratio, 0.0, 1.0), 4),
         'mask_resolution': {
-            'width': mask_width,
-            'height': mask_height,
+            'width': int(segment.get('mask_width') or 0),
+            'height': int(segment.get('mask_height') or 0),
         },
     }
-
-
-def compute_dimensions(preprocess: dict[str, Any], segment: dict[str, Any]) -> dict[str, float]:
-    # MVP assumption: fixed calibration factor (mm per pixel).
-    mm_per_px = 0.2
-
-    width_px = float(preprocess.get('width') or 0)
-    height_px = float(preprocess.get('height') or 0)
-    fg_ratio = _clamp(float(segment.get('foreground_ratio') or 0.0), 0.0, 1.0)
+    return shape_proxy_for_dimensions(base, dimensions_mm)
+
+
+def shape_proxy_for_dimensions(shape_proxy: dict[str, Any], dimensions_mm: dict[str, float]) -> dict[str, Any]:
+    # The family follows the object's measured (or corrected) width/height; the fill ratio is the mask's.
+    # The pipeline and dimension corrections both classify here, so equal dimensions give an equal proxy.
+    height = float(dimensions_mm.get('height') or 0.0)
+    aspect_ratio = round(float(dimensions_mm.get('width') or 0.0) / height, 4) if height > 0 else 1.0
+    shape_family, compactness = classify_shape(aspect_ratio, float(shape_proxy.get('fill_ratio') or 0.0))
+    return {**shape_proxy, 'shape_family': shape_family, 'compactness': compactness, 'aspect_ratio': aspect_ratio}
+
+
+def compute_dimensions(
+    preprocess: dict[str, Any],
+    segment: dict[str, Any],
+    calibration: dict[str, Any] | None = None,
+) -> dict[str, float]:
+    # With calibration the segmented object's extents are measured; otherwise the whole canvas.
+    calibration = calibration or {}
+    mm_per_px = float(calibration.get('mm_per_px') or DEFAULT_MM_PER_PX)
+    object_bbox = calibration.get('object_bbox')
+
+    if object_bbox:
+        width_px = float(object_bbox[2] - object_bbox[0])
+        height_px = float(object_bbox[3] - object_bbox[1])
+        fg_ratio = _clamp(float(calibration.get('object_fill_ratio') or 0.0), 0.0, 1.0)
+    else:
+        width_px = float(preprocess.get('width') or 0)
+        height_px = float(preprocess.get('height') or 0)
+        fg_ratio = _clamp(float(segment.get('foreground_ratio') or 0.0), 0.0, 1.0)
 
     width_mm = round(max(width_px * mm_per_px, 0.0), 2)
     height_mm = round(max(height_px * mm_per_px, 0.0), 2)
@@ -67,7 +81,11 @@ def compute_dimensions(preprocess: dict[str, Any], segment: dict[str, Any]) -> d
     }
 
 
-def compute_quality_metrics(preprocess: dict[str, Any], segment: dict[str, Any]) -> dict[str, Any]:
+def compute_quality_metrics(
+    preprocess: dict[str, Any],
+    segment: dict[str, Any],
+    calibration: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     width = preprocess.get('width')
     height = preprocess.get('height')
     has_geometry = bool(width and height and width > 0 and height > 0)
@@ -75,7 +93,10 @@ def compute_quality_metrics(preprocess: dict[str, Any], segment: dict[str, Any])
     fg_ratio = _clamp(float(segment.get('foreground_ratio') or 0.0), 0.0, 1.0)
     seg_confidence = _clamp(float(segment.get('confidence') or 0.0), 0.0, 1.0)
 
-    calibration_reliability = 0.7 if has_geometry else 0.2
+    if calibration and calibration.get('method') in ('reference', 'profile'):
+        calibration_reliability = _clamp(float(calibration.get('confidence') or 0.0), 0.0, 1.0)
+    else:
+        calibration_reliability = 0.7 if has_geometry else 0.2
     edge_stability = round(1.0 - abs(fg_ratio - 0.5) * 1.4, 4)
     edge_stability = _clamp(edge_stability, 0.0, 1.0)
 
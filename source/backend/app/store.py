@@ -1,12 +1,22 @@
-from dataclasses import dataclass
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, fields as dataclass_fields, replace
 from datetime import datetime, timezone
+from heapq import merge
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Collection, Iterator, NamedTuple
+from uuid import uuid4
+import json
+import os
+import sys
 import threading
+import time
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class JobMeta:
+    """One job record. Records are immutable: stores publish a new record per write."""
+
     job_id: str
     status: str
     filename: str
@@ -14,52 +24,504 @@ class JobMeta:
     size: int
     file_path: str
     created_at: datetime
+    content_sha256: str | None = None
+    batch_id: str | None = None
+    batch_seq: int | None = None
     quality_metrics: dict[str, Any] | None = None
     dimensions_mm: dict[str, float] | None = None
     volume_mm3: float | None = None
     shape_proxy: dict[str, Any] | None = None
     error_message: str | None = None
     user_corrections: list[dict[str, Any]] | None = None
+    stage_timings_ms: dict[str, float] | None = None
+    # Multi-view jobs: view name -> uploaded input (sha256, filename, content_type, size, path).
+    views: dict[str, dict[str, Any]] | None = None
 
 
-class InMemoryJobStore:
+_FIELD_NAMES = tuple(f.name for f in dataclass_fields(JobMeta))
+_FIELD_NAME_SET = frozenset(_FIELD_NAMES)
+TERMINAL_STATUSES = frozenset({'processed', 'failed'})
+
+# Called as listener(job_id, new_status) after a status transition is stored.
+JobStatusListener = Callable[[str, str], None]
+
+# Listing order is newest first on (created_at, job_id); the pair doubles as the page cursor.
+JobKey = tuple[datetime, str]
+INDEXED_FIELDS = ('status', 'content_type', 'shape_family')
+
+
+def job_key(meta: JobMeta) -> JobKey:
+    return (meta.created_at, meta.job_id)
+
+
+def _index_values(meta: JobMeta) -> tuple[str | None, ...]:
+    shape_family = (meta.shape_proxy or {}).get('shape_family')
+    return (meta.status, meta.content_type, shape_family)
+
+
+def _iter_desc(keys: list[JobKey], lower: JobKey | None, upper: JobKey | None) -> Iterator[JobKey]:
+    # Keys in [lower, upper), newest first; ``keys`` is sorted ascending.
+    start = bisect_left(keys, upper) if upper is not None else len(keys)
+    stop = bisect_left(keys, lower) if lower is not None else 0
+    for position in range(start - 1, stop - 1, -1):
+        yield keys[position]
+
+
+class _OrderedIndex:
+    """Secondary index: value -> job keys sorted by (created_at, job_id)."""
+
     def __init__(self) -> None:
+        self._keys: dict[str, list[JobKey]] = {}
+
+    def add(self, value: str | None, key: JobKey) -> None:
+        if value is not None:
+            insort(self._keys.setdefault(value, []), key)
+
+    def discard(self, value: str | None, key: JobKey) -> None:
+        keys = self._keys.get(value) if value is not None else None
+        if not keys:
+            return
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+        if not keys:
+            del self._keys[value]
+
+    def size(self, values: Collection[str]) -> int:
+        return sum(len(self._keys.get(value, ())) for value in values)
+
+    def counts(self) -> dict[str, int]:
+        return {value: len(keys) for value, keys in self._keys.items()}
+
+    def iter_desc(self, values: Collection[str], lower: JobKey | None, upper: JobKey | None) -> Iterator[JobKey]:
+        runs = [_iter_desc(self._keys[value], lower, upper) for value in values if value in self._keys]
+        return merge(*runs, reverse=True)
+
+
+def _deep_sizeof(value: Any) -> int:
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_sizeof(key) + _deep_sizeof(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_deep_sizeof(item) for item in value)
+    return size
+
+
+def record_size(meta: JobMeta) -> int:
+    """Estimated bytes held by ``meta``; shared objects such as interned keys are counted each time."""
+    return sys.getsizeof(meta) + sum(_deep_sizeof(getattr(meta, name)) for name in _FIELD_NAMES)
+
+
+class JobSpill:
+    """Evicted job records kept on disk as one JSON file per job.
+
+    The directory belongs to one store instance and is emptied when the store
+    is created, like the in-memory records it backs.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.clear()
+
+    def _path(self, job_id: str) -> Path | None:
+        # Job ids reach us from URLs; anything that is not a plain file name cannot be ours.
+        if not job_id or Path(job_id).name != job_id:
+            return None
+        return self.directory / f'{job_id}.json'
+
+    def write(self, meta: JobMeta) -> None:
+        path = self._path(meta.job_id)
+        record = asdict(meta)
+        record['created_at'] = meta.created_at.isoformat()
+        temp = self.directory / f'.tmp-{uuid4().hex}'
+        temp.write_text(json.dumps(record, separators=(',', ':')))
+        os.replace(temp, path)
+        self.count += 1
+
+    def read(self, job_id: str) -> JobMeta | None:
+        path = self._path(job_id)
+        try:
+            record = json.loads(path.read_text()) if path is not None else None
+        except FileNotFoundError:
+            return None
+        if record is None:
+            return None
+        record['created_at'] = datetime.fromisoformat(record['created_at'])
+        return JobMeta(**record)
+
+    def delete(self, job_id: str) -> None:
+        path = self._path(job_id)
+        if path is not None and path.exists():
+            path.unlink()
+            self.count -= 1
+
+    def clear(self) -> None:
+        for path in self.directory.glob('*.json'):
+            path.unlink(missing_ok=True)
+        self.count = 0
+
+
+class InMemoryJobStore:
+    """Jobs held in process memory.
+
+    ``max_jobs`` and ``max_bytes`` (0 = unlimited) bound the store: once
+    either is exceeded, completed jobs are evicted least recently used
+    first, and ``ttl_seconds`` evicts completed jobs not read or written for
+    that long. Queued and processing jobs are never evicted, so the bounds
+    can be overshot while they are all in flight. With ``spill_dir`` evicted
+    jobs move to disk: ``get`` and ``list_by_batch`` still return them and
+    writes bring them back into memory. Listings and status counts only see
+    jobs in memory.
+
+    Writes are serialised by one lock and publish a new immutable record
+    (copy-on-write), so ``get`` and ``list_by_batch`` read without locking
+    and never wait behind a pipeline write. Listings walk the shared
+    indexes and still take the lock.
+    """
+
+    def __init__(
+        self,
+        max_jobs: int = 0,
+        max_bytes: int = 0,
+        ttl_seconds: float = 0.0,
+        spill_dir: str | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_jobs = max(0, int(max_jobs))
+        self.max_bytes = max(0, int(max_bytes))
+        self.ttl_seconds = max(0.0, float(ttl_seconds))
+        self._clock = clock
+        self._spill = JobSpill(spill_dir) if spill_dir else None
         self._jobs: dict[str, JobMeta] = {}
+        self._batches: dict[str, list[str]] = {}
+        self._created: list[JobKey] = []
+        self._indexes = {field: _OrderedIndex() for field in INDEXED_FIELDS}
+        self._sizes: dict[str, int] = {}
+        self._bytes = 0
+        # Completed job id -> last access time, least recently used first.
+        self._completed: OrderedDict[str, float] = OrderedDict()
+        self.evictions = 0
+        self._bounded = bool(self.max_jobs or self.max_bytes or self.ttl_seconds)
+        self._listeners: list[JobStatusListener] = []
         self._lock = threading.Lock()
 
+    def add_listener(self, listener: JobStatusListener) -> None:
+        self._listeners.append(listener)
+
+    def close(self) -> None:
+        pass
+
+    def _index(self, meta: JobMeta) -> None:
+        key = job_key(meta)
+        insort(self._created, key)
+        for index, value in zip(self._indexes.values(), _index_values(meta)):
+            index.add(value, key)
+
+    def _unindex(self, meta: JobMeta) -> None:
+        key = job_key(meta)
+        position = bisect_left(self._created, key)
+        if position < len(self._created) and self._created[position] == key:
+            del self._created[position]
+        for index, value in zip(self._indexes.values(), _index_values(meta)):
+            index.discard(value, key)
+
+    def _track(self, job: JobMeta) -> None:
+        # Refresh size accounting and LRU position after ``job`` was written.
+        size = record_size(job)
+        self._bytes += size - self._sizes.get(job.job_id, 0)
+        self._sizes[job.job_id] = size
+        if job.status in TERMINAL_STATUSES:
+            self._completed[job.job_id] = self._clock()
+            self._completed.move_to_end(job.job_id)
+        else:
+            self._completed.pop(job.job_id, None)
+
+    def _forget(self, job: JobMeta) -> None:
+        self._unindex(job)
+        self._bytes -= self._sizes.pop(job.job_id, 0)
+        self._completed.pop(job.job_id, None)
+
+    def _evict(self, job_id: str) -> None:
+        # Spill before dropping the in-memory record so lock-free readers always find one of the two.
+        job = self._jobs[job_id]
+        if self._spill is not None:
+            self._spill.write(job)
+        del self._jobs[job_id]
+        self._forget(job)
+        if self._spill is None and job.batch_id is not None:
+            self._remove_from_batch(job)
+        self.evictions += 1
+
+    def _enforce_limits(self) -> None:
+        if self.ttl_seconds > 0:
+            cutoff = self._clock() - self.ttl_seconds
+            while self._completed:
+                job_id, last_access = next(iter(self._completed.items()))
+                if last_access > cutoff:
+                    break
+                self._evict(job_id)
+        while self._completed and (
+            (self.max_jobs and len(self._jobs) > self.max_jobs) or (self.max_bytes and self._bytes > self.max_bytes)
+        ):
+            self._evict(next(iter(self._completed)))
+
+    def _restore(self, job_id: str) -> JobMeta | None:
+        job = self._jobs.get(job_id)
+        if job is not None or self._spill is None:
+            return job
+        job = self._spill.read(job_id)
+        if job is not None:
+            self._jobs[job_id] = job
+            self._spill.delete(job_id)
+            self._index(job)
+        return job
+
+    def _remove_from_batch(self, job: JobMeta) -> None:
+        batch = self._batches.get(job.batch_id, [])
+        if job.job_id in batch:
+            batch.remove(job.job_id)
+        if not batch:
+            self._batches.pop(job.batch_id, None)
+
     def create(self, meta: JobMeta) -> None:
         with self._lock:
+            previous = self._jobs.get(meta.job_id)
+            if previous is not None:
+                self._forget(previous)
             self._jobs[meta.job_id] = meta
+            self._index(meta)
+            if meta.batch_id is not None:
+                self._batches.setdefault(meta.batch_id, []).append(meta.job_id)
+            self._track(meta)
+            self._enforce_limits()
+
+    def _touch(self, job_id: str) -> None:
+        # Reads refresh the LRU position only when the write lock is free; a read
+        # skipped under contention just makes eviction order slightly stale.
+        if self._bounded and job_id in self._completed and self._lock.acquire(blocking=False):
+            try:
+                if job_id in self._completed:
+                    self._completed[job_id] = self._clock()
+                    self._completed.move_to_end(job_id)
+            finally:
+                self._lock.release()
+
+    def _read(self, job_id: str) -> JobMeta | None:
+        job = self._jobs.get(job_id)
+        if job is None and self._spill is not None:
+            # A concurrent restore may move the record back between the two lookups.
+            job = self._spill.read(job_id) or self._jobs.get(job_id)
+        return job
+
+    def _replace(self, current: JobMeta, changes: dict[str, Any]) -> JobMeta:
+        job = replace(current, **changes)
+        self._jobs[job.job_id] = job
+        if job_key(job) != job_key(current) or _index_values(job) != _index_values(current):
+            self._unindex(current)
+            self._index(job)
+        self._track(job)
+        self._enforce_limits()
+        return job
 
     def get(self, job_id: str) -> JobMeta | None:
-        with self._lock:
-            return self._jobs.get(job_id)
+        job = self._read(job_id)
+        if job is not None:
+            self._touch(job_id)
+        return job
+
+    def list_by_batch(self, batch_id: str) -> list[JobMeta]:
+        jobs = (self._read(job_id) for job_id in list(self._batches.get(batch_id, ())))
+        return [job for job in jobs if job is not None]
 
     def update(self, job_id: str, **fields: Any) -> JobMeta | None:
+        """Apply ``fields`` and return the resulting record; unknown fields are ignored."""
+        changes = {key: value for key, value in fields.items() if key in _FIELD_NAME_SET}
         with self._lock:
-            job = self._jobs.get(job_id)
-            if job is None:
+            current = self._restore(job_id)
+            if current is None:
                 return None
-            for key, value in fields.items():
-                if hasattr(job, key):
-                    setattr(job, key, value)
-            return job
+            job = self._replace(current, changes)
+        if job.status != current.status:
+            for listener in self._listeners:
+                listener(job_id, job.status)
+        return job
+
+    def append_correction(self, job_id: str, record: dict[str, Any]) -> None:
+        with self._lock:
+            current = self._restore(job_id)
+            if current is not None:
+                self._replace(current, {'user_corrections': [*(current.user_corrections or []), record]})
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+            if job is not None:
+                self._forget(job)
+            elif self._spill is not None:
+                job = self._spill.read(job_id)
+            if self._spill is not None:
+                self._spill.delete(job_id)
+            if job is not None and job.batch_id is not None:
+                self._remove_from_batch(job)
+
+    def memory_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                'jobs': len(self._jobs),
+                'completed': len(self._completed),
+                'bytes': self._bytes,
+                'max_jobs': self.max_jobs,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'evictions': self.evictions,
+                'spilled': self._spill.count if self._spill is not None else 0,
+            }
+
+    def count_by_status(self) -> dict[str, int]:
+        with self._lock:
+            return self._indexes['status'].counts()
+
+    def list_jobs(
+        self,
+        *,
+        status: Collection[str] | None = None,
+        content_type: Collection[str] | None = None,
+        shape_family: Collection[str] | None = None,
+        created_from: datetime | None = None,
+        created_to: datetime | None = None,
+        before: JobKey | None = None,
+        limit: int = 50,
+        fields: Collection[str] | None = None,
+    ) -> list[JobMeta]:
+        """Jobs newest first, optionally strictly older than the ``before`` cursor.
+
+        Equality filters match any of the given values; ``created_from`` is
+        inclusive and ``created_to`` exclusive. The most selective filter's
+        index drives the walk and the others are checked per candidate, so a
+        page costs O(log n + scanned) rather than a scan of every job.
+        ``fields`` is accepted for interface parity with the Postgres store.
+        """
+        filters = {
+            field: frozenset(values)
+            for field, values in zip(INDEXED_FIELDS, (status, content_type, shape_family))
+            if values is not None
+        }
+        lower = (created_from, '') if created_from is not None else None
+        uppers = [key for key in ((created_to, '') if created_to is not None else None, before) if key is not None]
+        upper = min(uppers) if uppers else None
+
+        with self._lock:
+            if filters:
+                driver = min(filters, key=lambda field: self._indexes[field].size(filters[field]))
+                keys = self._indexes[driver].iter_desc(filters[driver], lower, upper)
+            else:
+                keys = _iter_desc(self._created, lower, upper)
+
+            positions = [INDEXED_FIELDS.index(field) for field in filters]
+            wanted = list(filters.values())
+            page: list[JobMeta] = []
+            for _, job_id in keys:
+                job = self._jobs[job_id]
+                values = _index_values(job)
+                if all(values[position] in allowed for position, allowed in zip(positions, wanted)):
+                    page.append(job)
+                    if len(page) >= limit:
+                        break
+            return page
 
     def clear(self) -> None:
         with self._lock:
             self._jobs.clear()
+            self._batches.clear()
+            self._created.clear()
+            self._indexes = {field: _OrderedIndex() for field in INDEXED_FIELDS}
+            self._sizes.clear()
+            self._bytes = 0
+            self._completed.clear()
+            self.evictions = 0
+            if self._spill is not None:
+                self._spill.clear()
+
+
+class StoredBlob(NamedTuple):
+    key: str
+    path: str
+    # True when this commit wrote the blob, False when it matched an existing one.
+    created: bool
 
 
 class LocalFileStorage:
+    """Content-addressed upload storage: one file per SHA-256 under ``ab/cd/<sha256>``.
+
+    Uploads are streamed to a private temp file and then committed under
+    their hash, so identical uploads share one blob and job records point at
+    it. A committed blob is pending until the request either ``settle``s it
+    (a job now references it) or ``discard``s it on rollback. Discarding only
+    deletes a blob this request created and nobody else committed since:
+    other commits in this process are counted, and a commit from another
+    process refreshes the blob's mtime, which the discard checks.
+    """
+
     def __init__(self, base_dir: str) -> None:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
+        # Blobs created by a still-pending commit: key -> [pending commits, mtime_ns at creation].
+        self._fresh: dict[str, list[int]] = {}
+        self._lock = threading.Lock()
+
+    def temp_path(self) -> Path:
+        return self.base_dir / f".tmp-{uuid4().hex}"
+
+    def blob_path(self, key: str) -> Path:
+        return self.base_dir / key[:2] / key[2:4] / key
+
+    def local_path(self, key: str) -> Path:
+        """A readable local file for blob ``key``."""
+        return self.blob_path(key)
+
+    def commit(self, temp: Path, key: str) -> StoredBlob:
+        """Move ``temp`` into the blob for ``key``, or drop it if that blob exists. Blocking."""
+        destination = self.blob_path(key)
+        with self._lock:
+            if destination.exists():
+                temp.unlink(missing_ok=True)
+                os.utime(destination)
+                if key in self._fresh:
+                    self._fresh[key][0] += 1
+                return StoredBlob(key, str(destination), False)
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp, destination)
+            self._fresh[key] = [1, destination.stat().st_mtime_ns]
+        return StoredBlob(key, str(destination), True)
+
+    def settle(self, blob: StoredBlob) -> None:
+        if blob.created:
+            with self._lock:
+                self._fresh.pop(blob.key, None)
+
+    def discard(self, blob: StoredBlob) -> None:
+        with self._lock:
+            fresh = self._fresh.get(blob.key)
+            if fresh is None:
+                return
+            fresh[0] -= 1
+            if not blob.created:
+                return
+            del self._fresh[blob.key]
+            path = Path(blob.path)
+            try:
+                unchanged = path.stat().st_mtime_ns == fresh[1]
+            except FileNotFoundError:
+                return
+            if fresh[0] == 0 and unchanged:
+                path.unlink()
+
+    def delete(self, file_path: str) -> None:
+        Path(file_path).unlink(missing_ok=True)
 
-    def save(self, job_id: str, filename: str, content: bytes) -> str:
-        suffix = Path(filename).suffix
-        destination = self.base_dir / f"{job_id}{suffix}"
-        destination.write_bytes(content)
-        return str(destination)
+    def close(self) -> None:
+        pass
 
 
 def utcnow() -> datetime:
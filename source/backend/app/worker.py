@@ -0,0 +1,178 @@
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, NamedTuple
+import threading
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class JobWorkerPool:
+    """Bounded worker pool for pipeline jobs.
+
+    At most ``max_workers`` jobs run concurrently and at most ``max_queue``
+    more wait for a free worker; further submissions raise ``QueueFullError``
+    so the API can apply backpressure instead of buffering without limit.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='job-worker')
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def submit(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise QueueFullError('Job queue is full')
+        return self._submit_acquired(fn, *args, **kwargs)
+
+    def submit_blocking(
+        self, fn: Callable[..., Any], *args: Any, timeout: float | None = None, **kwargs: Any
+    ) -> Future:
+        """Like ``submit`` but waits up to ``timeout`` seconds for a free slot."""
+        if not self._slots.acquire(timeout=timeout):
+            raise QueueFullError('Job queue is full')
+        return self._submit_acquired(fn, *args, **kwargs)
+
+    def _submit_acquired(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        with self._lock:
+            self._in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(lambda _: self._release())
+        return future
+
+    def _release(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+        self._slots.release()
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return self._in_flight
+
+    @property
+    def is_full(self) -> bool:
+        return self.in_flight >= self.max_workers + self.max_queue
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+class _PendingJob(NamedTuple):
+    job_id: str
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    future: Future
+
+
+class BatchDispatcher:
+    """Single owner that feeds admitted batch jobs into a ``JobWorkerPool``.
+
+    Batches are admitted all-or-nothing against a backlog of at most
+    ``max_backlog`` jobs (``QueueFullError`` otherwise). One thread moves them
+    into the pool as worker slots free up. Jobs that could not be handed to the
+    pool, or are still waiting at shutdown, are reported to ``on_abandon``.
+    """
+
+    _POLL_SECONDS = 0.1
+
+    def __init__(
+        self,
+        pool: JobWorkerPool,
+        max_backlog: int,
+        on_abandon: Callable[[str, BaseException], None],
+    ) -> None:
+        self.max_backlog = max(1, int(max_backlog))
+        self._pool = pool
+        self._on_abandon = on_abandon
+        self._backlog: deque[_PendingJob] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def admit(self, jobs: list[tuple[str, Callable[..., Any], tuple[Any, ...]]]) -> list[Future]:
+        """Queue ``(job_id, fn, args)`` items; each future resolves when its job finishes."""
+        pending = [_PendingJob(job_id, fn, args, Future()) for job_id, fn, args in jobs]
+        with self._cond:
+            if self._closed:
+                raise QueueFullError('Dispatcher is shut down')
+            if len(self._backlog) + len(pending) > self.max_backlog:
+                raise QueueFullError('Batch backlog is full')
+            self._backlog.extend(pending)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='batch-dispatcher', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return [job.future for job in pending]
+
+    @property
+    def backlog(self) -> int:
+        with self._cond:
+            return len(self._backlog)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._backlog and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                job = self._backlog[0]
+
+            try:
+                inner = self._pool.submit_blocking(job.fn, *job.args, timeout=self._POLL_SECONDS)
+            except QueueFullError:
+                continue
+            except Exception as exc:
+                with self._cond:
+                    self._remove(job)
+                self._abandon(job, exc)
+                continue
+
+            with self._cond:
+                self._remove(job)
+            inner.add_done_callback(lambda done, job=job: _copy_outcome(done, job.future))
+
+    def _remove(self, job: _PendingJob) -> None:
+        if self._backlog and self._backlog[0] is job:
+            self._backlog.popleft()
+
+    def _abandon(self, job: _PendingJob, exc: BaseException) -> None:
+        try:
+            self._on_abandon(job.job_id, exc)
+        finally:
+            job.future.set_exception(exc)
+
+    def shutdown(self) -> None:
+        """Stop dispatching and abandon every job that never reached the pool."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join()
+        with self._cond:
+            abandoned = list(self._backlog)
+            self._backlog.clear()
+        for job in abandoned:
+            self._abandon(job, RuntimeError('Service shut down before the job was dispatched'))
+
+
+def _copy_outcome(source: Future, target: Future) -> None:
+    exc = source.exception()
+    if exc is not None:
+        target.set_exception(exc)
+    else:
+        target.set_result(source.result())
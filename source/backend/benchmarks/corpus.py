@@ -0,0 +1,90 @@
+"""Deterministic synthetic corpus for the pipeline benchmarks.
+
+Images are product-like shots (light backdrop, dark rounded package with a
+label band and sensor noise) so segmentation does representative work.
+"""
+
+import io
+from dataclasses import dataclass
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+FORMATS = ('png', 'jpeg', 'gif', 'webp')
+RESOLUTIONS = ((320, 240), (1024, 768), (2048, 1536))
+_PIL_FORMATS = {'png': 'PNG', 'jpeg': 'JPEG', 'gif': 'GIF', 'webp': 'WEBP'}
+_CONTENT_TYPES = {'png': 'image/png', 'jpeg': 'image/jpeg', 'gif': 'image/gif', 'webp': 'image/webp'}
+
+
+@dataclass(frozen=True)
+class CorpusImage:
+    name: str
+    format: str
+    width: int
+    height: int
+    data: bytes
+
+    @property
+    def content_type(self) -> str:
+        return _CONTENT_TYPES[self.format]
+
+
+def render_product(width: int, height: int, seed: int) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    image = Image.new('RGB', (width, height), (236, 236, 232))
+    draw = ImageDraw.Draw(image)
+    box_w = int(width * rng.uniform(0.3, 0.5))
+    box_h = int(height * rng.uniform(0.5, 0.8))
+    x0 = int((width - box_w) * rng.uniform(0.3, 0.7))
+    y0 = int((height - box_h) * rng.uniform(0.3, 0.7))
+    draw.rounded_rectangle((x0, y0, x0 + box_w, y0 + box_h), radius=max(2, box_w // 8), fill=(52, 60, 88))
+    band_y = y0 + box_h // 3
+    draw.rectangle((x0, band_y, x0 + box_w, band_y + box_h // 6), fill=(214, 190, 140))
+
+    pixels = np.asarray(image, dtype=np.int16)
+    noise = rng.normal(0, 4, pixels.shape).astype(np.int16)
+    return Image.fromarray(np.clip(pixels + noise, 0, 255).astype(np.uint8))
+
+
+def encode(image: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    if fmt == 'gif':
+        image = image.convert('P', palette=Image.Palette.ADAPTIVE)
+    kwargs = {'quality': 85} if fmt in ('jpeg', 'webp') else {}
+    image.save(buffer, format=_PIL_FORMATS[fmt], **kwargs)
+    return buffer.getvalue()
+
+
+def generate_corpus(
+    seed: int = 0,
+    formats: tuple[str, ...] = FORMATS,
+    resolutions: tuple[tuple[int, int], ...] = RESOLUTIONS,
+) -> list[CorpusImage]:
+    corpus = []
+    for index, (width, height) in enumerate(resolutions):
+        image = render_product(width, height, seed + index)
+        for fmt in formats:
+            corpus.append(CorpusImage(f'{fmt}-{width}x{height}', fmt, width, height, encode(image, fmt)))
+    return corpus
+
+
+# OCR fixtures: raw label text for the extractor's text path and pre-split items for the mapper.
+OCR_TEXT_FIXTURES = (
+    b'W: 48.8 H: 27.9mm D: 13 mm',
+    b'Size 120 x 45 x 45 mm  Net 150ml  v1.2.3',
+    b'Dia 38mm Height 112 mm Batch 20240107',
+)
+
+OCR_ITEM_FIXTURES = (
+    [
+        {'text': 'W 48.8 mm', 'confidence': 0.92},
+        {'text': 'H 27.9 mm', 'confidence': 0.88},
+        {'text': 'D 13 mm', 'confidence': 0.81},
+    ],
+    [{'text': '120 x 45 x 45 mm', 'confidence': 0.9}, {'text': 'Net 150ml', 'confidence': 0.7}],
+    [
+        {'text': 'Dia 3.8 cm', 'confidence': 0.85},
+        {'text': 'Height 112 mm', 'confidence': 0.9},
+        {'text': 'width 1.5 in', 'confidence': 0.5},
+    ],
+)
@@ -0,0 +1,239 @@
+"""Pipeline and API benchmarks.
+
+Usage (from ``source/backend``)::
+
+    python -m benchmarks.run --output bench.json
+    python -m benchmarks.run --output bench.json --baseline benchmarks/baseline.json --threshold 0.2
+
+Latency entries report milliseconds (lower is better) and the ``api.*``
+entries also report requests/sec (higher is better). With ``--baseline`` the
+run exits with status 1 when any shared entry regressed by more than
+``--threshold`` (a fraction, 0.2 = 20%).
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+
+from app import main
+from app.cache import ResultCache
+from app.dimension_mapper import coerce_ocr_items, map_dimensions
+from app.image_header import sniff_format
+from app.image_pipeline import _parse_dimensions, preprocess_image, segment_image
+from app.ocr_engine import extract_dimension_candidates
+from app.shape_engine import build_shape_proxy, compute_dimensions, compute_quality_metrics
+from app.store import LocalFileStorage
+
+from .corpus import OCR_ITEM_FIXTURES, OCR_TEXT_FIXTURES, RESOLUTIONS, CorpusImage, generate_corpus
+
+# Latency fields compared against a baseline; throughput fields regress when they drop.
+# p95 is reported but not gated: on shared runners it mostly measures neighbours.
+LATENCY_FIELDS = ('p50_ms',)
+THROUGHPUT_FIELDS = ('requests_per_sec',)
+# Fast calls are looped until one sample lasts this long, so timer overhead does not dominate.
+_MIN_SAMPLE_SECONDS = 0.002
+# Latency changes smaller than this are below timer resolution and never count as regressions.
+_NOISE_FLOOR_MS = 0.01
+
+
+def _percentile(sorted_samples: list[float], fraction: float) -> float:
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+
+def summarise(samples: list[float]) -> dict[str, float]:
+    """Summarise per-call durations (seconds) as millisecond statistics."""
+    ordered = sorted(samples)
+    mean = statistics.fmean(ordered)
+    return {
+        'count': len(ordered),
+        'mean_ms': round(mean * 1000, 6),
+        'p50_ms': round(_percentile(ordered, 0.5) * 1000, 6),
+        'p95_ms': round(_percentile(ordered, 0.95) * 1000, 6),
+        'min_ms': round(ordered[0] * 1000, 6),
+        'ops_per_sec': round(1 / mean, 2) if mean > 0 else 0.0,
+    }
+
+
+def _timed(fn: Callable[[], Any], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - start
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> dict[str, float]:
+    """Time ``repeat`` samples of ``fn``; the calibration loop doubles as warm-up."""
+    number = 1
+    while _timed(fn, number) < _MIN_SAMPLE_SECONDS and number < 100_000:
+        number *= 10
+    return summarise([_timed(fn, number) / number for _ in range(repeat)])
+
+
+def bench_stages(corpus: list[CorpusImage], workdir: Path, repeat: int) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for image in corpus:
+        path = workdir / f'{image.name}.{image.format}'
+        path.write_bytes(image.data)
+        image_type = sniff_format(image.data) or image.format
+
+        preprocess = preprocess_image(image.data, size_bytes=len(image.data), path=path)
+        segment = segment_image(path)
+
+        results[f'preprocess_image/{image.name}'] = measure(
+            lambda: preprocess_image(image.data, size_bytes=len(image.data), path=path), repeat
+        )
+        results[f'_parse_dimensions/{image.name}'] = measure(lambda: _parse_dimensions(image.data, image_type), repeat)
+        results[f'segment_image/{image.name}'] = measure(lambda: segment_image(path), repeat)
+        results[f'extract_dimension_candidates/{image.name}'] = measure(
+            lambda: extract_dimension_candidates(path), max(1, repeat // 4)
+        )
+        dimensions = compute_dimensions(preprocess, segment)
+        results[f'build_shape_proxy/{image.name}'] = measure(lambda: build_shape_proxy(segment, dimensions), repeat)
+        results[f'compute_dimensions/{image.name}'] = measure(lambda: compute_dimensions(preprocess, segment), repeat)
+        results[f'compute_quality_metrics/{image.name}'] = measure(
+            lambda: compute_quality_metrics(preprocess, segment), repeat
+        )
+
+    for index, text in enumerate(OCR_TEXT_FIXTURES):
+        results[f'extract_dimension_candidates/text-{index}'] = measure(lambda: extract_dimension_candidates(text), repeat)
+    for index, raw_items in enumerate(OCR_ITEM_FIXTURES):
+        items = coerce_ocr_items(raw_items)
+        results[f'map_dimensions/items-{index}'] = measure(lambda: map_dimensions(items), repeat)
+    return results
+
+
+async def _post_jobs(corpus: list[CorpusImage], requests: int, concurrency: int) -> dict[str, float]:
+    transport = httpx.ASGITransport(app=main.app)
+    semaphore = asyncio.Semaphore(concurrency)
+    samples: list[float] = []
+
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as client:
+
+        async def _one(index: int) -> None:
+            image = corpus[index % len(corpus)]
+            files = {'file': (f'{image.name}.{image.format}', image.data, image.content_type)}
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post('/api/v1/jobs', files=files)
+                samples.append(time.perf_counter() - start)
+            if response.status_code != 201:
+                raise RuntimeError(f'POST /api/v1/jobs returned {response.status_code}: {response.text}')
+
+        started = time.perf_counter()
+        await asyncio.gather(*(_one(index) for index in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    stats = summarise(samples)
+    stats['requests_per_sec'] = round(requests / elapsed, 2)
+    stats['concurrency'] = concurrency
+    return stats
+
+
+def bench_api(corpus: list[CorpusImage], workdir: Path, requests: int, concurrency: int) -> dict[str, dict[str, float]]:
+    """End-to-end ``POST /api/v1/jobs`` through the in-process ASGI app, uncached then cached."""
+    main.file_storage = LocalFileStorage(str(workdir / 'uploads'))
+    main.settings.job_execution_mode = 'inline'
+    results = {}
+
+    main.result_cache = ResultCache(max_entries=0, ttl_seconds=0)
+    results['api.create_job'] = asyncio.run(_post_jobs(corpus, requests, concurrency))
+
+    main.result_cache = ResultCache(max_entries=len(corpus), ttl_seconds=3600)
+    results['api.create_job.cached'] = asyncio.run(_post_jobs(corpus, requests, concurrency))
+    return results
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[dict[str, Any]]:
+    """Return one record per metric that is worse than ``baseline`` by more than ``threshold``."""
+    regressions = []
+    for name, stats in current['results'].items():
+        base = baseline.get('results', {}).get(name)
+        if base is None:
+            continue
+        for field in LATENCY_FIELDS + THROUGHPUT_FIELDS:
+            if field not in stats or not base.get(field):
+                continue
+            change = (stats[field] - base[field]) / base[field]
+            if field in THROUGHPUT_FIELDS:
+                change = -change
+            elif stats[field] - base[field] < _NOISE_FLOOR_MS:
+                continue
+            if change > threshold:
+                regressions.append(
+                    {'name': name, 'field': field, 'baseline': base[field], 'current': stats[field], 'change': round(change, 4)}
+                )
+    return regressions
+
+
+def run(seed: int, repeat: int, requests: int, concurrency: int, quick: bool) -> dict[str, Any]:
+    corpus = generate_corpus(seed, resolutions=RESOLUTIONS[:2] if quick else RESOLUTIONS)
+    with tempfile.TemporaryDirectory(prefix='bench-') as tmp:
+        workdir = Path(tmp)
+        results = bench_stages(corpus, workdir, repeat)
+        results.update(bench_api(corpus, workdir, requests, concurrency))
+
+    return {
+        'meta': {
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'pipeline_version': main.PIPELINE_VERSION,
+            'segmentation_algorithm': main.settings.segmentation_algorithm,
+            'seed': seed,
+            'repeat': repeat,
+            'corpus': [{'name': image.name, 'bytes': len(image.data)} for image in corpus],
+        },
+        'results': results,
+    }
+
+
+def main_cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--output', type=Path, help='write results JSON here (default: stdout)')
+    parser.add_argument('--baseline', type=Path, help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed regression fraction (default 0.2)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=40)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--quick', action='store_true', help='skip the largest resolution')
+    args = parser.parse_args(argv)
+
+    report = run(args.seed, args.repeat, args.requests, args.concurrency, args.quick)
+    if args.baseline:
+        regressions = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        report['comparison'] = {
+            'baseline': str(args.baseline),
+            'threshold': args.threshold,
+            'regressions': regressions,
+        }
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(encoded + '\n')
+    else:
+        print(encoded)
+
+    regressions = report.get('comparison', {}).get('regressions', [])
+    for item in regressions:
+        print(
+            f"REGRESSION {item['name']} {item['field']}: {item['baseline']} -> {item['current']} "
+            f"({item['change']:+.1%})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main_cli())
@@ -0,0 +1,133 @@
+"""Job store read throughput while worker threads keep writing.
+
+Usage (from ``source/backend``)::
+
+    python -m benchmarks.store_contention --threads 8 16 32 --duration 1
+
+Readers poll ``get`` on random jobs, as status polling does, while a few
+writer threads apply pipeline-style updates. The copy-on-write store is
+compared with ``GlobalLockStore``, which takes the write lock on every read
+like the store did before.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from typing import Any
+
+from app.store import InMemoryJobStore, JobMeta, utcnow
+
+_JOBS = 1000
+_WRITERS = 2
+
+
+class GlobalLockStore(InMemoryJobStore):
+    """Reads serialise with writes on the single store lock."""
+
+    def get(self, job_id: str) -> JobMeta | None:
+        with self._lock:
+            return self._read(job_id)
+
+
+def _populate(store: InMemoryJobStore) -> list[str]:
+    job_ids = [f'job-{index:05d}' for index in range(_JOBS)]
+    for job_id in job_ids:
+        store.create(
+            JobMeta(
+                job_id=job_id,
+                status='queued',
+                filename=f'{job_id}.png',
+                content_type='image/png',
+                size=1024,
+                file_path=f'/tmp/{job_id}.png',
+                created_at=utcnow(),
+            )
+        )
+    return job_ids
+
+
+def _pipeline_outputs(seed: int) -> dict[str, Any]:
+    return {
+        'status': 'processed',
+        'quality_metrics': {
+            'preprocess': {'format': 'png', 'width': 1024, 'height': 768, 'size_bytes': 1024},
+            'segmentation': {'bbox': [seed % 100, 10, 200, 300], 'confidence': 0.9, 'foreground_ratio': 0.3},
+            'shape_engine': {'fill_ratio': 0.7, 'aspect_ratio': 1.4},
+        },
+        'dimensions_mm': {'width': 40.0, 'height': 120.0, 'depth': 40.0},
+        'volume_mm3': 192000.0,
+    }
+
+
+def run_contention(store_cls: type[InMemoryJobStore], threads: int, duration: float, seed: int = 0) -> dict[str, float]:
+    store = store_cls()
+    job_ids = _populate(store)
+    stop = threading.Event()
+    start = threading.Barrier(threads + _WRITERS + 1)
+    reads = [0] * threads
+    writes = [0] * _WRITERS
+
+    def _reader(slot: int) -> None:
+        rng = random.Random(seed + slot)
+        count = 0
+        start.wait()
+        while not stop.is_set():
+            for _ in range(100):
+                store.get(job_ids[rng.randrange(_JOBS)])
+            count += 100
+        reads[slot] = count
+
+    def _writer(slot: int) -> None:
+        rng = random.Random(seed - slot - 1)
+        count = 0
+        start.wait()
+        while not stop.is_set():
+            job_id = job_ids[rng.randrange(_JOBS)]
+            store.update(job_id, status='processing')
+            store.update(job_id, **_pipeline_outputs(count))
+            count += 2
+        writes[slot] = count
+
+    workers = [threading.Thread(target=_reader, args=(slot,)) for slot in range(threads)]
+    workers += [threading.Thread(target=_writer, args=(slot,)) for slot in range(_WRITERS)]
+    for worker in workers:
+        worker.start()
+    start.wait()
+    began = time.perf_counter()
+    time.sleep(duration)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - began
+
+    return {
+        'threads': threads,
+        'reads_per_sec': round(sum(reads) / elapsed, 1),
+        'writes_per_sec': round(sum(writes) / elapsed, 1),
+    }
+
+
+def bench_contention(thread_counts: tuple[int, ...], duration: float) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for threads in thread_counts:
+        locked = run_contention(GlobalLockStore, threads, duration)
+        cow = run_contention(InMemoryJobStore, threads, duration)
+        cow['read_gain'] = round(cow['reads_per_sec'] / locked['reads_per_sec'], 2) if locked['reads_per_sec'] else 0.0
+        results[f'store.global_lock/t{threads}'] = locked
+        results[f'store.copy_on_write/t{threads}'] = cow
+    return results
+
+
+def main_cli(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, nargs='+', default=[8, 16, 32])
+    parser.add_argument('--duration', type=float, default=1.0, help='seconds per run')
+    args = parser.parse_args(argv)
+    print(json.dumps(bench_contention(tuple(args.threads), args.duration), indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main_cli())
@@ -0,0 +1,119 @@
+import hashlib
+import io
+import threading
+
+import numpy as np
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.artifacts import OCR_GRAY, THUMBNAIL, WORKING_RGB, ArtifactCache, Transform, decode_ocr_gray
+from app.image_pipeline import run_segmentation
+from app.main import app, job_store, result_cache
+from app.segmentation import OTSU_ALGORITHM
+from app.store import LocalFileStorage
+
+client = TestClient(app)
+
+
+def _photo(width: int = 400, height: int = 300) -> bytes:
+    pixels = np.full((height, width, 3), 235, dtype=np.uint8)
+    pixels[60:240, 120:280] = (180, 40, 90)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _write_source(tmp_path, payload: bytes):
+    path = tmp_path / 'source.png'
+    path.write_bytes(payload)
+    return path, hashlib.sha256(payload).hexdigest()
+
+
+def setup_function():
+    job_store.clear()
+    result_cache.clear()
+
+
+def test_artifact_is_generated_once_under_concurrent_requests(tmp_path):
+    source, sha = _write_source(tmp_path, _photo())
+    calls = []
+    started = threading.Barrier(8)
+
+    def _write(path, fh):
+        calls.append(path)
+        fh.write(b'x' * 10)
+
+    transform = Transform('counting.v1', '.bin', _write)
+    cache = ArtifactCache(str(tmp_path / 'artifacts'), max_bytes=1024)
+
+    def _get():
+        started.wait()
+        return cache.get(sha, transform, source)
+
+    threads = [threading.Thread(target=_get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert cache.stats()['misses'] == 1
+    assert cache.stats()['hits'] == 7
+
+
+def test_cache_evicts_least_recently_used_and_reloads_index(tmp_path):
+    transform = Transform('fixed.v1', '.bin', lambda _, fh: fh.write(b'x' * 100))
+    directory = str(tmp_path / 'artifacts')
+    cache = ArtifactCache(directory, max_bytes=250)
+    keys = [f'{index:064x}' for index in range(3)]
+
+    first = cache.get(keys[0], transform, tmp_path)
+    cache.get(keys[1], transform, tmp_path)
+    cache.get(keys[0], transform, tmp_path)
+    cache.get(keys[2], transform, tmp_path)
+
+    assert first.exists()
+    assert not cache.path(keys[1], transform).exists()
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 200
+
+    reloaded = ArtifactCache(directory, max_bytes=150)
+    assert reloaded.stats()['entries'] == 1
+    assert cache.path(keys[2], transform).exists()
+
+
+def test_cached_arrays_match_a_fresh_decode(tmp_path):
+    payload = _photo()
+    source, sha = _write_source(tmp_path, payload)
+    artifacts = ArtifactCache(str(tmp_path / 'artifacts'), max_bytes=10 * 1024 * 1024).bind(sha, source)
+
+    cached = run_segmentation(source, OTSU_ALGORITHM, artifacts)
+    fresh = run_segmentation(payload, OTSU_ALGORITHM)
+    assert cached.meta == fresh.meta
+    assert np.array_equal(cached.mask, fresh.mask)
+    assert np.array_equal(artifacts.ocr_gray(), decode_ocr_gray(payload))
+    assert artifacts.working_rgb().shape == (192, 256, 3)
+    assert {path.parent.parent.name for path in (tmp_path / 'artifacts').rglob('*.npy')} == {
+        WORKING_RGB.name,
+        OCR_GRAY.name,
+    }
+
+
+def test_job_thumbnail_endpoint_serves_cached_webp(tmp_path, monkeypatch):
+    cache = ArtifactCache(str(tmp_path / 'artifacts'), max_bytes=10 * 1024 * 1024)
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path / 'uploads')))
+    monkeypatch.setattr('app.main.artifact_cache', cache)
+    res = client.post('/api/v1/jobs', files={'file': ('photo.png', _photo(), 'image/png')})
+    job_id = res.json()['job_id']
+
+    res = client.get(f'/api/v1/jobs/{job_id}/thumbnail')
+    assert res.status_code == 200
+    assert res.headers['content-type'] == 'image/webp'
+    with Image.open(io.BytesIO(res.content)) as thumbnail:
+        assert thumbnail.format == 'WEBP'
+        assert thumbnail.size == (320, 240)
+    assert len(list((tmp_path / 'artifacts' / THUMBNAIL.name).rglob('*.webp'))) == 1
+
+    cached = client.get(f'/api/v1/jobs/{job_id}/thumbnail', headers={'If-None-Match': res.headers['etag']})
+    assert cached.status_code == 304
+    assert client.get('/api/v1/jobs/missing/thumbnail').status_code == 404
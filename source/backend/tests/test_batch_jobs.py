@@ -0,0 +1,198 @@
+import io
+import tarfile
+import threading
+import zipfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.config import settings
+from app.main import _build_batch_dispatcher, app, job_store, result_cache
+from app.store import LocalFileStorage
+from app.worker import JobWorkerPool
+
+
+client = TestClient(app)
+
+
+def _stored_blobs(base_dir) -> list[Path]:
+    return sorted(path for path in Path(base_dir).rglob('*') if path.is_file())
+
+
+def _png_1x1_bytes() -> bytes:
+    return (
+        b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01'
+        b'\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\x0bIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82'
+    )
+
+
+def _gif_2x3_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new('L', (2, 3), color=200).save(buffer, format='GIF')
+    return buffer.getvalue()
+
+
+def setup_function():
+    job_store.clear()
+    result_cache.clear()
+
+
+def test_create_batch_from_multiple_files(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+
+    res = client.post(
+        '/api/v1/jobs/batch',
+        files=[
+            ('files', ('a.png', _png_1x1_bytes(), 'image/png')),
+            ('files', ('b.gif', _gif_2x3_bytes(), 'image/gif')),
+        ],
+    )
+
+    assert res.status_code == 201
+    data = res.json()
+    assert data['total'] == 2
+    assert len(data['job_ids']) == 2
+
+    status = client.get(f"/api/v1/jobs/batch/{data['batch_id']}").json()
+    assert status['completed'] == 2
+    assert status['progress'] == 1.0
+    assert status['status_counts'] == {'processed': 2}
+    assert {job['filename'] for job in status['jobs']} == {'a.png', 'b.gif'}
+
+    results = client.get(f"/api/v1/jobs/batch/{data['batch_id']}/results").json()['results']
+    assert [r['job_id'] for r in results] == data['job_ids']
+    assert all(r['dimensions_mm'] is not None for r in results)
+    assert len(_stored_blobs(tmp_path)) == 2
+
+
+def test_create_batch_from_zip_archive_skips_non_images(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as zf:
+        zf.writestr('sku-1/front.png', _png_1x1_bytes())
+        zf.writestr('sku-2/front.gif', _gif_2x3_bytes())
+        zf.writestr('notes.txt', b'not an image')
+        zf.writestr('__MACOSX/sku-1/._front.png', b'junk')
+
+    res = client.post(
+        '/api/v1/jobs/batch',
+        files=[('files', ('catalogue.zip', buffer.getvalue(), 'application/zip'))],
+    )
+
+    assert res.status_code == 201
+    batch_id = res.json()['batch_id']
+    jobs = client.get(f'/api/v1/jobs/batch/{batch_id}').json()['jobs']
+    assert sorted(job['filename'] for job in jobs) == ['front.gif', 'front.png']
+
+
+def test_create_batch_from_tar_archive(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w:gz') as tf:
+        payload = _png_1x1_bytes()
+        info = tarfile.TarInfo('images/a.png')
+        info.size = len(payload)
+        tf.addfile(info, io.BytesIO(payload))
+
+    res = client.post(
+        '/api/v1/jobs/batch',
+        files=[('files', ('catalogue.tar.gz', buffer.getvalue(), 'application/gzip'))],
+    )
+
+    assert res.status_code == 201
+    assert res.json()['total'] == 1
+
+
+def test_create_batch_rejects_limit_and_cleans_up(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    monkeypatch.setattr('app.main.settings.max_batch_items', 1)
+
+    res = client.post(
+        '/api/v1/jobs/batch',
+        files=[
+            ('files', ('a.png', _png_1x1_bytes(), 'image/png')),
+            ('files', ('b.png', _png_1x1_bytes(), 'image/png')),
+        ],
+    )
+
+    assert res.status_code == 400
+    assert _stored_blobs(tmp_path) == []
+
+
+def test_create_batch_rejects_non_image_files():
+    res = client.post('/api/v1/jobs/batch', files=[('files', ('a.txt', b'abc', 'text/plain'))])
+
+    assert res.status_code == 400
+
+
+def test_get_batch_not_found():
+    assert client.get('/api/v1/jobs/batch/missing').status_code == 404
+    assert client.get('/api/v1/jobs/batch/missing/results').status_code == 404
+
+
+def test_create_batch_rejects_total_size_over_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    monkeypatch.setattr(settings, 'max_batch_bytes', len(_png_1x1_bytes()) + 10)
+
+    res = client.post(
+        '/api/v1/jobs/batch',
+        files=[
+            ('files', ('a.png', _png_1x1_bytes(), 'image/png')),
+            ('files', ('b.gif', _gif_2x3_bytes(), 'image/gif')),
+        ],
+    )
+
+    assert res.status_code == 413
+    assert 'Batch exceeds maximum size' in res.json()['detail']
+    assert _stored_blobs(tmp_path) == []
+
+
+def test_create_batch_rejected_with_429_when_backlog_cannot_admit_it(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    monkeypatch.setattr(settings, 'batch_backlog_size', 1)
+    monkeypatch.setattr('app.main.batch_dispatcher', _build_batch_dispatcher(JobWorkerPool(1, 0)))
+
+    res = client.post(
+        '/api/v1/jobs/batch',
+        files=[
+            ('files', ('a.png', _png_1x1_bytes(), 'image/png')),
+            ('files', ('b.gif', _gif_2x3_bytes(), 'image/gif')),
+        ],
+    )
+
+    assert res.status_code == 429
+    assert res.headers['retry-after'] == '5'
+    assert _stored_blobs(tmp_path) == []
+
+
+def test_batch_jobs_left_in_backlog_are_failed_on_shutdown(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    monkeypatch.setattr(settings, 'job_execution_mode', 'queued')
+    pool = JobWorkerPool(max_workers=1, max_queue=0)
+    dispatcher = _build_batch_dispatcher(pool)
+    monkeypatch.setattr('app.main.batch_dispatcher', dispatcher)
+
+    release = threading.Event()
+    monkeypatch.setattr('app.main.segment_image', lambda _, **__: release.wait(timeout=5) and {})
+    res = client.post(
+        '/api/v1/jobs/batch',
+        files=[
+            ('files', ('a.png', _png_1x1_bytes(), 'image/png')),
+            ('files', ('b.gif', _gif_2x3_bytes(), 'image/gif')),
+        ],
+    )
+    assert res.status_code == 201
+
+    while pool.in_flight == 0:
+        threading.Event().wait(0.01)
+    dispatcher.shutdown()
+    release.set()
+    pool.shutdown(wait=True)
+
+    jobs = client.get(f"/api/v1/jobs/batch/{res.json()['batch_id']}").json()['jobs']
+    assert [job['filename'] for job in jobs] == ['a.png', 'b.gif']
+    assert jobs[1]['status'] == 'failed'
+    assert 'not dispatched' in jobs[1]['error_message']
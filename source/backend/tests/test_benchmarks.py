@@ -0,0 +1,60 @@
+import io
+
+from PIL import Image
+
+from benchmarks.corpus import generate_corpus
+from benchmarks.run import compare, measure
+from benchmarks.store_contention import bench_contention
+
+
+def test_corpus_is_deterministic_and_decodable():
+    first = generate_corpus(seed=3, resolutions=((64, 48),))
+    second = generate_corpus(seed=3, resolutions=((64, 48),))
+
+    assert [image.data for image in first] == [image.data for image in second]
+    assert {image.format for image in first} == {'png', 'jpeg', 'gif', 'webp'}
+    for image in first:
+        with Image.open(io.BytesIO(image.data)) as decoded:
+            assert decoded.size == (64, 48)
+
+
+def test_measure_reports_latency_statistics():
+    stats = measure(lambda: sum(range(100)), repeat=5)
+
+    assert stats['count'] == 5
+    assert 0 < stats['min_ms'] <= stats['p50_ms'] <= stats['p95_ms']
+    assert stats['ops_per_sec'] > 0
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    baseline = {
+        'results': {
+            'segment_image/png': {'p50_ms': 10.0},
+            'map_dimensions/items-0': {'p50_ms': 0.002},
+            'api.create_job': {'p50_ms': 40.0, 'requests_per_sec': 100.0},
+        }
+    }
+    current = {
+        'results': {
+            'segment_image/png': {'p50_ms': 13.0},
+            'map_dimensions/items-0': {'p50_ms': 0.004},
+            'api.create_job': {'p50_ms': 41.0, 'requests_per_sec': 70.0},
+            'new/stage': {'p50_ms': 1.0},
+        }
+    }
+
+    regressions = compare(current, baseline, threshold=0.2)
+
+    assert [(item['name'], item['field']) for item in regressions] == [
+        ('segment_image/png', 'p50_ms'),
+        ('api.create_job', 'requests_per_sec'),
+    ]
+    assert regressions[1]['change'] == 0.3
+
+
+def test_store_contention_reports_read_and_write_throughput():
+    results = bench_contention((2,), duration=0.05)
+
+    assert set(results) == {'store.global_lock/t2', 'store.copy_on_write/t2'}
+    assert all(entry['reads_per_sec'] > 0 and entry['writes_per_sec'] > 0 for entry in results.values())
+    assert results['store.copy_on_write/t2']['read_gain'] > 0
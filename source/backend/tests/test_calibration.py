@@ -0,0 +1,145 @@
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.artifacts import decode_ocr_gray
+from app.calibration import (
+    CalibrationError,
+    CalibrationProfiles,
+    ReferenceSpec,
+    calibrate,
+    parse_reference_spec,
+)
+from app.main import app, calibration_profiles, job_store, result_cache
+from app.segmentation import load_working_image, segment_array
+from app.store import LocalFileStorage
+
+client = TestClient(app)
+
+ID1_CARD = ReferenceSpec(85.6, 53.98)
+MM_PER_PX = 0.25
+
+
+def _rig_frame(product_offset: int = 0, with_card: bool = True) -> bytes:
+    # 1600x1200 studio frame at 0.25 mm/px: ID-1 card bottom left, a 40x120 mm product.
+    pixels = np.full((1200, 1600, 3), 230, dtype=np.uint8)
+    if with_card:
+        pixels[900:900 + round(53.98 / MM_PER_PX), 100:100 + round(85.6 / MM_PER_PX)] = (30, 30, 40)
+    x0 = 900 + product_offset
+    pixels[200:680, x0:x0 + 160] = (200, 60, 90)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _mask(payload: bytes) -> np.ndarray:
+    return segment_array(*load_working_image(payload)).mask
+
+
+def setup_function():
+    job_store.clear()
+    result_cache.clear()
+    calibration_profiles.clear()
+
+
+def test_reference_card_sets_scale_and_object_is_measured_without_it():
+    payload = _rig_frame()
+    result = calibrate(_mask(payload), (1600, 1200), lambda: decode_ocr_gray(payload), ID1_CARD, 0.2)
+
+    assert result['method'] == 'reference'
+    assert result['mm_per_px'] == pytest.approx(MM_PER_PX, rel=0.01)
+    assert result['reference_bbox'] == [100, 900, 442, 1116]
+    x0, y0, x1, y1 = result['object_bbox']
+    assert (x1 - x0) * result['mm_per_px'] == pytest.approx(40, abs=1.5)
+    assert (y1 - y0) * result['mm_per_px'] == pytest.approx(120, abs=1.5)
+
+
+def test_frame_without_reference_falls_back_to_default_scale():
+    payload = _rig_frame(with_card=False)
+    result = calibrate(_mask(payload), (1600, 1200), lambda: decode_ocr_gray(payload), ID1_CARD, 0.2)
+
+    assert result['method'] == 'default'
+    assert result['mm_per_px'] == 0.2
+    assert result['reference_bbox'] is None
+    assert result['object_bbox'] is not None
+
+
+def test_profile_reuses_calibration_without_detection():
+    profiles = CalibrationProfiles(max_entries=4)
+    first = _rig_frame()
+    calibrate(_mask(first), (1600, 1200), lambda: decode_ocr_gray(first), ID1_CARD, 0.2, profiles, 'rig-1')
+
+    loads = []
+    second = _rig_frame(product_offset=200)
+    load_gray = lambda: loads.append(1) or decode_ocr_gray(second)  # noqa: E731
+    result = calibrate(_mask(second), (1600, 1200), load_gray, ID1_CARD, 0.2, profiles, 'rig-1')
+
+    assert loads == []
+    assert result['method'] == 'profile'
+    assert result['object_bbox'][0] >= 1090
+    assert profiles.get('rig-1', (800, 600)) is None
+
+
+def test_parse_reference_spec():
+    assert parse_reference_spec('50x50') == ReferenceSpec(50.0, 50.0)
+    with pytest.raises(CalibrationError):
+        parse_reference_spec('credit card')
+
+
+def test_job_api_calibrates_per_profile(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+
+    res = client.post(
+        '/api/v1/jobs',
+        files={'file': ('frame.png', _rig_frame(), 'image/png')},
+        data={'calibration_profile': 'studio-a'},
+    )
+    result = client.get(f"/api/v1/jobs/{res.json()['job_id']}/result").json()
+    assert result['quality_metrics']['calibration']['method'] == 'reference'
+    assert result['dimensions_mm']['width'] == pytest.approx(40, abs=1.5)
+    assert result['dimensions_mm']['height'] == pytest.approx(120, abs=1.5)
+
+    profile = client.get('/api/v1/calibration/profiles/studio-a').json()
+    assert profile['mm_per_px'] == pytest.approx(MM_PER_PX, rel=0.01)
+    assert profile['image_size'] == [1600, 1200]
+
+    res = client.post(
+        '/api/v1/jobs',
+        files={'file': ('frame2.png', _rig_frame(product_offset=200), 'image/png')},
+        data={'calibration_profile': 'studio-a'},
+    )
+    result = client.get(f"/api/v1/jobs/{res.json()['job_id']}/result").json()
+    assert result['quality_metrics']['calibration']['method'] == 'profile'
+
+    assert client.delete('/api/v1/calibration/profiles/studio-a').status_code == 204
+    assert client.get('/api/v1/calibration/profiles/studio-a').status_code == 404
+    bad = client.post(
+        '/api/v1/jobs', files={'file': ('frame.png', b'x', 'image/png')}, data={'calibration_profile': '../etc'}
+    )
+    assert bad.status_code == 422
+
+
+def test_cached_results_follow_the_profile_calibration(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+
+    def measure() -> dict:
+        files = {'file': ('frame.png', _rig_frame(), 'image/png')}
+        res = client.post('/api/v1/jobs', files=files, data={'calibration_profile': 'rig'})
+        return client.get(f"/api/v1/jobs/{res.json()['job_id']}/result").json()
+
+    first = measure()
+    assert measure()['dimensions_mm'] == first['dimensions_mm']
+
+    # Deleted: the re-upload calibrates again (re-registering the profile) instead of reusing the old result.
+    client.delete('/api/v1/calibration/profiles/rig')
+    measure()
+    assert client.get('/api/v1/calibration/profiles/rig').status_code == 200
+
+    # Re-registered with another scale: the re-upload is measured with it.
+    calibration_profiles.put('rig', calibration_profiles.peek('rig')._replace(mm_per_px=MM_PER_PX * 2))
+    rescaled = measure()
+    assert rescaled['quality_metrics']['calibration']['method'] == 'profile'
+    assert rescaled['dimensions_mm']['width'] == pytest.approx(first['dimensions_mm']['width'] * 2, rel=0.02)
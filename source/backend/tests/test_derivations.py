@@ -0,0 +1,128 @@
+import io
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.derivations import Derivation, DerivationGraph, correct_dimensions
+from app.main import app, calibration_profiles, job_store, result_cache
+from app.mesh import mesh_spec
+from app.store import JobMeta, LocalFileStorage, utcnow
+
+client = TestClient(app)
+
+
+def _frame() -> bytes:
+    pixels = np.full((600, 800, 3), 230, dtype=np.uint8)
+    pixels[100:500, 340:460] = (200, 60, 90)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def setup_function():
+    job_store.clear()
+    result_cache.clear()
+    calibration_profiles.clear()
+
+
+def test_graph_recomputes_downstream_only_and_stops_on_unchanged_values():
+    calls = []
+
+    def track(name, compute):
+        return lambda *args: calls.append(name) or compute(*args)
+
+    graph = DerivationGraph(
+        [
+            Derivation('parity', ('n',), track('parity', lambda n: n % 2)),
+            Derivation('label', ('parity',), track('label', lambda parity: 'odd' if parity else 'even')),
+            Derivation('double', ('n',), track('double', lambda n: n * 2)),
+            Derivation('other', ('m',), track('other', lambda m: m)),
+        ]
+    )
+    values = {'n': 2, 'm': 0, 'parity': 0, 'label': 'even', 'double': 4, 'other': 0}
+
+    assert graph.recompute({**values, 'n': 4}, ['n']) == {'double': 8}
+    assert sorted(calls) == ['double', 'parity']
+    assert graph.recompute({**values, 'n': 3}, ['n']) == {'parity': 1, 'label': 'odd', 'double': 6}
+
+    with pytest.raises(ValueError):
+        DerivationGraph([Derivation('a', ('b',), abs), Derivation('b', ('a',), abs)])
+
+
+def test_correction_keeps_multiview_volume_factor_and_rebases_shape():
+    mesh = mesh_spec('cylindrical-like', {'width': 50, 'height': 50, 'depth': 50}, [1.0] * 4, [1.0] * 4)
+    meta = JobMeta(
+        job_id='j',
+        status='processed',
+        filename='front.png',
+        content_type='image/png',
+        size=1,
+        file_path='',
+        created_at=utcnow(),
+        quality_metrics={'fusion': {'volume_factor': 0.5}, 'mesh': mesh},
+        dimensions_mm={'width': 50, 'height': 50, 'depth': 50},
+        volume_mm3=62500.0,
+        shape_proxy={'shape_family': 'cylindrical-like', 'compactness': 'high', 'aspect_ratio': 1.0, 'fill_ratio': 0.8},
+    )
+
+    fields = correct_dimensions(meta, {'width': 50, 'height': 100, 'depth': 50})
+    assert fields['volume_mm3'] == 125000.0
+    assert fields['shape_proxy']['shape_family'] == 'vertical-prismatic-like'
+    assert fields['shape_proxy']['fill_ratio'] == 0.8
+    assert fields['quality_metrics']['mesh']['method'] == 'extrude'
+    assert fields['quality_metrics']['fusion'] == {'volume_factor': 0.5}
+
+    assert correct_dimensions(meta, dict(meta.dimensions_mm)) == {'dimensions_mm': meta.dimensions_mm}
+
+
+def test_patch_recomputes_outputs_without_rerunning_the_pipeline(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    job_id = client.post('/api/v1/jobs', files={'file': ('bottle.png', _frame(), 'image/png')}).json()['job_id']
+    before = client.get(f'/api/v1/jobs/{job_id}/result').json()
+
+    def _fail(*_, **__):
+        raise AssertionError('upstream stage reran')
+
+    monkeypatch.setattr('app.main.segment_image', _fail)
+    monkeypatch.setattr('app.main.calibrate_image', _fail)
+    res = client.patch(f'/api/v1/jobs/{job_id}/dimensions', json={'width': 60, 'depth': 60, 'height': 60})
+    assert res.status_code == 200
+    after = res.json()
+
+    assert after['volume_mm3'] == 216000.0
+    assert after['shape_proxy']['shape_family'] == 'cylindrical-like'
+    assert after['shape_proxy']['aspect_ratio'] == 1.0
+    assert after['shape_proxy']['fill_ratio'] == before['shape_proxy']['fill_ratio']
+    assert after['quality_metrics']['mesh']['method'] == 'revolve'
+    assert after['quality_metrics']['mesh']['key'] != before['quality_metrics']['mesh']['key']
+    assert after['quality_metrics']['segmentation'] == before['quality_metrics']['segmentation']
+    assert client.get(after['mesh_url']).content[:4] == b'glTF'
+
+
+def test_patch_with_measured_dimensions_keeps_shape_mesh_and_packaging(tmp_path, monkeypatch):
+    # A tall object on a landscape canvas: the family follows the object, not the frame.
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    pixels = np.full((900, 1200, 3), 230, dtype=np.uint8)
+    pixels[150:750, 540:660] = (200, 60, 90)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='JPEG')
+    upload = {'file': ('tall.jpg', buffer.getvalue(), 'image/jpeg')}
+    job_id = client.post('/api/v1/jobs', files=upload).json()['job_id']
+    before = client.get(f'/api/v1/jobs/{job_id}/result').json()
+    assert before['shape_proxy']['shape_family'] == 'vertical-prismatic-like'
+
+    measured = before['dimensions_mm']
+    for dimensions in (measured, {**measured, 'depth': measured['depth'] + 0.5}):
+        after = client.patch(f'/api/v1/jobs/{job_id}/dimensions', json=dimensions).json()
+        assert after['shape_proxy']['shape_family'] == before['shape_proxy']['shape_family']
+        assert after['quality_metrics']['mesh']['method'] == before['quality_metrics']['mesh']['method']
+        packaging = after['quality_metrics']['packaging']
+        assert packaging['container'] == before['quality_metrics']['packaging']['container']
+        assert packaging['shape_family'] == before['quality_metrics']['packaging']['shape_family']
+
+    same = client.patch(f'/api/v1/jobs/{job_id}/dimensions', json=measured).json()
+    assert same['quality_metrics']['mesh'] == before['quality_metrics']['mesh']
+    assert same['quality_metrics']['packaging'] == before['quality_metrics']['packaging']
+    assert same['shape_proxy'] == before['shape_proxy']
@@ -51,3 +51,35 @@ def test_map_dimensions_filters_false_positives():
     assert result['mapped_dimensions_mm'] == {'width': 11.0, 'height': 22.0, 'depth': 33.0}
     assert 'v2.0' not in str(result['mapping_items'])
     assert '12.34.56' not in str(result['mapping_items'])
+
+
+def test_map_dimensions_korean_and_symbol_tokens():
+    items = [
+        {'text': '가로 10 cm', 'confidence': 0.9},
+        {'text': '세로 2 cm', 'confidence': 0.9},
+        {'text': '길이 3cm', 'confidence': 0.9},
+        {'text': 'ø 45 mm', 'confidence': 0.9},
+    ]
+
+    result = map_dimensions(items)
+    assert result['mapped_dimensions_mm'] == {'width': 100.0, 'height': 20.0, 'depth': 30.0, 'max_diameter': 45.0}
+
+
+def test_map_dimensions_target_priority_and_inch_units():
+    items = [
+        {'text': 'H / W 2 in', 'confidence': 0.9},
+        {'text': 'size 1 x 2 x 3 cm', 'confidence': 0.5},
+    ]
+
+    result = map_dimensions(items)
+    # width outranks height when both tokens occur in one line
+    assert result['mapped_dimensions_mm']['width'] == 50.8
+    assert result['mapped_dimensions_mm']['height'] == 2.0
+    assert result['mapped_dimensions_mm']['depth'] == 30.0
+
+
+def test_map_dimensions_skips_line_with_embedded_version_string():
+    items = [{'text': 'W 10 mm rev 1.2.3', 'confidence': 0.9}]
+
+    result = map_dimensions(items)
+    assert result['mapped_dimensions_mm'] == {}
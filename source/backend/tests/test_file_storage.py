@@ -0,0 +1,174 @@
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.artifacts import ArtifactCache
+from app.main import app, job_store
+from app.s3_storage import MIN_PART_SIZE, S3FileStorage
+from app.store import LocalFileStorage
+
+
+def _ingest(storage: LocalFileStorage, data: bytes):
+    temp = storage.temp_path()
+    temp.write_bytes(data)
+    return storage.commit(temp, hashlib.sha256(data).hexdigest())
+
+
+def test_commit_stores_content_once_in_sharded_layout(tmp_path):
+    storage = LocalFileStorage(str(tmp_path))
+    key = hashlib.sha256(b'same').hexdigest()
+
+    first = _ingest(storage, b'same')
+    second = _ingest(storage, b'same')
+
+    assert first.created and not second.created
+    assert first.path == second.path == str(tmp_path / key[:2] / key[2:4] / key)
+    assert [path.name for path in tmp_path.rglob('*') if path.is_file()] == [key]
+
+
+def test_discard_keeps_blob_still_referenced_by_another_commit(tmp_path):
+    storage = LocalFileStorage(str(tmp_path))
+    first = _ingest(storage, b'shared')
+    second = _ingest(storage, b'shared')
+
+    storage.settle(second)
+    storage.discard(first)
+    assert os.path.exists(first.path)
+
+    alone = _ingest(storage, b'alone')
+    storage.discard(alone)
+    assert not os.path.exists(alone.path)
+
+
+def test_discard_keeps_blob_touched_by_another_process(tmp_path):
+    storage = LocalFileStorage(str(tmp_path))
+    blob = _ingest(storage, b'payload')
+    stat = os.stat(blob.path)
+    os.utime(blob.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    storage.discard(blob)
+
+    assert os.path.exists(blob.path)
+
+
+class _ClientError(Exception):
+    # Shaped like botocore's ClientError: the error code lives in ``response``.
+    def __init__(self, code: str) -> None:
+        super().__init__(code)
+        self.response = {'Error': {'Code': code}}
+
+
+class _Body(io.BytesIO):
+    def iter_chunks(self, size: int):
+        while chunk := self.read(size):
+            yield chunk
+
+
+class _FakeS3:
+    """The subset of the boto3 S3 client S3FileStorage uses, kept in memory."""
+
+    def __init__(self) -> None:
+        self.objects: dict[tuple[str, str], bytes] = {}
+        self.uploads: dict[str, list[bytes]] = {}
+        self.calls: list[str] = []
+
+    def head_object(self, Bucket, Key):
+        self.calls.append('head_object')
+        if (Bucket, Key) not in self.objects:
+            raise _ClientError('404')
+        return {'ContentLength': len(self.objects[Bucket, Key])}
+
+    def put_object(self, Bucket, Key, Body):
+        self.calls.append('put_object')
+        self.objects[Bucket, Key] = Body.read()
+
+    def create_multipart_upload(self, Bucket, Key):
+        upload_id = f'upload-{len(self.uploads)}'
+        self.uploads[upload_id] = []
+        return {'UploadId': upload_id}
+
+    def upload_part(self, Bucket, Key, PartNumber, UploadId, Body):
+        self.calls.append('upload_part')
+        self.uploads[UploadId].append(Body)
+        return {'ETag': f'"part-{PartNumber}"'}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        numbers = [part['PartNumber'] for part in MultipartUpload['Parts']]
+        assert numbers == list(range(1, len(self.uploads[UploadId]) + 1))
+        self.objects[Bucket, Key] = b''.join(self.uploads.pop(UploadId))
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.uploads.pop(UploadId, None)
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise _ClientError('NoSuchKey')
+        return {'Body': _Body(self.objects[Bucket, Key])}
+
+
+def test_s3_tier_with_stub_client_replicates_restores_and_maps_missing_objects(tmp_path):
+    client = _FakeS3()
+    storage = S3FileStorage(str(tmp_path), client, 'uploads', multipart_threshold=1024, part_size=MIN_PART_SIZE)
+    data = os.urandom(MIN_PART_SIZE + 10)
+
+    blob = _ingest(storage, data)
+    storage.settle(blob)
+    storage.close()
+    assert client.calls.count('upload_part') == 2
+    assert client.objects['uploads', storage.object_key(blob.key)] == data
+    assert not storage.replicate(blob.key)
+
+    small = _ingest(storage, b'small')
+    assert storage.replicate(small.key)
+    assert 'put_object' in client.calls
+
+    os.unlink(blob.path)
+    assert storage.local_path(blob.key).read_bytes() == data
+    with pytest.raises(FileNotFoundError):
+        storage.local_path(hashlib.sha256(b'never stored').hexdigest())
+    assert not list(tmp_path.glob('.tmp-*'))
+
+
+def test_thumbnail_of_blob_missing_from_every_tier_is_404(tmp_path, monkeypatch):
+    s3 = _FakeS3()
+    storage = S3FileStorage(str(tmp_path / 'uploads'), s3, 'uploads')
+    monkeypatch.setattr('app.main.file_storage', storage)
+    monkeypatch.setattr('app.main.artifact_cache', ArtifactCache(tmp_path / 'artifacts', 1 << 20))
+    png = io.BytesIO()
+    Image.new('RGB', (8, 8)).save(png, format='PNG')
+    client = TestClient(app)
+    job_id = client.post('/api/v1/jobs', files={'file': ('a.png', png.getvalue(), 'image/png')}).json()['job_id']
+    storage.close()
+    os.unlink(job_store.get(job_id).file_path)
+    s3.objects.clear()
+    monkeypatch.setattr('app.main.artifact_cache', ArtifactCache(tmp_path / 'fresh-artifacts', 1 << 20))
+
+    res = client.get(f'/api/v1/jobs/{job_id}/thumbnail')
+    assert res.status_code == 404
+
+
+def test_s3_tier_replicates_multipart_and_restores_missing_local_copy(tmp_path):
+    boto3 = pytest.importorskip('boto3')
+    moto = pytest.importorskip('moto')
+
+    with moto.mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket='uploads')
+        storage = S3FileStorage(str(tmp_path), client, 'uploads', multipart_threshold=1024)
+        data = os.urandom(MIN_PART_SIZE * 2 + 10)
+
+        blob = _ingest(storage, data)
+        storage.settle(blob)
+        storage.close()
+
+        head = client.head_object(Bucket='uploads', Key=storage.object_key(blob.key))
+        assert head['ContentLength'] == len(data)
+        assert head['ETag'].strip('"').endswith('-3')
+        assert not storage.replicate(blob.key)
+
+        os.unlink(blob.path)
+        assert storage.local_path(blob.key).read_bytes() == data
@@ -25,3 +25,54 @@ def test_health_db_fail(monkeypatch):
     res = client.get('/health/db')
     assert res.status_code == 200
     assert res.json() == {'status': 'error', 'database': False}
+
+
+def test_check_db_connection_reports_pool_failure(monkeypatch):
+    from app import db
+
+    class _BrokenPool:
+        def connection(self, timeout=None):
+            raise RuntimeError('pool timeout')
+
+    monkeypatch.setattr(db, 'get_pool', lambda: _BrokenPool())
+    assert db.check_db_connection() is False
+
+
+def test_lifespan_rebuilds_store_and_workers_on_each_run(monkeypatch):
+    from app import main
+    from app.config import settings
+
+    pools = []
+
+    class _FakeStore:
+        def __init__(self, pool):
+            self.pool = pool
+
+        def ensure_schema(self):
+            pass
+
+        def add_listener(self, listener):
+            pass
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(settings, 'job_store_backend', 'postgres')
+    monkeypatch.setattr(main, 'PostgresJobStore', _FakeStore)
+    monkeypatch.setattr(main, 'get_pool', lambda: pools.append(object()) or pools[-1])
+    monkeypatch.setattr(main, 'close_pool', lambda: None)
+    monkeypatch.setattr(main, 'init_ocr_pool', lambda size: None)
+    monkeypatch.setattr(main, 'close_ocr_pool', lambda: None)
+    monkeypatch.setattr(main, 'job_store', main.job_store)
+    monkeypatch.setattr(main, 'job_workers', main.job_workers)
+    monkeypatch.setattr(main, 'batch_dispatcher', main.batch_dispatcher)
+
+    seen = []
+    for _ in range(2):
+        with TestClient(app) as lifespan_client:
+            assert lifespan_client.get('/health').status_code == 200
+            seen.append((main.job_store, main.job_workers))
+
+    assert [store.pool for store, _ in seen] == pools
+    assert len(pools) == 2
+    assert seen[0][1] is not seen[1][1]
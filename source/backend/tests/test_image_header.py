@@ -0,0 +1,118 @@
+import io
+import struct
+
+import pytest
+from PIL import Image
+
+from app.image_header import parse_image_header, read_image_header, sniff_image
+from app.image_pipeline import ImagePipelineError, preprocess_image
+
+
+def _encode(fmt: str, size=(37, 21), mode='RGB', **kwargs) -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, (120, 80, 40) if mode == 'RGB' else (120, 80, 40, 200)).save(buffer, format=fmt, **kwargs)
+    return buffer.getvalue()
+
+
+def _box(box_type: bytes, payload: bytes) -> bytes:
+    return struct.pack('>I', 8 + len(payload)) + box_type + payload
+
+
+def _heif(brand: bytes, sizes: list[tuple[int, int]]) -> bytes:
+    ftyp = _box(b'ftyp', brand + b'\x00\x00\x00\x00' + b'mif1' + brand)
+    ispe = b''.join(_box(b'ispe', b'\x00\x00\x00\x00' + struct.pack('>II', w, h)) for w, h in sizes)
+    meta = _box(b'meta', b'\x00\x00\x00\x00' + _box(b'hdlr', b'\x00' * 24) + _box(b'iprp', _box(b'ipco', ispe)))
+    return ftyp + meta + _box(b'mdat', b'\x00' * 64)
+
+
+@pytest.mark.parametrize(
+    ('data', 'expected_format'),
+    [
+        (_encode('PNG'), 'png'),
+        (_encode('JPEG'), 'jpeg'),
+        (_encode('GIF'), 'gif'),
+        (_encode('WEBP', quality=80), 'webp'),
+        (_encode('WEBP', lossless=True), 'webp'),
+        (_encode('WEBP', mode='RGBA'), 'webp'),
+        (_encode('BMP'), 'bmp'),
+        (_encode('TIFF'), 'tiff'),
+        (_encode('TIFF', compression='tiff_lzw'), 'tiff'),
+    ],
+    ids=['png', 'jpeg', 'gif', 'webp-vp8', 'webp-vp8l', 'webp-vp8x', 'bmp', 'tiff', 'tiff-lzw'],
+)
+def test_parse_image_header_reads_format_and_size(data, expected_format):
+    assert parse_image_header(data) == (expected_format, 37, 21, None)
+    assert parse_image_header(memoryview(data)) == (expected_format, 37, 21, None)
+
+
+def test_parse_heic_and_avif_ispe_prefers_the_largest_item():
+    assert parse_image_header(_heif(b'heic', [(512, 512), (4032, 3024), (320, 240)])) [:3] == ('heic', 4032, 3024)
+    assert parse_image_header(_heif(b'avif', [(1920, 1080)]))[:3] == ('avif', 1920, 1080)
+
+
+def test_parse_image_header_handles_truncated_and_unknown_data():
+    assert parse_image_header(b'not an image') == (None, None, None, None)
+    assert parse_image_header(b'') == (None, None, None, None)
+    assert parse_image_header(_encode('PNG')[:20])[:3] == ('png', None, None)
+    assert parse_image_header(_heif(b'heic', [(10, 10)])[:40])[:3] == ('heic', None, None)
+
+
+def test_read_image_header_memory_maps_stored_file(tmp_path):
+    path = tmp_path / 'photo.heic'
+    path.write_bytes(_heif(b'heic', [(4032, 3024)]))
+    empty = tmp_path / 'empty.png'
+    empty.write_bytes(b'')
+
+    assert read_image_header(path)[:3] == ('heic', 4032, 3024)
+    assert read_image_header(empty) == (None, None, None, None)
+
+
+def test_preprocess_image_reports_heic_dimensions_from_stored_file(tmp_path):
+    data = _heif(b'heic', [(4032, 3024)])
+    path = tmp_path / 'photo.heic'
+    path.write_bytes(data)
+
+    meta = preprocess_image(data[:32], size_bytes=len(data), path=path)
+
+    assert (meta['format'], meta['width'], meta['height']) == ('heic', 4032, 3024)
+    assert meta['size_bytes'] == len(data)
+
+
+def _exif(orientation: int) -> bytes:
+    exif = Image.Exif()
+    exif[0x0112] = orientation
+    return exif.tobytes()
+
+
+@pytest.mark.parametrize('fmt', ['JPEG', 'PNG', 'WEBP', 'TIFF'])
+def test_sniff_image_reads_exif_orientation(fmt):
+    data = _encode(fmt, exif=_exif(6))
+
+    result = sniff_image(data)
+
+    assert result.format == fmt.lower()
+    assert result.orientation == 6
+    assert parse_image_header(data) == (fmt.lower(), 37, 21, 6)
+
+
+@pytest.mark.parametrize(
+    ('prefix', 'expected'),
+    [
+        (b'\xff\x0a\xfa\x1f', 'jxl'),
+        (b'\x00\x00\x00\x0cJXL \r\n\x87\n\x00\x00', 'jxl'),
+        (b'\x00\x00\x00\x18ftypmif1\x00\x00\x00\x00mif1heic', 'heic'),
+        (b'\x00\x00\x00\x18ftypisom\x00\x00\x00\x00isommp41', None),
+        (b'RIFF\x00\x00\x00\x00WAVEfmt ', None),
+        (b'GIF88a', None),
+    ],
+)
+def test_sniff_image_matches_signature_table(prefix, expected):
+    assert sniff_image(prefix).format == expected
+
+
+def test_preprocess_image_reports_orientation_and_rejects_unknown_headers():
+    meta = preprocess_image(_encode('JPEG', exif=_exif(8)))
+
+    assert meta['orientation'] == 8
+    with pytest.raises(ImagePipelineError, match='Unsupported or invalid image header'):
+        preprocess_image(b'%PDF-1.7 not an image')
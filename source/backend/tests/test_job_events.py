@@ -0,0 +1,99 @@
+import asyncio
+import json
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.events import JobEventHub, JobStatusEvent
+from app.main import app, job_events, job_store
+from app.store import InMemoryJobStore, JobMeta, utcnow
+
+client = TestClient(app)
+
+
+def _meta(job_id: str, status: str = 'queued') -> JobMeta:
+    return JobMeta(
+        job_id=job_id,
+        status=status,
+        filename='sample.png',
+        content_type='image/png',
+        size=10,
+        file_path='/tmp/sample.png',
+        created_at=utcnow(),
+    )
+
+
+def _events(response) -> list[tuple[str, dict]]:
+    events = []
+    for block in response.text.split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in lines:
+            events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def setup_function():
+    job_store.clear()
+
+
+def test_store_notifies_listeners_only_on_status_transitions():
+    store = InMemoryJobStore()
+    seen = []
+    store.add_listener(lambda job_id, status: seen.append((job_id, status)))
+    store.create(_meta('a'))
+
+    store.update('a', status='processing')
+    store.update('a', volume_mm3=1.0)
+    store.update('a', status='processed')
+
+    assert seen == [('a', 'processing'), ('a', 'processed')]
+
+
+def test_hub_delivers_thread_published_events_to_subscriber():
+    hub = JobEventHub()
+
+    async def _scenario():
+        with hub.subscribe(['a']) as subscription:
+            threading.Thread(target=hub.publish, args=('a', 'processed')).start()
+            hub.publish('b', 'processed')
+            assert await subscription.get(1.0) == JobStatusEvent('a', 'processed')
+            assert await subscription.get(0.01) is None
+            assert hub.subscription_count() == 1
+        assert hub.subscription_count() == 0
+
+    asyncio.run(_scenario())
+
+
+def test_event_stream_pushes_transitions_until_terminal():
+    job_store.create(_meta('running'))
+    job_store.create(_meta('done', status='processed'))
+
+    def _advance():
+        # Wait for the stream to subscribe so the transitions are pushed, not snapshotted.
+        while job_events.subscription_count() == 0:
+            threading.Event().wait(0.005)
+        job_store.update('running', status='processing')
+        job_store.update('running', status='processed')
+
+    threading.Thread(target=_advance).start()
+    res = client.get('/api/v1/jobs/events', params=[('job_id', 'running'), ('job_id', 'done'), ('job_id', 'nope')])
+
+    assert res.status_code == 200
+    assert res.headers['content-type'].startswith('text/event-stream')
+    assert _events(res) == [
+        ('status', {'job_id': 'running', 'status': 'queued'}),
+        ('status', {'job_id': 'done', 'status': 'processed'}),
+        ('missing', {'job_id': 'nope'}),
+        ('status', {'job_id': 'running', 'status': 'processing'}),
+        ('status', {'job_id': 'running', 'status': 'processed'}),
+        ('end', {'pending': []}),
+    ]
+    assert job_events.subscription_count() == 0
+
+
+def test_event_stream_ends_with_pending_jobs_on_timeout():
+    job_store.create(_meta('slow'))
+
+    res = client.get('/api/v1/jobs/events', params={'job_id': 'slow', 'timeout': 0.05})
+
+    assert _events(res)[-1] == ('end', {'pending': ['slow']})
@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+from app.main import app, job_store
+from app.store import InMemoryJobStore, JobMeta
+
+client = TestClient(app)
+
+_T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _meta(index: int, status: str = 'processed', content_type: str = 'image/png', family: str | None = None) -> JobMeta:
+    return JobMeta(
+        job_id=f'job-{index:03d}',
+        status=status,
+        filename=f'{index}.png',
+        content_type=content_type,
+        size=10,
+        file_path=f'/tmp/{index}.png',
+        created_at=_T0 + timedelta(minutes=index),
+        quality_metrics={'blob': 'x' * 100},
+        shape_proxy={'shape_family': family} if family else None,
+    )
+
+
+def setup_function():
+    job_store.clear()
+
+
+def test_store_lists_newest_first_with_keyset_cursor():
+    store = InMemoryJobStore()
+    for index in range(5):
+        store.create(_meta(index))
+
+    first = store.list_jobs(limit=2)
+    assert [job.job_id for job in first] == ['job-004', 'job-003']
+    rest = store.list_jobs(before=(first[-1].created_at, first[-1].job_id), limit=10)
+    assert [job.job_id for job in rest] == ['job-002', 'job-001', 'job-000']
+
+
+def test_store_filters_follow_updates_and_deletes():
+    store = InMemoryJobStore()
+    store.create(_meta(0, status='queued'))
+    store.create(_meta(1, status='queued', content_type='image/jpeg'))
+    store.create(_meta(2, status='processing'))
+
+    store.update('job-000', status='processed', shape_proxy={'shape_family': 'cylindrical-like'})
+    store.delete('job-002')
+
+    assert [job.job_id for job in store.list_jobs(status=['queued', 'processing'])] == ['job-001']
+    assert [job.job_id for job in store.list_jobs(shape_family=['cylindrical-like'])] == ['job-000']
+    assert store.list_jobs(status=['processed'], content_type=['image/jpeg']) == []
+    assert [job.job_id for job in store.list_jobs(created_from=_T0 + timedelta(minutes=1))] == ['job-001']
+    assert [job.job_id for job in store.list_jobs(created_to=_T0 + timedelta(minutes=1))] == ['job-000']
+    assert store.count_by_status() == {'queued': 1, 'processed': 1}
+
+
+def test_list_jobs_api_paginates_with_filters_and_projection():
+    for index in range(5):
+        job_store.create(_meta(index, status='failed' if index % 2 else 'processed', family='cylindrical-like'))
+
+    res = client.get('/api/v1/jobs', params={'status': 'processed', 'limit': 2, 'fields': 'status,created_at'})
+    assert res.status_code == 200
+    body = res.json()
+    assert [item['job_id'] for item in body['items']] == ['job-004', 'job-002']
+    assert set(body['items'][0]) == {'job_id', 'status', 'created_at'}
+    assert body['next_cursor']
+
+    res = client.get('/api/v1/jobs', params={'status': 'processed', 'limit': 2, 'cursor': body['next_cursor']})
+    body = res.json()
+    assert [item['job_id'] for item in body['items']] == ['job-000']
+    assert body['items'][0]['quality_metrics'] == {'blob': 'x' * 100}
+    assert body['next_cursor'] is None
+
+    res = client.get('/api/v1/jobs', params=[('status', 'failed'), ('shape_family', 'cylindrical-like')])
+    assert [item['job_id'] for item in res.json()['items']] == ['job-003', 'job-001']
+
+
+def test_list_jobs_api_rejects_bad_cursor_and_fields():
+    assert client.get('/api/v1/jobs', params={'cursor': 'not-a-cursor'}).status_code == 400
+    assert client.get('/api/v1/jobs', params={'fields': 'status,secret'}).status_code == 400
+    assert client.get('/api/v1/jobs', params={'limit': 0}).status_code == 422
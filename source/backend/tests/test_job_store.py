@@ -0,0 +1,103 @@
+import threading
+
+from app.store import InMemoryJobStore, JobMeta, record_size, utcnow
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _meta(job_id: str, status: str = 'processed', batch_id: str | None = None) -> JobMeta:
+    return JobMeta(
+        job_id=job_id,
+        status=status,
+        filename='sample.png',
+        content_type='image/png',
+        size=10,
+        file_path='/tmp/sample.png',
+        created_at=utcnow(),
+        batch_id=batch_id,
+        quality_metrics={'segmentation': {'bbox': [0, 0, 10, 10], 'confidence': 0.9}},
+    )
+
+
+def test_job_meta_uses_slots():
+    meta = _meta('a')
+    assert not hasattr(meta, '__dict__')
+    assert record_size(meta) > 0
+
+
+def test_bounded_store_evicts_least_recently_used_completed_jobs():
+    store = InMemoryJobStore(max_jobs=2)
+    store.create(_meta('running', status='processing'))
+    store.create(_meta('a'))
+    store.create(_meta('b'))
+
+    assert store.get('a') is None
+    assert store.get('running') is not None
+    assert store.get('b') is not None
+    store.create(_meta('c'))
+
+    assert store.get('b') is None
+    assert store.get('running') is not None
+    stats = store.memory_stats()
+    assert stats['jobs'] == 2
+    assert stats['evictions'] == 2
+
+
+def test_bounded_store_enforces_byte_budget_and_ttl():
+    clock = _Clock()
+    size = record_size(_meta('x'))
+    store = InMemoryJobStore(max_bytes=size * 2 + size // 2, ttl_seconds=10, clock=clock)
+    for job_id in ('a', 'b', 'c'):
+        store.create(_meta(job_id))
+
+    assert store.get('a') is None
+    assert store.memory_stats()['bytes'] <= size * 2 + size // 2
+
+    clock.now = 9
+    store.get('c')
+    clock.now = 10
+    store.create(_meta('queued', status='queued'))
+    assert store.get('b') is None
+    assert store.get('c') is not None
+
+
+def test_bounded_store_spills_evicted_jobs_and_restores_on_write(tmp_path):
+    store = InMemoryJobStore(max_jobs=1, spill_dir=str(tmp_path / 'spill'))
+    store.create(_meta('a', batch_id='batch'))
+    store.create(_meta('b', batch_id='batch'))
+
+    spilled = store.get('a')
+    assert spilled is not None and spilled.quality_metrics == _meta('a').quality_metrics
+    assert [job.job_id for job in store.list_by_batch('batch')] == ['a', 'b']
+    assert store.memory_stats()['spilled'] == 1
+
+    updated = store.update('a', volume_mm3=1.5)
+    assert updated is not None and updated.volume_mm3 == 1.5
+    assert store.memory_stats()['spilled'] == 1
+    assert store.get('b') is not None and store.get('a').volume_mm3 == 1.5
+
+    store.delete('b')
+    assert store.get('b') is None
+    assert store.get('../a') is None
+
+
+def test_update_returns_snapshot_and_reads_do_not_wait_for_writer():
+    store = InMemoryJobStore()
+    store.create(_meta('a', status='queued'))
+
+    snapshot = store.update('a', status='processing')
+    store.update('a', status='processed', volume_mm3=2.0)
+    assert snapshot.status == 'processing' and snapshot.volume_mm3 is None
+
+    result = []
+    with store._lock:
+        reader = threading.Thread(target=lambda: result.append(store.get('a')))
+        reader.start()
+        reader.join(timeout=1)
+    assert result and result[0].status == 'processed'
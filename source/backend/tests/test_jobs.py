@@ -1,14 +1,23 @@
+import hashlib
+import threading
 from pathlib import Path
 
 from fastapi.testclient import TestClient
 
-from app.main import app, job_store
+from app.config import settings
+from app.image_pipeline import segment_image
+from app.main import app, job_store, result_cache
 from app.store import LocalFileStorage
+from app.worker import JobWorkerPool
 
 
 client = TestClient(app)
 
 
+def _stored_blobs(base_dir) -> list[Path]:
+    return sorted(path for path in Path(base_dir).rglob('*') if path.is_file())
+
+
 def _png_1x1_bytes() -> bytes:
     return (
         b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01'
@@ -28,6 +37,7 @@ def _create_sample_job(tmp_path, monkeypatch) -> str:
 
 def setup_function():
     job_store.clear()
+    result_cache.clear()
 
 
 def test_create_job_success(tmp_path, monkeypatch):
@@ -43,9 +53,9 @@ def test_create_job_success(tmp_path, monkeypatch):
     assert data['status'] == 'processed'
     assert 'job_id' in data
 
-    saved_files = list(Path(tmp_path).iterdir())
+    saved_files = _stored_blobs(tmp_path)
     assert len(saved_files) == 1
-    assert saved_files[0].suffix == '.png'
+    assert saved_files[0].name == hashlib.sha256(_png_1x1_bytes()).hexdigest()
 
 
 def test_create_job_missing_file():
@@ -166,7 +176,7 @@ def test_patch_dimensions_clamp_boundaries(tmp_path, monkeypatch):
 
 def test_create_job_pipeline_failure_marks_failed(tmp_path, monkeypatch):
     monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
-    monkeypatch.setattr('app.main.segment_image', lambda _: (_ for _ in ()).throw(RuntimeError('seg failed')))
+    monkeypatch.setattr('app.main.segment_image', lambda _, **__: (_ for _ in ()).throw(RuntimeError('seg failed')))
 
     create_res = client.post(
         '/api/v1/jobs',
@@ -192,7 +202,7 @@ def test_shape_proxy_fill_ratio_clamp_boundary(tmp_path, monkeypatch):
     monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
     monkeypatch.setattr(
         'app.main.segment_image',
-        lambda _: {
+        lambda _, **__: {
             'mask_width': 64,
             'mask_height': 64,
             'foreground_ratio': 9.9,
@@ -218,3 +228,158 @@ def test_get_job_status_not_found():
 
     assert res.status_code == 404
     assert res.json()['detail'] == 'Job not found'
+
+
+def test_create_job_queued_mode_returns_before_pipeline_finishes(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    monkeypatch.setattr(settings, 'job_execution_mode', 'queued')
+    pool = JobWorkerPool(max_workers=1, max_queue=1)
+    monkeypatch.setattr('app.main.job_workers', pool)
+
+    release = threading.Event()
+
+    def _blocking_segment(content, **kwargs):
+        release.wait(timeout=5)
+        return segment_image(content, **kwargs)
+
+    monkeypatch.setattr('app.main.segment_image', _blocking_segment)
+
+    create_res = client.post(
+        '/api/v1/jobs',
+        files={'file': ('sample.png', _png_1x1_bytes(), 'image/png')},
+    )
+
+    assert create_res.status_code == 201
+    assert create_res.json()['status'] in {'queued', 'processing'}
+    job_id = create_res.json()['job_id']
+    assert client.get(f'/api/v1/jobs/{job_id}').json()['status'] in {'queued', 'processing'}
+
+    release.set()
+    pool.shutdown(wait=True)
+    assert client.get(f'/api/v1/jobs/{job_id}').json()['status'] == 'processed'
+
+
+def test_create_job_rejected_with_429_when_queue_full(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    monkeypatch.setattr(settings, 'job_execution_mode', 'queued')
+    pool = JobWorkerPool(max_workers=1, max_queue=0)
+    monkeypatch.setattr('app.main.job_workers', pool)
+
+    release = threading.Event()
+    monkeypatch.setattr('app.main.segment_image', lambda _, **__: release.wait(timeout=5) and {})
+
+    first = client.post('/api/v1/jobs', files={'file': ('a.png', _png_1x1_bytes(), 'image/png')})
+    second = client.post('/api/v1/jobs', files={'file': ('b.png', _png_1x1_bytes(), 'image/png')})
+
+    release.set()
+    pool.shutdown(wait=True)
+
+    assert first.status_code == 201
+    assert second.status_code == 429
+    assert second.json()['detail'] == 'Job queue is full'
+    assert len(_stored_blobs(tmp_path)) == 1
+
+
+def test_create_job_records_size_and_content_hash(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    monkeypatch.setattr(settings, 'upload_chunk_bytes', 7)
+
+    job_id = client.post(
+        '/api/v1/jobs',
+        files={'file': ('sample.png', _png_1x1_bytes(), 'image/png')},
+    ).json()['job_id']
+
+    meta = job_store.get(job_id)
+    assert meta is not None
+    assert meta.size == len(_png_1x1_bytes())
+    assert meta.content_sha256 == hashlib.sha256(_png_1x1_bytes()).hexdigest()
+    assert Path(meta.file_path).read_bytes() == _png_1x1_bytes()
+
+
+def test_create_job_rejects_oversized_upload(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    monkeypatch.setattr(settings, 'max_upload_bytes', 16)
+
+    res = client.post(
+        '/api/v1/jobs',
+        files={'file': ('sample.png', _png_1x1_bytes(), 'image/png')},
+    )
+
+    assert res.status_code == 413
+    assert _stored_blobs(tmp_path) == []
+
+
+def test_duplicate_upload_reuses_cached_result_with_new_job(tmp_path, monkeypatch):
+    first_id = _create_sample_job(tmp_path, monkeypatch)
+    monkeypatch.setattr('app.main.segment_image', lambda _, **__: (_ for _ in ()).throw(RuntimeError('not cached')))
+
+    second_id = _create_sample_job(tmp_path, monkeypatch)
+
+    first = client.get(f'/api/v1/jobs/{first_id}/result').json()
+    second = client.get(f'/api/v1/jobs/{second_id}/result').json()
+    assert second_id != first_id
+    assert second['status'] == 'processed'
+    assert second['dimensions_mm'] == first['dimensions_mm']
+    assert second['shape_proxy'] == first['shape_proxy']
+
+    stats = client.get('/api/v1/cache/stats').json()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+def test_failed_pipeline_result_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    with monkeypatch.context() as m:
+        m.setattr('app.main.segment_image', lambda _, **__: (_ for _ in ()).throw(RuntimeError('seg failed')))
+        failed = client.post('/api/v1/jobs', files={'file': ('a.png', _png_1x1_bytes(), 'image/png')})
+
+    retried = client.post('/api/v1/jobs', files={'file': ('a.png', _png_1x1_bytes(), 'image/png')})
+
+    assert failed.json()['status'] == 'failed'
+    assert retried.json()['status'] == 'processed'
+
+
+def _jpeg_with_large_app_segments(width: int, height: int, padding: int) -> bytes:
+    import io
+
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 200, 200)).save(buffer, format='JPEG')
+    data = buffer.getvalue()
+    # Stuff APP2 segments (as an ICC profile would) between the JFIF header and the frame header.
+    app0_end = 4 + int.from_bytes(data[4:6], 'big')
+    segment = b'\xff\xe2' + (65535).to_bytes(2, 'big') + b'\x00' * 65533
+    return data[:app0_end] + segment * (padding // len(segment) + 1) + data[app0_end:]
+
+
+def test_create_job_reads_jpeg_dimensions_beyond_header_window(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    image = _jpeg_with_large_app_segments(40, 20, settings.upload_header_bytes)
+
+    job_id = client.post('/api/v1/jobs', files={'file': ('big.jpg', image, 'image/jpeg')}).json()['job_id']
+
+    result = client.get(f'/api/v1/jobs/{job_id}/result').json()
+    preprocess = result['quality_metrics']['preprocess']
+    assert (preprocess['width'], preprocess['height']) == (40, 20)
+    assert result['dimensions_mm']['width'] == 8.0
+
+
+def test_cached_duplicate_is_served_while_queue_is_full(tmp_path, monkeypatch):
+    _create_sample_job(tmp_path, monkeypatch)
+    pool = JobWorkerPool(max_workers=1, max_queue=0)
+    monkeypatch.setattr('app.main.job_workers', pool)
+    monkeypatch.setattr(settings, 'job_execution_mode', 'queued')
+
+    release = threading.Event()
+    monkeypatch.setattr('app.main.segment_image', lambda _, **__: release.wait(timeout=5) and {})
+    busy = client.post('/api/v1/jobs', files={'file': ('other.png', b'\x89PNG\r\n\x1a\n' + b'\x00' * 32, 'image/png')})
+    assert pool.is_full
+
+    duplicate = client.post('/api/v1/jobs', files={'file': ('sample.png', _png_1x1_bytes(), 'image/png')})
+
+    release.set()
+    pool.shutdown(wait=True)
+    assert busy.status_code == 201
+    assert duplicate.status_code == 201
+    assert duplicate.json()['status'] == 'processed'
@@ -0,0 +1,104 @@
+import io
+import json
+import math
+import struct
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.artifacts import ArtifactCache
+from app.main import app, calibration_profiles, job_store, result_cache
+from app.mesh import build_mesh, encode_glb, extrude, mesh_spec, revolve
+from app.store import LocalFileStorage
+
+client = TestClient(app)
+
+
+def _signed_volume(mesh) -> float:
+    a, b, c = (mesh.positions[mesh.indices[:, k]].astype(np.float64) for k in range(3))
+    return float(np.einsum('ij,ij->i', a, np.cross(b, c)).sum() / 6)
+
+
+def _is_closed(mesh) -> bool:
+    # Every directed edge of a closed, consistently wound surface has its reverse twin.
+    tri = mesh.indices
+    edges = np.concatenate((tri[:, [0, 1]], tri[:, [1, 2]], tri[:, [2, 0]]))
+    return {tuple(edge) for edge in edges} == {tuple(edge) for edge in edges[:, ::-1]}
+
+
+def _frame() -> bytes:
+    pixels = np.full((600, 800, 3), 230, dtype=np.uint8)
+    pixels[100:500, 340:460] = (200, 60, 90)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def setup_function():
+    job_store.clear()
+    result_cache.clear()
+    calibration_profiles.clear()
+
+
+def test_revolve_and_extrude_build_closed_outward_meshes():
+    cylinder = revolve(60, 60, 150, [1.0] * 16)
+    assert _is_closed(cylinder)
+    # 48-gon inscribed in the circle: slightly under pi * r^2 * h, in m^3.
+    assert _signed_volume(cylinder) == pytest.approx(math.pi * 0.03**2 * 0.15, rel=0.01)
+
+    box = extrude(40, 20, 100, [1.0] * 16)
+    assert _is_closed(box)
+    assert _signed_volume(box) == pytest.approx(0.04 * 0.02 * 0.1, rel=1e-5)
+
+    tapered = extrude(40, 20, 100, np.linspace(0.5, 1.0, 16))
+    assert _signed_volume(tapered) == pytest.approx(0.75 * 0.04 * 0.02 * 0.1, rel=1e-5)
+
+
+def test_glb_encoding_and_spec_key():
+    spec = mesh_spec('cylindrical-like', {'width': 50, 'height': 120, 'depth': 50, 'max_diameter': 50}, [1.0] * 8)
+    assert spec['method'] == 'revolve'
+    assert spec == mesh_spec('cylindrical-like', {'width': 50.0, 'height': 120.0, 'depth': 50.0}, [1.0] * 8)
+    assert mesh_spec('prismatic-like', spec['dimensions_mm'], [1.0] * 8)['key'] != spec['key']
+
+    glb = encode_glb(build_mesh(spec))
+    magic, version, total = struct.unpack_from('<III', glb)
+    assert (magic, version, total) == (0x46546C67, 2, len(glb))
+    json_length, _ = struct.unpack_from('<II', glb, 12)
+    document = json.loads(glb[20:20 + json_length])
+    assert document['accessors'][1]['max'][1] == pytest.approx(0.12)
+
+
+def test_job_mesh_is_served_with_etag_and_ranges_and_rebuilt_on_new_dimensions(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path / 'uploads')))
+    monkeypatch.setattr('app.main.artifact_cache', ArtifactCache(tmp_path / 'artifacts', 1 << 24))
+    job_id = client.post('/api/v1/jobs', files={'file': ('bottle.png', _frame(), 'image/png')}).json()['job_id']
+
+    result = client.get(f'/api/v1/jobs/{job_id}/result').json()
+    assert result['mesh_url'] == f'/api/v1/jobs/{job_id}/mesh.glb'
+    full = client.get(result['mesh_url'])
+    assert full.status_code == 200
+    assert full.headers['content-type'] == 'model/gltf-binary'
+    assert full.content[:4] == b'glTF'
+    etag = full.headers['etag']
+
+    assert client.get(result['mesh_url'], headers={'If-None-Match': etag}).status_code == 304
+    part = client.get(result['mesh_url'], headers={'Range': 'bytes=0-11'})
+    assert part.status_code == 206
+    assert part.content == full.content[:12]
+    assert part.headers['content-range'] == f'bytes 0-11/{len(full.content)}'
+    tail = client.get(result['mesh_url'], headers={'Range': 'bytes=-4'})
+    assert tail.content == full.content[-4:]
+    assert client.get(result['mesh_url'], headers={'Range': 'bytes=999999999-'}).status_code == 416
+    stale = client.get(result['mesh_url'], headers={'Range': 'bytes=0-11', 'If-Range': '"other"'})
+    assert stale.status_code == 200
+
+    dimensions = result['dimensions_mm']
+    client.patch(f'/api/v1/jobs/{job_id}/dimensions', json=dimensions)
+    assert client.get(result['mesh_url']).headers['etag'] == etag
+
+    client.patch(f'/api/v1/jobs/{job_id}/dimensions', json={**dimensions, 'height': 200})
+    rebuilt = client.get(result['mesh_url'])
+    assert rebuilt.headers['etag'] != etag
+    assert rebuilt.content != full.content
@@ -0,0 +1,88 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app, job_store, result_cache
+from app.metrics import MetricsRegistry
+from app.store import LocalFileStorage
+
+
+client = TestClient(app)
+
+
+def _png_1x1_bytes() -> bytes:
+    return (
+        b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01'
+        b'\x08\x06\x00\x00\x00\x1f\x15\xc4\x89\x00\x00\x00\x0bIDATx\x9cc\x00\x01\x00\x00\x05\x00\x01\r\n-\xb4\x00\x00\x00\x00IEND\xaeB`\x82'
+    )
+
+
+def setup_function():
+    job_store.clear()
+    result_cache.clear()
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix + ' '):
+            return float(line.rsplit(' ', 1)[1])
+    raise AssertionError(f'{prefix} not found')
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('demo_seconds', 'Demo latency.', ('stage',), buckets=(0.1, 1.0))
+    counter = registry.counter('demo_total', 'Demo count.', ('route',))
+    registry.gauge('demo_depth', 'Demo depth.', lambda: 3)
+    registry.callback_counter('demo_hits_total', 'Demo hits.', lambda: {('hit',): 4}, ('result',))
+
+    histogram.observe(0.05, 'a')
+    histogram.observe(0.5, 'a')
+    histogram.observe(5.0, 'a')
+    counter.inc(2, 'jo"bs')
+
+    assert registry.render().splitlines() == [
+        '# HELP demo_seconds Demo latency.',
+        '# TYPE demo_seconds histogram',
+        'demo_seconds_bucket{stage="a",le="0.1"} 1',
+        'demo_seconds_bucket{stage="a",le="1"} 2',
+        'demo_seconds_bucket{stage="a",le="+Inf"} 3',
+        'demo_seconds_sum{stage="a"} 5.55',
+        'demo_seconds_count{stage="a"} 3',
+        '# HELP demo_total Demo count.',
+        '# TYPE demo_total counter',
+        'demo_total{route="jo\\"bs"} 2',
+        '# HELP demo_depth Demo depth.',
+        '# TYPE demo_depth gauge',
+        'demo_depth 3',
+        '# HELP demo_hits_total Demo hits.',
+        '# TYPE demo_hits_total counter',
+        'demo_hits_total{result="hit"} 4',
+    ]
+    with pytest.raises(ValueError):
+        registry.callback_counter('demo_hits', 'Missing suffix.', lambda: 0)
+
+
+def test_job_records_stage_timings_and_metrics_endpoint_reports_them(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    before = client.get('/metrics').text
+    bytes_before = _sample(before, 'packaging_upload_bytes_total{route="jobs"}') if 'route="jobs"' in before else 0.0
+
+    job_id = client.post('/api/v1/jobs', files={'file': ('a.png', _png_1x1_bytes(), 'image/png')}).json()['job_id']
+    client.post('/api/v1/jobs', files={'file': ('b.png', _png_1x1_bytes(), 'image/png')})
+
+    timings = client.get(f'/api/v1/jobs/{job_id}').json()['stage_timings_ms']
+    assert set(timings) == {
+        'save', 'preprocess', 'segment', 'calibrate', 'shape_proxy', 'dimensions', 'mesh', 'packaging', 'quality'
+    }
+    assert all(value >= 0 for value in timings.values())
+
+    res = client.get('/metrics')
+    assert res.status_code == 200
+    assert res.headers['content-type'].startswith('text/plain; version=0.0.4')
+    text = res.text
+    assert _sample(text, 'packaging_jobs{status="processed"}') == 2
+    assert _sample(text, 'packaging_upload_bytes_total{route="jobs"}') - bytes_before == 2 * len(_png_1x1_bytes())
+    assert _sample(text, 'packaging_result_cache_lookups_total{result="hit"}') == 1
+    assert _sample(text, 'packaging_result_cache_hit_ratio') == 0.5
+    assert _sample(text, 'packaging_job_queue_depth') == 0
+    assert 'packaging_stage_duration_seconds_bucket{stage="segment",le="+Inf"}' in text
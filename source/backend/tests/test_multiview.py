@@ -0,0 +1,95 @@
+import io
+import math
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.main import app, calibration_profiles, job_store, result_cache
+from app.multiview import PROFILE_BINS, fuse_views
+from app.store import LocalFileStorage
+
+client = TestClient(app)
+
+MM_PER_PX = 0.25
+
+
+def _view(width_mm: float, height_mm: float, round_top: bool = False) -> bytes:
+    # 0.25 mm/px frame with an ID-1 card for scale and the product (or its round footprint).
+    pixels = np.full((1200, 1600, 3), 230, dtype=np.uint8)
+    pixels[900:900 + round(53.98 / MM_PER_PX), 100:100 + round(85.6 / MM_PER_PX)] = (30, 30, 40)
+    width, height = round(width_mm / MM_PER_PX), round(height_mm / MM_PER_PX)
+    if round_top:
+        yy, xx = np.mgrid[:1200, :1600]
+        pixels[(xx - 1100) ** 2 + (yy - 400) ** 2 <= (width / 2) ** 2] = (200, 60, 90)
+    else:
+        pixels[100:100 + height, 1000:1000 + width] = (200, 60, 90)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _record(width: float, height: float, fill: float = 1.0) -> dict:
+    return {'width_mm': width, 'height_mm': height, 'fill_ratio': fill, 'profile_mm': [width] * PROFILE_BINS}
+
+
+def setup_function():
+    job_store.clear()
+    result_cache.clear()
+    calibration_profiles.clear()
+
+
+def test_fuse_views_uses_side_depth_and_cross_section():
+    box = fuse_views({'front': _record(40, 100), 'side': _record(20, 100)})
+    assert box['dimensions_mm'] == {'width': 40, 'height': 100, 'depth': 20}
+    assert box['volume_mm3'] == pytest.approx(80000)
+    assert box['fusion']['cross_section'] == 'rectangle'
+
+    bottle = fuse_views({'front': _record(50, 100), 'side': _record(50, 100)})
+    assert bottle['fusion']['cross_section'] == 'ellipse'
+    assert bottle['volume_mm3'] == pytest.approx(math.pi * 25**2 * 100)
+
+    topped = fuse_views({'front': _record(50, 100), 'side': _record(50, 100), 'top': _record(50, 50, fill=0.5)})
+    assert topped['volume_mm3'] == pytest.approx(125000)
+
+
+def test_multiview_job_fuses_views_and_reuses_unchanged_ones(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    files = {
+        'front': ('front.png', _view(60, 150), 'image/png'),
+        'side': ('side.png', _view(60, 150), 'image/png'),
+        'top': ('top.png', _view(60, 60, round_top=True), 'image/png'),
+    }
+    res = client.post('/api/v1/jobs/multiview', files=files)
+    assert res.status_code == 201
+    job_id = res.json()['job_id']
+
+    job = client.get(f'/api/v1/jobs/{job_id}').json()
+    assert job['status'] == 'processed'
+    assert set(job['views']) == {'front', 'side', 'top'}
+    assert job['dimensions_mm']['width'] == pytest.approx(60, abs=1.5)
+    assert job['dimensions_mm']['depth'] == pytest.approx(60, abs=1.5)
+    assert job['dimensions_mm']['height'] == pytest.approx(150, abs=1.5)
+    assert job['volume_mm3'] == pytest.approx(math.pi * 30**2 * 150, rel=0.05)
+    assert job['quality_metrics']['fusion']['reused_views'] == []
+
+    res = client.put(f'/api/v1/jobs/{job_id}/views/side', files={'file': ('side.png', _view(40, 150), 'image/png')})
+    assert res.status_code == 200
+    job = client.get(f'/api/v1/jobs/{job_id}').json()
+    assert job['quality_metrics']['fusion']['reused_views'] == ['front', 'top']
+    assert job['dimensions_mm']['depth'] == pytest.approx(50, abs=1.5)
+
+
+def test_multiview_requires_front_and_side_and_view_replace_needs_multiview_job(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    res = client.post('/api/v1/jobs/multiview', files={'front': ('front.png', _view(60, 150), 'image/png')})
+    assert res.status_code == 422
+
+    single = client.post('/api/v1/jobs', files={'file': ('one.png', _view(60, 150), 'image/png')}).json()
+    res = client.put(
+        f"/api/v1/jobs/{single['job_id']}/views/side", files={'file': ('side.png', _view(40, 150), 'image/png')}
+    )
+    assert res.status_code == 409
+    res = client.put('/api/v1/jobs/missing/views/back', files={'file': ('x.png', b'x', 'image/png')})
+    assert res.status_code == 422
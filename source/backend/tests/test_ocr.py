@@ -1,8 +1,15 @@
+import io
+import threading
+
+import numpy as np
 from fastapi.testclient import TestClient
+from PIL import Image
 
 from app.main import app
+from app.ocr_backend import OCREnginePool, OCRLine
 from app.ocr_engine import extract_dimension_candidates
 
+
 client = TestClient(app)
 
 
@@ -32,3 +39,135 @@ def test_parse_normalizes_comma_decimal():
     result = extract_dimension_candidates(raw)
     parsed = [(item['text'], item['value'], item['unit']) for item in result['items']]
     assert ('10.5mm', 10.5, 'mm') in parsed
+
+
+class _FakeBackend:
+    name = 'fake'
+    instances = 0
+
+    def __init__(self) -> None:
+        type(self).instances += 1
+
+    def recognize(self, image):
+        return [OCRLine('W 48 mm', [0, 0, 10, 5], 0.9), OCRLine('H 27mm', [0, 6, 10, 11], 0.8)]
+
+    def close(self) -> None:
+        pass
+
+
+def _png_image_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new('L', (8, 8), color=255).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def test_extract_uses_warm_engine_pool():
+    _FakeBackend.instances = 0
+    pool = OCREnginePool(_FakeBackend, size=2)
+
+    results = [extract_dimension_candidates(_png_image_bytes(), pool=pool) for _ in range(5)]
+
+    assert _FakeBackend.instances == 2
+    assert all(r['engine_available'] for r in results)
+    parsed = [(item['text'], item['unit']) for item in results[0]['items']]
+    assert ('48 mm', 'mm') in parsed
+    assert ('27mm', 'mm') in parsed
+    assert pool.idle == 2
+
+
+def test_engine_pool_bounds_concurrency():
+    pool = OCREnginePool(_FakeBackend, size=1)
+    held = threading.Event()
+    release = threading.Event()
+    acquired_second = threading.Event()
+
+    def _hold():
+        with pool.acquire():
+            held.set()
+            release.wait(timeout=5)
+
+    def _second():
+        with pool.acquire():
+            acquired_second.set()
+
+    first = threading.Thread(target=_hold)
+    first.start()
+    held.wait(timeout=5)
+    second = threading.Thread(target=_second)
+    second.start()
+
+    assert not acquired_second.wait(timeout=0.1)
+    release.set()
+    assert acquired_second.wait(timeout=5)
+    first.join()
+    second.join()
+
+
+def test_extract_reports_engine_unavailable_without_backend():
+    result = extract_dimension_candidates(b'W: 10 mm', pool=OCREnginePool(None, size=4))
+
+    assert result['engine_available'] is False
+    assert result['items'][0]['value'] == 10.0
+
+
+def test_fallback_does_not_scan_images_or_large_files(tmp_path):
+    pool = OCREnginePool(None, size=1)
+    image_path = tmp_path / 'label.png'
+    image_path.write_bytes(_png_image_bytes() + b'W: 10 mm')
+    large_path = tmp_path / 'large.txt'
+    large_path.write_bytes(b'W: 10 mm ' * 10000)
+
+    assert extract_dimension_candidates(image_path, pool=pool)['items'] == []
+    assert extract_dimension_candidates(large_path, pool=pool)['items'] == []
+
+
+class _CropRecordingBackend:
+    name = 'crop-recorder'
+
+    def __init__(self) -> None:
+        self.sizes: list[tuple[int, int]] = []
+
+    def recognize(self, image):
+        self.sizes.append(image.size)
+        width, height = image.size
+        return [OCRLine('W 30 mm', [0, 0, width // 2, height // 2], 0.9)]
+
+    def close(self) -> None:
+        pass
+
+
+def test_extract_roi_mode_ocrs_only_mask_regions_and_maps_bboxes():
+    pixels = np.full((500, 1000), 250, dtype=np.uint8)
+    pixels[100:150, 200:400] = 10
+    pixels[300:340, 600:900] = 10
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    backend = _CropRecordingBackend()
+
+    result = extract_dimension_candidates(buffer.getvalue(), pool=OCREnginePool(lambda: backend, size=2), mode='roi')
+
+    assert result['mode'] == 'roi'
+    assert len(backend.sizes) == 2
+    assert all(w * h < 1000 * 500 / 10 for w, h in backend.sizes)
+    bboxes = sorted(item['bbox'] for item in result['items'])
+    assert len(bboxes) == 2
+    first, second = bboxes
+    assert 190 <= first[0] <= 200 and 90 <= first[1] <= 100
+    assert 590 <= second[0] <= 600 and 290 <= second[1] <= 300
+    assert first[2] < 400 and second[2] < 900
+
+
+def test_extract_roi_mode_downscales_large_crops(monkeypatch):
+    monkeypatch.setattr('app.ocr_engine.settings.ocr_roi_max_side', 100)
+    pixels = np.full((400, 800), 250, dtype=np.uint8)
+    pixels[50:350, 100:700] = 10
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    backend = _CropRecordingBackend()
+
+    result = extract_dimension_candidates(buffer.getvalue(), pool=OCREnginePool(lambda: backend, size=1), mode='roi')
+
+    assert max(backend.sizes[0]) == 100
+    x0, y0, x1, y1 = result['items'][0]['bbox']
+    assert 95 <= x0 <= 100 and 45 <= y0 <= 50
+    assert 395 <= x1 <= 405 and 195 <= y1 <= 205
@@ -3,6 +3,8 @@ import json
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.metrics import OCR_ENGINE_FAILURES
+from app.ocr_backend import OCREnginePool
 
 
 client = TestClient(app)
@@ -34,7 +36,7 @@ def test_map_dimensions_api_with_ocr_items_only():
 def test_map_dimensions_api_uses_extractor_when_ocr_items_missing(monkeypatch):
     monkeypatch.setattr(
         'app.main.extract_dimension_candidates',
-        lambda _: [
+        lambda _, **__: [
             {'text': 'W 1 cm', 'confidence': 0.9},
             {'text': 'H 2 cm', 'confidence': 0.9},
             {'text': 'D 3 cm', 'confidence': 0.9},
@@ -50,6 +52,116 @@ def test_map_dimensions_api_uses_extractor_when_ocr_items_missing(monkeypatch):
     assert res.json()['mapped_dimensions_mm'] == {'width': 10.0, 'height': 20.0, 'depth': 30.0}
 
 
+class _BrokenBackend:
+    name = 'broken'
+
+    def recognize(self, image):
+        raise RuntimeError('model crashed')
+
+    def close(self) -> None:
+        pass
+
+
+def test_map_dimensions_api_reports_engine_failure(monkeypatch):
+    monkeypatch.setattr('app.ocr_engine.get_ocr_pool', lambda: OCREnginePool(_BrokenBackend, size=1))
+    failures = OCR_ENGINE_FAILURES.value('broken')
+
+    res = client.post(
+        '/api/v1/ocr/map-dimensions',
+        files={'file': ('sample.png', _png_1x1_bytes(), 'image/png')},
+    )
+
+    assert res.status_code == 200
+    body = res.json()
+    assert body['engine_available'] is False
+    assert body['fallback_reason'] == 'engine_error: RuntimeError'
+    assert body['mapped_dimensions_mm'] == {}
+    assert OCR_ENGINE_FAILURES.value('broken') == failures + 1
+
+    from_items = client.post('/api/v1/ocr/map-dimensions', data={'ocr_items': json.dumps([{'text': 'W 1 cm'}])})
+    assert from_items.json()['engine_available'] is None
+
+
 def test_map_dimensions_api_requires_input():
     res = client.post('/api/v1/ocr/map-dimensions')
     assert res.status_code == 400
+
+
+def _ndjson_lines(res) -> list[dict]:
+    return [json.loads(line) for line in res.text.splitlines() if line]
+
+
+def test_bulk_map_dimensions_json_array_streams_ndjson():
+    products = [
+        [
+            {'text': 'W 10 mm', 'confidence': 0.9},
+            {'text': 'H 20 mm', 'confidence': 0.9},
+            {'text': 'D 5 mm', 'confidence': 0.9},
+        ],
+        {'id': 'sku-2', 'ocr_items': [{'text': 'height 7 cm', 'confidence': '0.8'}]},
+    ]
+
+    res = client.post('/api/v1/ocr/map-dimensions/bulk', json=products)
+
+    assert res.status_code == 200
+    assert res.headers['content-type'].startswith('application/x-ndjson')
+    first, second, summary = _ndjson_lines(res)
+    assert first['index'] == 0
+    assert first['mapped_dimensions_mm'] == {'width': 10.0, 'height': 20.0, 'depth': 5.0}
+    assert second['id'] == 'sku-2'
+    assert second['mapped_dimensions_mm'] == {'height': 70.0}
+    assert summary['summary'] == {'products': 2, 'errors': 0, 'warning_counts': {'missing_required': 1}}
+
+
+def test_bulk_map_dimensions_ndjson_reports_invalid_lines():
+    body = '\n'.join(
+        [
+            json.dumps([{'text': 'W 1 cm', 'confidence': 0.9}]),
+            '{not json',
+            json.dumps({'ocr_items': 'nope'}),
+            '',
+        ]
+    )
+
+    res = client.post(
+        '/api/v1/ocr/map-dimensions/bulk',
+        content=body.encode(),
+        headers={'content-type': 'application/x-ndjson'},
+    )
+
+    assert res.status_code == 200
+    lines = _ndjson_lines(res)
+    assert [line.get('index') for line in lines[:3]] == [0, 1, 2]
+    assert lines[0]['mapped_dimensions_mm'] == {'width': 10.0}
+    assert 'error' in lines[1] and 'error' in lines[2]
+    assert lines[-1]['summary']['errors'] == 2
+
+
+def test_bulk_map_dimensions_rejects_non_finite_numbers_and_non_string_text():
+    body = '\n'.join(
+        [
+            '[{"text": "W 1 cm", "value": "nan", "confidence": 0.9}]',
+            '[{"text": "W 1 cm", "value": 1e999, "confidence": 0.9}]',
+            '[{"text": ["W 1 cm"], "confidence": 0.9}]',
+            '[{"text": "W 1 cm", "confidence": "inf"}]',
+            '[{"text": "H 2 cm", "confidence": 0.9}]',
+        ]
+    )
+
+    res = client.post(
+        '/api/v1/ocr/map-dimensions/bulk',
+        content=body.encode(),
+        headers={'content-type': 'application/x-ndjson'},
+    )
+
+    assert res.status_code == 200
+    assert 'NaN' not in res.text and 'Infinity' not in res.text
+    lines = _ndjson_lines(res)
+    assert all('error' in line for line in lines[:4])
+    assert lines[4]['mapped_dimensions_mm'] == {'height': 20.0}
+    assert lines[-1]['summary']['errors'] == 4
+
+
+def test_bulk_map_dimensions_rejects_non_array_json():
+    res = client.post('/api/v1/ocr/map-dimensions/bulk', json={'ocr_items': []})
+    assert res.status_code == 400
@@ -0,0 +1,148 @@
+import io
+import json
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from app.main import app, calibration_profiles, job_store, result_cache
+from app.packaging import (
+    DEFAULT_CATALOGUE,
+    PackagingCatalogue,
+    PackagingError,
+    PackagingSize,
+    load_catalogue,
+)
+from app.store import LocalFileStorage
+
+client = TestClient(app)
+
+CATALOGUE = PackagingCatalogue(DEFAULT_CATALOGUE)
+
+
+def _frame() -> bytes:
+    pixels = np.full((600, 800, 3), 230, dtype=np.uint8)
+    pixels[100:500, 340:460] = (200, 60, 90)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels).save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def setup_function():
+    job_store.clear()
+    result_cache.clear()
+    calibration_profiles.clear()
+
+
+def test_fit_picks_smallest_container_with_clearance_in_any_orientation():
+    bottle = CATALOGUE.fit({'width': 40, 'depth': 40, 'height': 120}, 'cylindrical-like')
+    assert bottle['required_mm'] == [43.0, 43.0, 123.0]
+    assert bottle['container']['code'] == 'CT-50'
+    assert bottle['fill_ratio'] == pytest.approx(40 * 40 * 120 / (45 * 45 * 130), abs=1e-4)
+
+    # 36 mm fits CT-30 snug as a prism, but not with the larger clearance of a round product.
+    square = {'width': 36, 'depth': 36, 'height': 100}
+    assert CATALOGUE.fit(square, 'vertical-prismatic-like')['container']['code'] == 'CT-30'
+    assert CATALOGUE.fit(square, 'cylindrical-like')['container']['code'] == 'CT-50'
+
+    lying = CATALOGUE.fit({'width': 100, 'depth': 15, 'height': 70}, 'horizontal-prismatic-like')
+    assert lying['container']['code'] == 'CT-PALETTE'
+    assert CATALOGUE.fit({'width': 700, 'depth': 40, 'height': 40}, None)['container'] is None
+
+
+def test_sorted_index_matches_a_linear_scan():
+    rng = np.random.default_rng(7)
+    sizes = [PackagingSize(f'B{i}', 'box', tuple(rng.uniform(10, 300, 3).round(1))) for i in range(400)]
+    catalogue = PackagingCatalogue(sizes)
+    for dims in rng.uniform(5, 250, (200, 3)):
+        product = {'width': dims[0], 'depth': dims[1], 'height': dims[2]}
+        need = sorted(catalogue.fit(product, None)['required_mm'], reverse=True)
+        fitting = [s for s in sizes if all(a >= b for a, b in zip(sorted(s.inner_mm, reverse=True), need))]
+        expected = min(fitting, key=lambda s: np.prod(s.inner_mm), default=None)
+        container = catalogue.fit(product, None)['container']
+        assert (container and container['code']) == (expected and expected.code)
+
+
+def test_case_packs_lay_out_many_skus_at_once():
+    unit = CATALOGUE.fit({'width': 40, 'depth': 40, 'height': 120}, 'cylindrical-like')['container']['outer_mm']
+    twelve, densest, too_many = CATALOGUE.case_packs([unit, [10, 10, 10], unit], [12, None, 10000])
+
+    assert twelve['case']['code'] == 'CS-M'
+    assert twelve['units_per_case'] == 12
+    assert twelve['capacity'] >= 12
+    nx, ny, layers = twelve['grid']
+    assert nx * ny * layers >= 12
+    assert all(c >= u * n for c, u, n in zip(twelve['case']['inner_mm'], twelve['unit_mm'], twelve['grid']))
+
+    assert densest['case']['code'] == 'CS-XL'
+    assert densest['fill_ratio'] == 1.0
+    assert too_many is None
+
+
+def test_load_catalogue_validates_entries(tmp_path):
+    path = tmp_path / 'catalogue.json'
+    path.write_text(json.dumps([{'code': 'A', 'kind': 'box', 'inner_mm': [10, 20, 30], 'wall_mm': 1}]))
+    assert load_catalogue(path) == (PackagingSize('A', 'box', (10.0, 20.0, 30.0), 1.0),)
+
+    path.write_text(json.dumps([{'code': 'A', 'kind': 'bag', 'inner_mm': [10, 20, 30]}]))
+    with pytest.raises(PackagingError):
+        load_catalogue(path)
+
+
+def test_packaging_api_follows_corrections_and_batches_case_packs(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    job_id = client.post('/api/v1/jobs', files={'file': ('bottle.png', _frame(), 'image/png')}).json()['job_id']
+
+    fit = client.get(f'/api/v1/jobs/{job_id}/packaging').json()
+    result = client.get(f'/api/v1/jobs/{job_id}/result').json()
+    assert result['quality_metrics']['packaging'] == fit
+
+    client.patch(f'/api/v1/jobs/{job_id}/dimensions', json={'width': 60, 'depth': 60, 'height': 180})
+    corrected = client.get(f'/api/v1/jobs/{job_id}/packaging').json()
+    assert corrected['container']['code'] == 'CT-200'
+    assert client.get(f'/api/v1/jobs/{job_id}/result').json()['quality_metrics']['packaging'] == corrected
+    assert client.get('/api/v1/jobs/missing/packaging').status_code == 404
+
+    res = client.post(
+        '/api/v1/packaging/case-packs',
+        json={
+            'items': [
+                {'sku': 'serum', 'job_id': job_id, 'units': 6},
+                {'sku': 'jar', 'dimensions_mm': {'width': 70, 'depth': 70, 'height': 50}, 'units': 24},
+                {'sku': 'ghost', 'job_id': 'missing'},
+                {'sku': 'bare'},
+            ]
+        },
+    )
+    assert res.status_code == 200
+    serum, jar, ghost, bare = res.json()['results']
+    assert serum['fit']['container']['code'] == 'CT-200'
+    assert serum['layout']['units_per_case'] == 6
+    assert jar['fit']['container']['code'] == 'BX-JAR-L'
+    assert jar['layout']['capacity'] >= 24
+    assert ghost['error_message'] == 'Job not found'
+    assert bare['error_message'] is not None and bare['layout'] is None
+
+
+def test_zero_and_negative_sides_are_rejected(tmp_path, monkeypatch):
+    for bad in ({'width': 0, 'depth': 40, 'height': 100}, {'width': 40, 'depth': -5, 'height': 100}):
+        fit = CATALOGUE.fit(bad, None)
+        assert fit['container'] is None and fit['fill_ratio'] is None
+        res = client.post('/api/v1/packaging/case-packs', json={'items': [{'sku': 'x', 'dimensions_mm': bad}]})
+        assert res.status_code == 422
+    res = client.post(
+        '/api/v1/packaging/case-packs', json={'items': [{'sku': 'x', 'dimensions_mm': {'width': 40, 'depth': 40}}]}
+    )
+    assert res.status_code == 422
+    with pytest.raises(PackagingError):
+        CATALOGUE.case_packs([[0, 10, 10]], [None])
+
+    # A job corrected down to a zero side is reported per item, not laid out.
+    monkeypatch.setattr('app.main.file_storage', LocalFileStorage(str(tmp_path)))
+    job_id = client.post('/api/v1/jobs', files={'file': ('bottle.png', _frame(), 'image/png')}).json()['job_id']
+    client.patch(f'/api/v1/jobs/{job_id}/dimensions', json={'width': 0, 'depth': 40, 'height': 100})
+    assert client.get(f'/api/v1/jobs/{job_id}/packaging').json()['container'] is None
+    res = client.post('/api/v1/packaging/case-packs', json={'items': [{'sku': 'flat', 'job_id': job_id}]})
+    flat = res.json()['results'][0]
+    assert res.status_code == 200 and flat['layout'] is None and 'positive' in flat['error_message']
@@ -0,0 +1,97 @@
+import os
+from dataclasses import replace
+from uuid import uuid4
+
+import pytest
+
+from app.store import JobMeta, utcnow
+
+TEST_DATABASE_URL = os.getenv('TEST_DATABASE_URL')
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason='TEST_DATABASE_URL not set')
+
+
+@pytest.fixture
+def pg_store():
+    from psycopg_pool import ConnectionPool
+
+    from app.pg_store import PostgresJobStore
+
+    with ConnectionPool(TEST_DATABASE_URL, min_size=1, max_size=2) as pool:
+        store = PostgresJobStore(pool)
+        store.ensure_schema()
+        store.clear()
+        yield store
+        store.clear()
+
+
+def _meta(job_id: str) -> JobMeta:
+    return JobMeta(
+        job_id=job_id,
+        status='queued',
+        filename='sample.png',
+        content_type='image/png',
+        size=10,
+        file_path='/tmp/sample.png',
+        created_at=utcnow(),
+    )
+
+
+def test_pg_store_create_get_update_roundtrip(pg_store):
+    job_id = str(uuid4())
+    pg_store.create(_meta(job_id))
+
+    updated = pg_store.update(
+        job_id,
+        status='processed',
+        dimensions_mm={'width': 1.0, 'height': 2.0, 'depth': 3.0},
+        volume_mm3=6.0,
+    )
+
+    assert updated is not None
+    assert updated.status == 'processed'
+    fetched = pg_store.get(job_id)
+    assert fetched is not None
+    assert fetched.dimensions_mm == {'width': 1.0, 'height': 2.0, 'depth': 3.0}
+    assert pg_store.get('missing') is None
+    assert pg_store.update('missing', status='failed') is None
+
+
+def test_pg_store_appends_corrections(pg_store):
+    job_id = str(uuid4())
+    pg_store.create(_meta(job_id))
+
+    pg_store.append_correction(job_id, {'fields': ['width']})
+    pg_store.append_correction(job_id, {'fields': ['height']})
+
+    fetched = pg_store.get(job_id)
+    assert fetched is not None
+    assert fetched.user_corrections == [{'fields': ['width']}, {'fields': ['height']}]
+
+
+def test_pg_store_lists_batch_in_submission_order(pg_store):
+    batch_id = str(uuid4())
+    job_ids = sorted((str(uuid4()) for _ in range(3)), reverse=True)
+    for seq, job_id in enumerate(job_ids):
+        pg_store.create(replace(_meta(job_id), batch_id=batch_id, batch_seq=seq))
+
+    assert [job.job_id for job in pg_store.list_by_batch(batch_id)] == job_ids
+
+
+def test_pg_store_lists_jobs_with_filters_cursor_and_projection(pg_store):
+    metas = [
+        replace(_meta(str(uuid4())), status=status, quality_metrics={'blob': 'x'})
+        for status in ('queued', 'failed', 'queued')
+    ]
+    for meta in metas:
+        pg_store.create(meta)
+    newest_first = sorted(metas, key=lambda meta: (meta.created_at, meta.job_id), reverse=True)
+
+    page = pg_store.list_jobs(status=['queued'], limit=1, fields=['status'])
+    queued = [meta.job_id for meta in newest_first if meta.status == 'queued']
+    assert [job.job_id for job in page] == queued[:1]
+    assert page[0].quality_metrics is None
+
+    rest = pg_store.list_jobs(status=['queued'], before=(page[0].created_at, page[0].job_id))
+    assert [job.job_id for job in rest] == queued[1:]
+    assert rest[0].quality_metrics == {'blob': 'x'}
@@ -0,0 +1,52 @@
+from app.cache import ResultCache, result_cache_key
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_result_cache_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, ttl_seconds=60)
+    cache.put('a', {'v': 1})
+    cache.put('b', {'v': 2})
+    assert cache.get('a') == {'v': 1}
+
+    cache.put('c', {'v': 3})
+
+    assert cache.get('b') is None
+    assert cache.get('a') == {'v': 1}
+    assert cache.stats()['evictions'] == 1
+
+
+def test_result_cache_expires_entries_after_ttl():
+    clock = _Clock()
+    cache = ResultCache(max_entries=4, ttl_seconds=10, clock=clock)
+    cache.put('a', {'v': 1})
+
+    clock.now = 9.9
+    assert cache.get('a') == {'v': 1}
+    clock.now = 10.0
+    assert cache.get('a') is None
+
+    stats = cache.stats()
+    assert stats['hits'] == 1
+    assert stats['misses'] == 1
+
+
+def test_result_cache_returns_independent_copies():
+    cache = ResultCache(max_entries=4, ttl_seconds=60)
+    cache.put('a', {'dims': {'width': 1.0}})
+
+    first = cache.get('a')
+    assert first is not None
+    first['dims']['width'] = 99.0
+
+    assert cache.get('a') == {'dims': {'width': 1.0}}
+
+
+def test_result_cache_key_includes_pipeline_version():
+    assert result_cache_key('abc', 'v1') != result_cache_key('abc', 'v2')
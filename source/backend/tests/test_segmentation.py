@@ -0,0 +1,85 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from app.image_pipeline import DUMMY_ALGORITHM, ImagePipelineError, run_segmentation, segment_image
+from app.segmentation import OTSU_ALGORITHM, WORKING_MAX_SIDE, mask_regions, otsu_threshold
+
+
+def _encode(image: Image.Image, fmt: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt)
+    return buffer.getvalue()
+
+
+def _dark_box_on_light(size: tuple[int, int], box: tuple[int, int, int, int]) -> Image.Image:
+    pixels = np.full((size[1], size[0]), 235, dtype=np.uint8)
+    x0, y0, x1, y1 = box
+    pixels[y0:y1, x0:x1] = 30
+    return Image.fromarray(pixels)
+
+
+def test_otsu_threshold_splits_bimodal_histogram():
+    values = np.concatenate([np.full(500, 20, dtype=np.uint8), np.full(500, 200, dtype=np.uint8)])
+
+    threshold, separability = otsu_threshold(values)
+
+    assert 20 <= threshold < 200
+    assert separability == pytest.approx(1.0)
+
+
+def test_segment_image_otsu_returns_mask_bbox_and_ratio():
+    image = _dark_box_on_light((200, 100), (50, 20, 150, 80))
+
+    result = run_segmentation(_encode(image, 'PNG'), OTSU_ALGORITHM)
+
+    assert result.mask.shape == (100, 200)
+    assert result.meta['bbox'] == [50, 20, 150, 80]
+    assert result.meta['bbox_normalized'] == [0.25, 0.2, 0.75, 0.8]
+    assert result.meta['foreground_ratio'] == pytest.approx(0.3, abs=0.01)
+    assert result.meta['algorithm'] == OTSU_ALGORITHM
+
+
+def test_segment_image_downsamples_to_working_resolution():
+    image = _dark_box_on_light((1600, 800), (400, 200, 1200, 600))
+
+    meta = segment_image(_encode(image, 'JPEG'), OTSU_ALGORITHM)
+
+    assert max(meta['mask_width'], meta['mask_height']) == WORKING_MAX_SIDE
+    assert meta['foreground_ratio'] == pytest.approx(0.25, abs=0.02)
+
+
+def test_segment_image_uses_alpha_channel_for_cutouts():
+    rgba = np.zeros((40, 40, 4), dtype=np.uint8)
+    rgba[10:30, 5:25] = (120, 120, 120, 255)
+
+    meta = segment_image(_encode(Image.fromarray(rgba), 'PNG'), OTSU_ALGORITHM)
+
+    assert meta['bbox'] == [5, 10, 25, 30]
+    assert meta['foreground_ratio'] == 0.25
+
+
+def test_segment_image_dummy_algorithm_still_available():
+    meta = segment_image(b'\xff' * 10 + b'\x00' * 10, DUMMY_ALGORITHM)
+
+    assert meta['algorithm'] == DUMMY_ALGORITHM
+    assert meta['foreground_ratio'] == 0.5
+
+
+def test_segment_image_rejects_unknown_algorithm_and_undecodable_input():
+    with pytest.raises(ImagePipelineError):
+        segment_image(b'abc', 'nope')
+    with pytest.raises(ImagePipelineError):
+        segment_image(b'not an image', OTSU_ALGORITHM)
+
+
+def test_mask_regions_splits_separated_blocks_in_reading_order():
+    mask = np.zeros((40, 60), dtype=bool)
+    mask[20:30, 10:50] = True
+    mask[2:8, 40:55] = True
+    mask[2:8, 5:30] = True
+    mask[35, 0] = True
+
+    assert mask_regions(mask, min_pixels=4) == [[5, 2, 30, 8], [40, 2, 55, 8], [10, 20, 50, 30]]